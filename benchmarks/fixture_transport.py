@@ -0,0 +1,56 @@
+import os
+import re
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# URL 패턴별로 응답할 녹화 파일 (위에서부터 먼저 일치하는 항목 사용)
+FIXTURE_ROUTES = [
+    (re.compile(r'search\.daum\.net/search'), 'daum_search.html'),
+    (re.compile(r'news\.daum\.net/'), 'daum_category.html'),
+    (re.compile(r'v\.daum\.net/v/'), 'daum_article.html'),
+    (re.compile(r'aitimes\.com/news/articleList\.html'), 'aitimes_list.html'),
+    (re.compile(r'aitimes\.com/news/articleView\.html'), 'aitimes_article.html'),
+    (re.compile(r'boannews\.com/media/t_list\.asp'), 'boan_list.html'),
+    (re.compile(r'boannews\.com/media/view\.asp'), 'boan_article.html'),
+    (re.compile(r'\.(jpe?g|png|gif)(\?|$)|daumcdn\.net/thumb'), 'image.jpg'),
+]
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        return f.read()
+
+class FixtureResponse:
+    """requests.Response에서 크롤러가 사용하는 속성만 흉내 낸 응답"""
+    def __init__(self, url, content, status_code=200):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        self.headers = {}
+        self.encoding = 'utf-8'
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}: {self.url}")
+
+class FixtureSession:
+    """네트워크 대신 녹화된 fixture로 응답하는 세션 (requests.Session 대용)"""
+    def __init__(self):
+        self.headers = {}
+        self.requests = 0
+        self.bytes_served = 0
+        self._cache = {}
+
+    def get(self, url, params=None, **kwargs):
+        self.requests += 1
+        for pattern, name in FIXTURE_ROUTES:
+            if pattern.search(url):
+                if name not in self._cache:
+                    self._cache[name] = load_fixture(name)
+                content = self._cache[name]
+                self.bytes_served += len(content)
+                return FixtureResponse(url, content)
+        return FixtureResponse(url, b'', status_code=404)
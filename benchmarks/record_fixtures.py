@@ -0,0 +1,61 @@
+"""실제 사이트에서 벤치마크용 HTML fixture를 다시 녹화
+
+선택자나 사이트 구조가 바뀌었을 때 저장소 루트에서 실행한다:
+    python -m benchmarks.record_fixtures
+목록 페이지를 먼저 받은 뒤, 현재 파서로 첫 번째 기사 링크를 찾아 기사 페이지를 녹화한다.
+"""
+import logging
+import os
+from datetime import datetime
+from pytz import timezone
+from benchmarks.fixture_transport import FIXTURE_DIR
+from src.crawler.utils.common_utils import create_session, fetch, parse_daum_search_results
+from src.crawler.utils.html_parser import make_soup
+from src.crawler.daum import daum_main_news
+from src.crawler.aitimes import aitimes_news
+from src.crawler.boan_news import boan_news
+
+logger = logging.getLogger(__name__)
+
+CUTOFF = timezone('Asia/Seoul').localize(datetime(2000, 1, 1))
+
+def _save(name, content):
+    path = os.path.join(FIXTURE_DIR, name)
+    mode = 'wb' if isinstance(content, bytes) else 'w'
+    with open(path, mode, **({} if mode == 'wb' else {'encoding': 'utf-8'})) as f:
+        f.write(content)
+    logger.info(f"fixture 저장: {path} ({len(content)} bytes)")
+
+def record():
+    session = create_session()
+
+    search_html = fetch(session, "https://search.daum.net/search?w=news&q=AI&sort=recency&p=1")
+    _save('daum_search.html', search_html)
+    article_url = parse_daum_search_results(search_html)[0]["url"]
+    _save('daum_article.html', fetch(session, article_url))
+
+    category_html = fetch(session, daum_main_news.category_url[-1]['url'])
+    _save('daum_category.html', category_html)
+
+    aitimes_html = fetch(session, "https://www.aitimes.com/news/articleList.html?view_type=sm")
+    _save('aitimes_list.html', aitimes_html)
+    entries, _ = aitimes_news.parse_article_list(aitimes_html, CUTOFF)
+    entry = entries[0]
+    _save('aitimes_article.html', fetch(session, entry["url"]))
+
+    boan_html = fetch(session, "https://boannews.com/media/t_list.asp?page=1")
+    _save('boan_list.html', boan_html)
+    items = make_soup(boan_html, boan_news.LIST_STRAINER).select('.news_list')
+    meta = next(meta for meta, _ in (boan_news.parse_list_item(item, CUTOFF) for item in items) if meta)
+    article_html = fetch(session, meta["url"])
+    _save('boan_article.html', article_html)
+
+    image_tag = make_soup(article_html, boan_news.ARTICLE_STRAINER).find('img')
+    if image_tag and image_tag.get('src'):
+        image_url = image_tag['src']
+        if not image_url.startswith('http'):
+            image_url = f"https://boannews.com{image_url}"
+        _save('image.jpg', session.get(image_url).content)
+
+if __name__ == "__main__":
+    record()
@@ -0,0 +1,182 @@
+"""녹화된 HTML fixture로 각 소스의 파서와 크롤링 경로를 네트워크 없이 측정하는 벤치마크
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --iterations 50 --json result.json
+    python -m benchmarks.run_benchmarks --baseline result.json --tolerance 0.2
+
+소스별로 pages/sec, 기사당 ms, 최대 메모리(tracemalloc)를 출력한다.
+--baseline을 주면 이전 결과보다 tolerance 이상 느려진 항목이 있을 때 종료 코드 1로 끝난다.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+# 상태 저장소와 이미지 캐시가 실제 경로를 건드리지 않도록 설정 모듈을 읽기 전에 임시 경로 지정
+_WORK_DIR = tempfile.mkdtemp(prefix='crawler-bench-')
+os.environ.setdefault('IMAGE_CACHE_DIR', os.path.join(_WORK_DIR, 'images'))
+os.environ.setdefault('STATE_DB_PATH', os.path.join(_WORK_DIR, 'state.db'))
+
+from pytz import timezone
+from benchmarks.fixture_transport import FixtureSession, load_fixture
+from src.crawler.utils import common_utils, fetch_engine, transport
+from src.crawler.utils.html_parser import PARSER, make_soup
+from src.crawler.daum import daum_keyword_news, daum_main_news, daum_search
+from src.crawler.finance_ai import finance_ai_news
+from src.crawler.aitimes import aitimes_news
+from src.crawler.boan_news import boan_news
+
+# 모든 fixture 기사가 수집 대상이 되도록 충분히 과거 시각을 기준으로 사용
+CUTOFF = timezone('Asia/Seoul').localize(datetime(2000, 1, 1))
+
+def _install_stub_transport():
+    """fetch 엔진의 요청 속도 제한과 검색 결과 캐시를 없애고 이미지 다운로드까지 fixture 세션을 사용하도록 설정"""
+    session = FixtureSession()
+    fetch_engine._engine = fetch_engine.FetchEngine(rate_limits=None)
+    daum_search._client = daum_search.DaumSearchClient(ttl=0)
+    transport._session = session
+    return session
+
+def build_cases(session):
+    """(소스, 케이스 이름, 실행 함수) 목록. 실행 함수는 처리한 기사 수를 반환한다"""
+    daum_article_html = load_fixture('daum_article.html').decode('utf-8')
+    daum_search_html = load_fixture('daum_search.html').decode('utf-8')
+    aitimes_list_html = load_fixture('aitimes_list.html').decode('utf-8')
+    aitimes_article_html = load_fixture('aitimes_article.html').decode('utf-8')
+    boan_article_html = load_fixture('boan_article.html').decode('utf-8')
+    boan_items, _ = boan_news.get_article_list(session, 1)
+    boan_metas = [meta for meta, _ in (boan_news.parse_list_item(item, CUTOFF) for item in boan_items) if meta]
+    aitimes_entries, _ = aitimes_news.parse_article_list(aitimes_list_html, CUTOFF)
+
+    def daum_article_parse():
+        common_utils.parse_daum_news_content(daum_article_html, 'https://v.daum.net/v/20241111000000')
+        return 1
+
+    def daum_article_fetch():
+        return 1 if common_utils.get_daum_news_content(session, 'https://v.daum.net/v/20241111000000') else 0
+
+    def daum_search_extract():
+        return len(common_utils.parse_daum_search_results(daum_search_html))
+
+    def daum_keyword_url_list():
+        return len(daum_keyword_news.get_url_list(session, 'AI', None))
+
+    def finance_url_list():
+        return len(finance_ai_news.get_url_list(session, '신한카드AI', CUTOFF))
+
+    def daum_category():
+        news_list, _ = daum_main_news.get_category_news(session, daum_main_news.category_url[-1:])
+        return len(news_list)
+
+    def aitimes_list():
+        entries, _ = aitimes_news.parse_article_list(aitimes_list_html, CUTOFF)
+        return len(entries)
+
+    def aitimes_article():
+        aitimes_news.parse_article_page(aitimes_entries[0], aitimes_article_html)
+        return 1
+
+    def boan_list():
+        items, _ = boan_news.get_article_list(session, 1)
+        return len([meta for meta, _ in (boan_news.parse_list_item(item, CUTOFF) for item in items) if meta])
+
+    def boan_article():
+        return 1 if boan_news.process_article(boan_metas[0], boan_article_html) else 0
+
+    def boan_extract():
+        content, _ = boan_news.extract_article_content(make_soup(boan_article_html, boan_news.ARTICLE_STRAINER))
+        return 1 if content else 0
+
+    return [
+        ('daum', 'parse_daum_news_content', daum_article_parse),
+        ('daum', 'get_daum_news_content', daum_article_fetch),
+        ('daum', 'get_category_news', daum_category),
+        ('daum_search', 'parse_daum_search_results', daum_search_extract),
+        ('daum_search', 'keyword get_url_list', daum_keyword_url_list),
+        ('daum_search', 'finance get_url_list', finance_url_list),
+        ('aitimes', 'parse_article_list', aitimes_list),
+        ('aitimes', 'parse_article_page', aitimes_article),
+        ('boan', 'get_article_list', boan_list),
+        ('boan', 'process_article', boan_article),
+        ('boan', 'extract_article_content', boan_extract),
+    ]
+
+def run_case(session, func, iterations):
+    func()  # 워밍업 (이미지 캐시, fixture 로딩)
+
+    requests_before = session.requests
+    articles = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        articles += func()
+    elapsed = time.perf_counter() - started
+    pages = max(session.requests - requests_before, iterations)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "pages": pages,
+        "articles": articles,
+        "seconds": elapsed,
+        "pages_per_sec": pages / elapsed if elapsed else 0.0,
+        "ms_per_page": elapsed * 1000 / pages,
+        "ms_per_article": elapsed * 1000 / articles if articles else None,
+        "peak_kb": peak / 1024,
+    }
+
+def compare(results, baseline, tolerance):
+    """기준 결과 대비 ms_per_page가 tolerance 이상 증가한 항목 반환"""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base and result["ms_per_page"] > base["ms_per_page"] * (1 + tolerance):
+            regressions.append((key, base["ms_per_page"], result["ms_per_page"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="크롤러 파서 오프라인 벤치마크")
+    parser.add_argument("--iterations", "-n", type=int, default=20, help="케이스별 반복 횟수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일 경로")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 성능 저하 비율")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    session = _install_stub_transport()
+
+    results = {}
+    print(f"HTML parser: {PARSER}, iterations: {args.iterations}")
+    print(f"{'source':<12} {'case':<26} {'pages/s':>9} {'ms/page':>9} {'ms/article':>11} {'peak KB':>9}")
+    for source, name, func in build_cases(session):
+        result = run_case(session, func, args.iterations)
+        results[f"{source}:{name}"] = dict(result, source=source, case=name)
+        ms_per_article = f"{result['ms_per_article']:.2f}" if result['ms_per_article'] is not None else '-'
+        print(f"{source:<12} {name:<26} {result['pages_per_sec']:>9.1f} {result['ms_per_page']:>9.2f} "
+              f"{ms_per_article:>11} {result['peak_kb']:>9.0f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"parser": PARSER, "results": results}, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for key, before, after in regressions:
+            print(f"성능 저하: {key} {before:.2f}ms -> {after:.2f}ms")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
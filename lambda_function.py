@@ -1,48 +1,117 @@
-from src.crawler.daum.daum_keyword_news import crawl_daum_keyword_news
-from src.crawler.daum.daum_main_news import crawl_daum_main_news
-from src.crawler.aitimes.aitimes_news import crawl_aitimes_news
-from src.crawler.finance_ai.finance_ai_news import crawl_finance_ai_news
-from src.crawler.boan_news.boan_news import crawl_boan_news
+import functools
+import importlib
 import logging
 import json
+from src.config.settings import (
+    LAMBDA_SOURCE_BUDGETS, LAMBDA_FLUSH_RESERVE_SECONDS, KEYWORD_SHARD_COUNT, SHARD_FUNCTION_NAME
+)
+from src.crawler.utils.metrics import get_metrics, run_source
+from src.crawler.utils.deadline import deadline_scope
+from src.crawler.utils.source_scheduler import run_sources
+from src.crawler.utils.sharding import parse_shard, invoke_lambda_shards
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def job_keyword_news():
-    logger.info("다음 키워드 뉴스 크롤링 작업 시작...")
-    crawl_daum_keyword_news()
-    logger.info("다음 키워드 뉴스 크롤링 작업 완료.")
+# (소스 이름, 작업 이름, 모듈 경로, 크롤링 함수)
+# 크롤러 모듈과 bs4, requests 등 무거운 의존성은 콜드 스타트가 아니라 처음 실행할 때 불러온다
+SOURCES = [
+    ("daum_keyword", "다음 키워드 뉴스", "src.crawler.daum.daum_keyword_news", "crawl_daum_keyword_news"),
+    ("daum_main", "다음 IT 뉴스", "src.crawler.daum.daum_main_news", "crawl_daum_main_news"),
+    ("aitimes", "AI Times 뉴스", "src.crawler.aitimes.aitimes_news", "crawl_aitimes_news"),
+    ("finance_ai", "Financial AI 뉴스", "src.crawler.finance_ai.finance_ai_news", "crawl_finance_ai_news"),
+    ("boan", "보안뉴스", "src.crawler.boan_news.boan_news", "crawl_boan_news"),
+]
 
-def job_main_news():
-    logger.info("다음 IT 뉴스 크롤링 작업 시작...")
-    crawl_daum_main_news()
-    logger.info("다음 IT 뉴스 크롤링 작업 완료.")
+def load_crawler(module_path, func_name):
+    return getattr(importlib.import_module(module_path), func_name)
 
-def job_aitimes_news():
-    logger.info("AI Times 뉴스 크롤링 작업 시작...")
-    crawl_aitimes_news()
-    logger.info("AI Times 뉴스 크롤링 작업 완료.")
+def remaining_seconds(context):
+    """Lambda 남은 실행 시간(초). 로컬 실행처럼 context가 없으면 None"""
+    if context is None:
+        return None
+    return context.get_remaining_time_in_millis() / 1000
 
-def job_financial_ai_news():
-    logger.info("Financial AI 뉴스 크롤링 작업 시작...")
-    crawl_finance_ai_news()
-    logger.info("Financial AI 뉴스 크롤링 작업 완료.")
+def source_budget(name, context):
+    """소스 예산과 (남은 시간 - 전송 예비 시간) 중 짧은 쪽"""
+    budget = LAMBDA_SOURCE_BUDGETS.get(name)
+    remaining = remaining_seconds(context)
+    if remaining is not None:
+        available = remaining - LAMBDA_FLUSH_RESERVE_SECONDS
+        budget = available if budget is None else min(budget, available)
+    return budget
+
+def run_job(name, title, module_path, func_name, context, **kwargs):
+    """마감 시각을 적용해 소스 하나를 실행 (마감이 지나면 새 요청을 멈추고 수집분만 전송). kwargs는 크롤링 함수에 전달"""
+    budget = source_budget(name, context)
+    if budget is not None and budget <= 0:
+        logger.warning(f"{title} 크롤링 작업 생략: 남은 실행 시간 부족")
+        get_metrics().set_status(name, 'skipped')
+        return False
+
+    logger.info(f"{title} 크롤링 작업 시작... (예산: {budget if budget is not None else '제한 없음'}초)")
+    crawl = load_crawler(module_path, func_name)
+    if budget is None:
+        succeeded = run_source(name, crawl, **kwargs)
+    else:
+        with deadline_scope(budget):
+            succeeded = run_source(name, crawl, **kwargs)
+    logger.info(f"{title} 크롤링 작업 완료.")
+    return succeeded
+
+def shard_jobs(shard, context):
+    """실행할 (소스 이름, 작업) 목록. 샤드 실행이면 키워드 뉴스는 샤드 몫만, 나머지 소스는 0번 샤드에서만 실행"""
+    jobs = []
+    for source in SOURCES:
+        if source[0] == "daum_keyword":
+            jobs.append((source[0], functools.partial(run_job, *source, context, shard=shard)))
+        elif shard is None or shard[0] == 0:
+            jobs.append((source[0], functools.partial(run_job, *source, context)))
+    return jobs
+
+def fan_out(shard_count, context):
+    """샤드마다 같은 함수를 비동기로 호출하고 바로 반환 (크롤링은 각 샤드 호출에서 수행)"""
+    function_name = SHARD_FUNCTION_NAME or (context.function_name if context is not None else None)
+    if not function_name:
+        raise ValueError("샤드를 실행할 Lambda 함수 이름이 없습니다. SHARD_FUNCTION_NAME을 설정하세요.")
+    invoked = invoke_lambda_shards(function_name, shard_count)
+    return {
+        'statusCode': 200 if len(invoked) == shard_count else 500,
+        'body': json.dumps({
+            "message": "shards invoked" if len(invoked) == shard_count else "shard invocation partially failed",
+            "shard_count": shard_count,
+            "invoked_shards": invoked,
+        }, ensure_ascii=False)
+    }
 
 '''
 AWS Lambda 실행을 위한 함수
+
+이벤트에 shard_index, shard_count가 있으면 그 샤드만 실행한다.
+shard_index 없이 shard_count(없으면 KEYWORD_SHARD_COUNT)가 1보다 크면 샤드별 호출만 보내고 끝낸다.
 '''
 def lambda_handler(event, context):
     print("Crawling starts")
-    job_keyword_news()
-    job_main_news()
-    job_aitimes_news()
-    job_financial_ai_news()
-    crawl_boan_news()
+    event = event if isinstance(event, dict) else {}
+    shard_count = int(event.get("shard_count") or KEYWORD_SHARD_COUNT)
+    if "shard_index" not in event and shard_count > 1:
+        return fan_out(shard_count, context)
+    shard = parse_shard(event.get("shard_index"), shard_count)
+
+    metrics = get_metrics()
+    metrics.reset()  # 웜 스타트 시 이전 호출의 지표가 섞이지 않도록 초기화
+    # 소스는 서로 다른 호스트를 대상으로 하므로 동시에 실행 (호스트별 요청 간격은 fetch 엔진이 유지)
+    results = run_sources(shard_jobs(shard, context))
+    failed_sources = metrics.failed_sources()
     return {
-        'statusCode': 200,
-        'body': json.dumps("upload success")
+        'statusCode': 200 if any(results.values()) else 500,
+        'body': json.dumps({
+            "message": "upload success" if not failed_sources else "upload partially failed",
+            "failed_sources": failed_sources,
+            "shard": list(shard) if shard is not None else None,
+            "metrics": metrics.export(),
+        }, ensure_ascii=False)
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,268 @@
+"""다음 검색/뉴스, AI Times, 보안뉴스를 흉내 내는 합성 페이지 서버
+
+크롤러 파서가 읽는 구조만 갖춘 HTML을 요청 경로로부터 결정적으로 만들어 응답한다.
+요청의 Host 헤더로 사이트를 구분하므로 크롤러 세션에 mount_fake_sites()로 어댑터를 붙여 사용한다.
+- 검색 결과 일부는 공용 기사 풀에서 골라 키워드/카테고리 간 중복 기사가 생긴다.
+- 기사 본문에는 백엔드 목 서버와 같은 이름의 키워드가 나온다 (키워드 태깅 확인용).
+- 제목과 요약은 기사마다 단어를 따로 뽑아 만들므로 서로 다른 기사가 유사 중복으로 판단되지 않는다.
+- 지연 시간과 오류 비율(500/503/429)을 지정할 수 있다.
+
+단독 실행: python -m loadtest.fake_sites --port 8100 --latency 0.05 --error-rate 0.01
+"""
+import argparse
+import hashlib
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from html import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, urlunsplit, parse_qs
+from pytz import timezone
+from requests.adapters import HTTPAdapter
+from loadtest.mock_backend import keyword_name
+
+SEOUL_TZ = timezone('Asia/Seoul')
+IMAGE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures', 'image.jpg')
+
+# 크롤러가 요청하는 사이트 호스트 (이 호스트로 가는 요청만 가짜 서버로 보냄)
+FAKE_HOSTS = ['search.daum.net', 'news.daum.net', 'v.daum.net', 'img1.daumcdn.net', 'www.aitimes.com', 'boannews.com']
+
+# 합성 제목과 요약에 쓰는 단어
+WORDS = [
+    "반도체", "클라우드", "데이터센터", "플랫폼", "스타트업", "투자", "규제", "보안", "개인정보", "결제",
+    "모바일", "자율주행", "로봇", "헬스케어", "교육", "물류", "에너지", "통신", "검색", "광고",
+    "게임", "콘텐츠", "번역", "음성인식", "추천", "상담", "대출", "보험", "증권", "카드",
+    "정부", "지자체", "대학", "연구소", "협약", "출시", "공개", "확대", "도입", "개발",
+    "실증", "인수", "합병", "상장", "채용", "특허", "표준", "인증", "수출", "국산화",
+    "칩", "서버", "모델", "에이전트", "오픈소스", "학습", "추론", "경량화", "멀티모달", "파운데이션",
+]
+
+def _number(*parts, digits=12):
+    digest = hashlib.blake2b('|'.join(str(part) for part in parts).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % (10 ** digits)
+
+def _words(seed, count):
+    """seed로 정해지는 서로 다른 단어 count개 (같은 기사는 어느 페이지에서나 같은 제목을 가짐)"""
+    return " ".join(random.Random(_number(seed, 'words')).sample(WORDS, count))
+
+def _title(seed):
+    return f"{_words(seed, 6)} 소식"
+
+class SiteOptions:
+    def __init__(self, latency=0.0, error_rate=0.0, keywords=100, search_pages=3, results_per_page=10,
+                 shared_ratio=0.3, shared_pool=500, list_pages=5, items_per_list_page=20, article_interval_minutes=15):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.keywords = keywords
+        self.search_pages = search_pages
+        self.results_per_page = results_per_page
+        self.shared_ratio = shared_ratio
+        self.shared_pool = shared_pool
+        self.list_pages = list_pages
+        self.items_per_list_page = items_per_list_page
+        self.article_interval_minutes = article_interval_minutes
+        self._lock = threading.Lock()
+        self.stats = {"requests": {}, "injected_errors": 0, "bytes_served": 0}
+
+    def count(self, host, size):
+        with self._lock:
+            self.stats["requests"][host] = self.stats["requests"].get(host, 0) + 1
+            self.stats["bytes_served"] += size
+
+    def count_error(self):
+        with self._lock:
+            self.stats["injected_errors"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, requests=dict(self.stats["requests"]))
+
+def _page(body):
+    return f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"></head><body>{body}</body></html>"
+
+def _body_text(seed, options, sentences=6):
+    """기사 본문 문단. 합성 키워드 두 개와 AI 언급을 포함"""
+    keywords = [keyword_name(_number(seed, n) % options.keywords) for n in range(2)] if options.keywords else []
+    lines = [f"{seed}번 기사 본문 {n + 1}번째 문단입니다. 생성형 AI와 금융 서비스에 관한 내용을 다룹니다." for n in range(sentences)]
+    lines[0] += " " + " ".join(keywords)
+    return lines
+
+def daum_search(query, page, options):
+    if page > options.search_pages:
+        return _page('<ul class="list_news"></ul>')
+    terms = [term.strip() for term in query.split('|')] or [query]
+    items = []
+    for n in range(options.results_per_page):
+        if _number(query, page, n, 'shared') % 100 < options.shared_ratio * 100:
+            article_id = 20240000000000000 + _number('pool', _number(query, page, n) % options.shared_pool)
+        else:
+            article_id = 20240000000000000 + _number(query, page, n)
+        term = terms[n % len(terms)]
+        title = escape(_title(article_id))
+        snippet = escape(f"{term}가 {_words(f'{article_id}-snippet', 4)} 분야에 생성형 AI 기반 서비스를 선보였다.")
+        items.append(f'<li><div class="item-title"><a href="https://v.daum.net/v/{article_id}">{title}</a></div>'
+                     f'<p class="conts-desc">{snippet}</p></li>')
+    return _page(f'<ul class="list_news">{"".join(items)}</ul>')
+
+def daum_article(article_id, options):
+    published = datetime.now(SEOUL_TZ) - timedelta(minutes=_number(article_id) % 600)
+    paragraphs = "".join(f'<p dmcf-ptype="general">{escape(line)}</p>' for line in _body_text(article_id, options))
+    return _page(
+        f'<h3 class="tit_view">{escape(_title(article_id))}</h3>'
+        f'<span class="num_date">{published.strftime("%Y. %m. %d. %H:%M")}</span>'
+        f'<div class="article_view"><img class="thumb_g_article" src="https://img1.daumcdn.net/thumb/{article_id}.jpg">'
+        f'{paragraphs}<figcaption class="txt_caption">사진 설명 {article_id}</figcaption></div>'
+    )
+
+def daum_category(category, options):
+    items = []
+    for n in range(options.items_per_list_page):
+        # 절반은 모든 카테고리에 공통으로 나오는 기사
+        pool = 'headline' if n % 2 else category
+        article_id = 20240000000000000 + _number(pool, n)
+        items.append(f'<li><a class="item_newsheadline2" href="https://v.daum.net/v/{article_id}">'
+                     f'<strong class="tit_txt">{escape(_title(article_id))}</strong></a></li>')
+    return _page(f'<ul class="list_newsheadline2">{"".join(items)}</ul>')
+
+def _list_items(page, options):
+    """목록 페이지 page의 (번호, 발행 시각). 최신 기사부터 article_interval_minutes 간격"""
+    if page > options.list_pages:
+        return []
+    now = datetime.now(SEOUL_TZ).replace(second=0, microsecond=0)
+    start = (page - 1) * options.items_per_list_page
+    return [(index, now - timedelta(minutes=index * options.article_interval_minutes))
+            for index in range(start, start + options.items_per_list_page)]
+
+def _article_number(published):
+    # 발행 시각으로 번호를 정해 실행 간에 같은 기사가 같은 URL을 갖게 함
+    return int(published.timestamp() // 60)
+
+def aitimes_list(page, options):
+    items = []
+    for _, published in _list_items(page, options):
+        number = _article_number(published)
+        items.append(f'<li><h4 class="titles"><a href="/news/articleView.html?idxno={number}">'
+                     f'{escape(_title(f"aitimes-{number}"))}</a></h4>'
+                     f'<p class="lead">{escape(_words(f"aitimes-{number}-lead", 5))} 관련 AI 시장 동향을 정리했다.</p>'
+                     f'<span class="byline"><em>AI 기자</em><em>{published.strftime("%Y.%m.%d %H:%M")}</em></span></li>')
+    return _page(f'<section id="section-list"><ul>{"".join(items)}</ul></section>')
+
+def aitimes_article(number, options):
+    text = " ".join(_body_text(f"aitimes-{number}", options))
+    return _page(f'<div id="article-view-content-div"><img src="https://www.aitimes.com/news/photo/{number}.jpg">'
+                 f'<p>{escape(text)}</p></div>')
+
+def boan_list(page, options):
+    items = []
+    for _, published in _list_items(page, options):
+        number = _article_number(published)
+        items.append(f'<div class="news_list"><a href="/media/view.asp?idx={number}">'
+                     f'<span class="news_txt">{escape(_title(f"boan-{number}"))}</span></a>'
+                     f'<span class="news_content">{escape(_words(f"boan-{number}-lead", 5))} 관련 AI 보안 위협 동향을 다뤘다.</span>'
+                     f'<span class="news_writer">보안 기자 | {published.strftime("%Y년 %m월 %d일 %H:%M")}</span></div>')
+    return _page("".join(items))
+
+def boan_article(number, options):
+    text = " ".join(_body_text(f"boan-{number}", options))
+    return _page(f'<div id="news_content"><img src="/media/upFiles2/{number}.jpg">{escape(text)}</div>')
+
+def render(host, path, query, options):
+    """(상태 코드, 본문 바이트, Content-Type)"""
+    params = parse_qs(query)
+    page = int(params.get('p', params.get('page', ['1']))[0])
+    if path.endswith('.jpg') or host == 'img1.daumcdn.net':
+        with open(IMAGE_PATH, 'rb') as f:
+            return 200, f.read(), 'image/jpeg'
+    if host == 'search.daum.net':
+        html = daum_search(params.get('q', [''])[0], page, options)
+    elif host == 'news.daum.net':
+        html = daum_category(path.strip('/') or 'main', options)
+    elif host == 'v.daum.net':
+        html = daum_article(path.rsplit('/', 1)[-1], options)
+    elif host == 'www.aitimes.com' and 'articleList' in path:
+        html = aitimes_list(page, options)
+    elif host == 'www.aitimes.com':
+        html = aitimes_article(params.get('idxno', ['0'])[0], options)
+    elif host == 'boannews.com' and 't_list' in path:
+        html = boan_list(page, options)
+    elif host == 'boannews.com':
+        html = boan_article(params.get('idx', ['0'])[0], options)
+    else:
+        return 404, b'', 'text/plain'
+    return 200, html.encode('utf-8'), 'text/html; charset=utf-8'
+
+def make_handler(options):
+    class SiteHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if options.latency:
+                time.sleep(options.latency * random.uniform(0.5, 1.5))
+            host = (self.headers.get('Host') or '').split(':')[0]
+            if random.random() < options.error_rate:
+                options.count_error()
+                status, body, content_type = random.choice([500, 503, 429]), b'error', 'text/plain'
+            else:
+                split = urlsplit(self.path)
+                status, body, content_type = render(host, split.path, split.query, options)
+            options.count(host, len(body))
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            if status == 429:
+                self.send_header('Retry-After', '1')
+            self.end_headers()
+            self.wfile.write(body)
+
+    return SiteHandler
+
+def start_sites(port=0, **options):
+    """백그라운드 스레드에서 서버 시작 (반환: 서버, 옵션/통계). port=0이면 빈 포트 사용"""
+    site_options = SiteOptions(**options)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(site_options))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-sites", daemon=True).start()
+    return server, site_options
+
+class FakeSiteAdapter(HTTPAdapter):
+    """실제 사이트 URL 요청을 가짜 서버로 보내는 어댑터 (원래 호스트는 Host 헤더로 전달)"""
+    def __init__(self, address, **kwargs):
+        self.address = address
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        split = urlsplit(request.url)
+        request.headers['Host'] = split.hostname
+        request.url = urlunsplit(('http', f"{self.address[0]}:{self.address[1]}", split.path, split.query, ''))
+        kwargs['verify'] = False
+        return super().send(request, **kwargs)
+
+def mount_fake_sites(session, address, **adapter_options):
+    """세션에서 FAKE_HOSTS로 가는 요청만 가짜 서버로 보내도록 설정"""
+    adapter = FakeSiteAdapter(address, **adapter_options)
+    for host in FAKE_HOSTS:
+        session.mount(f"https://{host}/", adapter)
+        session.mount(f"http://{host}/", adapter)
+    return session
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 뉴스 사이트 서버")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.0, help="평균 응답 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument("--keywords", type=int, default=100, help="기사 본문에 섞을 합성 키워드 수")
+    args = parser.parse_args()
+    server, _ = start_sites(args.port, latency=args.latency, error_rate=args.error_rate, keywords=args.keywords)
+    print(f"fake sites: http://127.0.0.1:{server.server_address[1]} (Host 헤더: {', '.join(FAKE_HOSTS)})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
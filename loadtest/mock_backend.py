@@ -0,0 +1,176 @@
+"""크롤러가 사용하는 백엔드 API를 흉내 내는 로컬 서버
+
+    GET  /api/public/keywords                 키워드 목록 (--keywords개)
+    PUT  /api/public/keywords/last-crawled-dt  마지막 크롤링 시각 갱신
+    POST /api/public/news                     기사 업로드 (gzip JSON 배열 또는 multipart jsonl)
+    GET  /stats                               받은 요청과 기사 통계
+
+지연 시간과 오류 비율을 지정해 느리거나 불안정한 백엔드에서의 동작을 확인할 수 있다.
+단독 실행: python -m loadtest.mock_backend --port 8000 --keywords 5000
+"""
+import argparse
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+def keyword_name(index):
+    """index번째 합성 키워드 (가짜 사이트의 기사 본문도 같은 이름을 사용)"""
+    return f"테스트키워드{index:05d}"
+
+class BackendState:
+    def __init__(self, keywords=100, latency=0.0, error_rate=0.0, max_body_bytes=None):
+        self.keywords = [{"keyword": keyword_name(i), "lastCrawledAt": None} for i in range(keywords)]
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_body_bytes = max_body_bytes
+        self._lock = threading.Lock()
+        self.stats = {"requests": {}, "injected_errors": 0, "rejected_too_large": 0,
+                      "upload_bytes": 0, "articles_received": 0, "duplicate_articles": 0, "keyword_updates": 0}
+        self.article_urls = set()
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def count_request(self, endpoint):
+        with self._lock:
+            self.stats["requests"][endpoint] = self.stats["requests"].get(endpoint, 0) + 1
+
+    def receive_articles(self, urls):
+        with self._lock:
+            self.stats["articles_received"] += len(urls)
+            for url in urls:
+                if url in self.article_urls:
+                    self.stats["duplicate_articles"] += 1
+                self.article_urls.add(url)
+
+    def update_keywords(self, updates):
+        by_name = {item["keyword"]: item for item in self.keywords}
+        with self._lock:
+            self.stats["keyword_updates"] += len(updates)
+            for update in updates:
+                item = by_name.get(update.get("keyword"))
+                if item is not None:
+                    item["lastCrawledAt"] = update.get("last_crawled_dt")
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, requests=dict(self.stats["requests"]), unique_articles=len(self.article_urls))
+
+def _article_urls(body, content_type):
+    """업로드 본문에서 기사 URL 목록 추출 (JSON 배열 또는 multipart jsonl)"""
+    if content_type.startswith('application/json'):
+        return [article.get("url") for article in json.loads(body)]
+    urls = []
+    for line in body.split(b'\n'):
+        line = line.strip()
+        if line.startswith(b'{'):
+            urls.append(json.loads(line).get("url"))
+    return urls
+
+def make_handler(state):
+    class BackendHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _reply(self, status, payload=None, headers=None):
+            body = json.dumps(payload if payload is not None else {}, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_body(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            if self.headers.get('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+            return body
+
+        def _simulate(self):
+            """지연과 오류 주입. 오류를 응답했으면 True"""
+            if state.latency:
+                time.sleep(state.latency * random.uniform(0.5, 1.5))
+            if random.random() < state.error_rate:
+                state.count("injected_errors")
+                status = random.choice([500, 503, 429])
+                self._reply(status, {"error": "injected"}, {"Retry-After": "1"} if status == 429 else None)
+                return True
+            return False
+
+        def do_GET(self):
+            if self.path.startswith('/stats'):
+                self._reply(200, state.snapshot())
+                return
+            state.count_request(self.path)
+            if self._simulate():
+                return
+            if self.path.startswith('/api/public/keywords'):
+                self._reply(200, state.keywords)
+            else:
+                self._reply(404)
+
+        def do_PUT(self):
+            state.count_request(self.path)
+            body = self._read_body()
+            if self._simulate():
+                return
+            if self.path.startswith('/api/public/keywords/last-crawled-dt'):
+                updates = json.loads(body)
+                state.update_keywords(updates)
+                self._reply(200, {"updated": len(updates)})
+            else:
+                self._reply(404)
+
+        def do_POST(self):
+            state.count_request(self.path)
+            body = self._read_body()
+            state.count("upload_bytes", len(body))
+            if self._simulate():
+                return
+            if not self.path.startswith('/api/public/news'):
+                self._reply(404)
+                return
+            if state.max_body_bytes and len(body) > state.max_body_bytes:
+                state.count("rejected_too_large")
+                self._reply(413, {"error": "payload too large"})
+                return
+            urls = _article_urls(body, self.headers.get('Content-Type', ''))
+            state.receive_articles(urls)
+            self._reply(200, {"saved": len(urls)})
+
+    return BackendHandler
+
+def start_backend(port=0, **options):
+    """백그라운드 스레드에서 서버 시작 (반환: 서버, 상태). port=0이면 빈 포트 사용"""
+    state = BackendState(**options)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-backend", daemon=True).start()
+    return server, state
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 백엔드 목 서버")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--keywords", type=int, default=100, help="제공할 키워드 수")
+    parser.add_argument("--latency", type=float, default=0.0, help="평균 응답 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument("--max-body-bytes", type=int, help="이보다 큰 업로드는 413으로 거절")
+    args = parser.parse_args()
+    server, _ = start_backend(args.port, keywords=args.keywords, latency=args.latency,
+                              error_rate=args.error_rate, max_body_bytes=args.max_body_bytes)
+    print(f"mock backend: http://127.0.0.1:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""로컬 백엔드 목 서버와 합성 사이트 서버를 띄우고 실제 크롤링 함수를 끝까지 실행하는 부하 테스트
+
+사용법 (저장소 루트에서):
+    python -m loadtest.run_load_test --keywords 5000
+    python -m loadtest.run_load_test --keywords 500 --site-latency 0.05 --site-error-rate 0.02 --backend-error-rate 0.1
+    python -m loadtest.run_load_test --sources daum_keyword finance_ai --lambda-budgets --json result.json
+    python -m loadtest.run_load_test --keywords 50 --site-rate-limits   # 실제 호스트별 속도 제한 적용
+
+소스별 성공 여부와 소요 시간, 요청/기사 처리량, 최대 메모리, 주입한 오류와 백엔드가 받은 기사 수를 출력한다.
+유사 중복으로 건너뛴 기사 비율이 --max-near-duplicate-rate를 넘으면 합성 데이터가 실제 부하를 대표하지 못하므로 실패로 끝난다.
+상태 저장소와 이미지 캐시는 임시 경로를 사용하므로 실행마다 처음 상태에서 시작한다 (--state-dir로 이어서 실행 가능).
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from loadtest.mock_backend import start_backend
+from loadtest.fake_sites import start_sites, mount_fake_sites
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="크롤러 부하 테스트")
+    parser.add_argument("--keywords", type=int, default=1000, help="백엔드가 제공할 키워드 수")
+    parser.add_argument("--sources", nargs="+", help="실행할 소스 (기본: 전체)")
+    parser.add_argument("--site-latency", type=float, default=0.0, help="사이트 평균 응답 지연 (초)")
+    parser.add_argument("--site-error-rate", type=float, default=0.0, help="사이트 오류 응답 비율 (0~1)")
+    parser.add_argument("--backend-latency", type=float, default=0.0, help="백엔드 평균 응답 지연 (초)")
+    parser.add_argument("--backend-error-rate", type=float, default=0.0, help="백엔드 오류 응답 비율 (0~1)")
+    parser.add_argument("--backend-max-body-bytes", type=int, help="이보다 큰 업로드는 413으로 거절")
+    parser.add_argument("--search-pages", type=int, default=3, help="검색어당 결과 페이지 수")
+    parser.add_argument("--list-pages", type=int, default=5, help="AI Times, 보안뉴스 목록 페이지 수")
+    parser.add_argument("--site-rate-limits", action="store_true",
+                        help="실제 사이트용 호스트별 요청 속도 제한 유지 (기본: 동시성 제한만 적용)")
+    parser.add_argument("--lambda-budgets", action="store_true", help="Lambda와 같은 소스별 실행 시간 예산 적용")
+    parser.add_argument("--trace-memory", action="store_true", help="tracemalloc으로 Python 할당 최대치 측정 (느려짐)")
+    parser.add_argument("--state-dir", help="상태 저장소와 이미지 캐시 경로 (기본: 임시 디렉터리)")
+    parser.add_argument("--max-near-duplicate-rate", type=float, default=0.05,
+                        help="찾은 기사 중 유사 중복으로 건너뛴 비율의 허용 최대치 (넘으면 실패)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--verbose", action="store_true", help="크롤러 로그 출력")
+    return parser.parse_args()
+
+def _run_seconds(summary, source):
+    latency = summary['sources'].get(source, {}).get('run', {}).get('latency')
+    return round(latency['sum_ms'] / 1000, 2) if latency else None
+
+def main():
+    args = parse_args()
+    backend, backend_state = start_backend(
+        keywords=args.keywords, latency=args.backend_latency, error_rate=args.backend_error_rate,
+        max_body_bytes=args.backend_max_body_bytes,
+    )
+    sites, site_options = start_sites(
+        latency=args.site_latency, error_rate=args.site_error_rate, keywords=args.keywords,
+        search_pages=args.search_pages, list_pages=args.list_pages,
+    )
+
+    # 설정 모듈을 읽기 전에 백엔드 주소와 상태 경로를 지정
+    work_dir = args.state_dir or tempfile.mkdtemp(prefix='crawler-load-')
+    os.environ['BACKEND_URL2'] = f"http://127.0.0.1:{backend.server_address[1]}"
+    os.environ.setdefault('STATE_DB_PATH', os.path.join(work_dir, 'state.db'))
+    os.environ.setdefault('IMAGE_CACHE_DIR', os.path.join(work_dir, 'images'))
+
+    from src.config.settings import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+    from src.crawler.utils import transport, fetch_engine
+    from src.crawler.utils.metrics import get_metrics, run_source
+    from src.crawler.utils.source_scheduler import run_sources
+    import lambda_function
+
+    logging.disable(logging.NOTSET if args.verbose else logging.WARNING)
+    transport._session = mount_fake_sites(transport.CrawlerSession(), sites.server_address,
+                                          pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+    if not args.site_rate_limits:
+        # 로컬 서버이므로 예의상 속도 제한 없이 처리량 한계를 측정
+        fetch_engine._engine = fetch_engine.FetchEngine(rate_limits=None)
+
+    sources = [source for source in lambda_function.SOURCES if not args.sources or source[0] in args.sources]
+    jobs = []
+    for source in sources:
+        if args.lambda_budgets:
+            jobs.append((source[0], lambda source=source: lambda_function.run_job(*source, None)))
+        else:
+            crawl = lambda_function.load_crawler(source[2], source[3])
+            jobs.append((source[0], lambda name=source[0], crawl=crawl: run_source(name, crawl)))
+
+    metrics = get_metrics()
+    metrics.reset()
+    if args.trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    results = run_sources(jobs)
+    elapsed = time.perf_counter() - started
+    traced_peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+    if args.trace_memory:
+        tracemalloc.stop()
+
+    summary = metrics.summary()
+    fetch_requests = sum(stages.get('fetch', {}).get('requests', 0) for stages in summary['sources'].values())
+    fetch_errors = sum(stages.get('fetch', {}).get('errors', 0) + stages.get('fetch', {}).get('http_errors', 0)
+                       for stages in summary['sources'].values())
+    articles_found = sum(stages.get('articles', {}).get('found', 0) for stages in summary['sources'].values())
+    near_duplicates = sum(stages.get('articles', {}).get('near_duplicates', 0) for stages in summary['sources'].values())
+    near_duplicate_rate = near_duplicates / articles_found if articles_found else 0.0
+    backend_stats = backend_state.snapshot()
+    site_stats = site_options.snapshot()
+    report = {
+        "keywords": args.keywords,
+        "seconds": round(elapsed, 2),
+        "sources": {name: {"succeeded": ok, "seconds": _run_seconds(summary, name)} for name, ok in results.items()},
+        "failed_sources": metrics.failed_sources(),
+        "fetch_requests": fetch_requests,
+        "fetch_errors": fetch_errors,
+        "requests_per_sec": round(fetch_requests / elapsed, 1) if elapsed else None,
+        "articles_received": backend_stats["articles_received"],
+        "unique_articles": backend_stats["unique_articles"],
+        "articles_per_sec": round(backend_stats["articles_received"] / elapsed, 1) if elapsed else None,
+        "articles_found": articles_found,
+        "near_duplicates": near_duplicates,
+        "near_duplicate_rate": round(near_duplicate_rate, 4),
+        # ru_maxrss는 Linux에서 KB 단위
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "traced_peak_mb": round(traced_peak / 1024 / 1024, 1) if traced_peak is not None else None,
+        "backend": backend_stats,
+        "sites": site_stats,
+        "metrics": summary,
+    }
+
+    print(f"키워드 {args.keywords}개, 소스 {len(jobs)}개, {elapsed:.1f}초")
+    print(f"{'source':<14} {'result':<8} {'seconds':>8}")
+    for name, source_report in report["sources"].items():
+        print(f"{name:<14} {'ok' if source_report['succeeded'] else 'FAILED':<8} {source_report['seconds'] or 0:>8.1f}")
+    print(f"요청 {fetch_requests}건 ({report['requests_per_sec']}/s), 요청 실패 {fetch_errors}건, "
+          f"사이트 주입 오류 {site_stats['injected_errors']}건")
+    print(f"백엔드 수신 기사 {backend_stats['articles_received']}건 (고유 {backend_stats['unique_articles']}건, "
+          f"중복 {backend_stats['duplicate_articles']}건, {report['articles_per_sec']}/s), "
+          f"백엔드 주입 오류 {backend_stats['injected_errors']}건, 413 {backend_stats['rejected_too_large']}건")
+    print(f"찾은 기사 {articles_found}건 중 유사 중복 {near_duplicates}건 ({near_duplicate_rate:.1%})")
+    print(f"최대 RSS {report['max_rss_mb']} MB" +
+          (f", Python 할당 최대 {report['traced_peak_mb']} MB" if traced_peak is not None else ""))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+    backend.shutdown()
+    sites.shutdown()
+    if near_duplicate_rate > args.max_near_duplicate_rate:
+        print(f"유사 중복 비율 {near_duplicate_rate:.1%}이 허용치 {args.max_near_duplicate_rate:.1%}를 넘어 "
+              f"처리량이 실제 크롤링 부하를 나타내지 않습니다.")
+        return 1
+    return 0 if not report["failed_sources"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
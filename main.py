@@ -1,9 +1,20 @@
 import schedule
 from time import sleep
 import argparse
+import functools
+import os
+import sys
 from src.crawler.daum.daum_keyword_news import crawl_daum_keyword_news
 from src.crawler.daum.daum_main_news import crawl_daum_main_news
-from src.crawler.aitimes.aitimes_news import crawl_aitimes_articles
+from src.crawler.aitimes.aitimes_news import crawl_aitimes_news
+from src.crawler.finance_ai.finance_ai_news import crawl_finance_ai_news
+from src.crawler.boan_news.boan_news import crawl_boan_news
+from src.config.settings import JOB_TIMEOUTS
+from src.crawler.utils.metrics import get_metrics, run_source
+from src.crawler.utils.source_scheduler import run_sources
+from src.crawler.utils.parse_pool import configure_parse_pool
+from src.crawler.utils.job_executor import JobExecutor
+from src.crawler.utils.sharding import parse_shard, run_local_shards
 import logging
 import json
 
@@ -11,53 +22,171 @@ import json
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def job_keyword_news():
+def job_keyword_news(shard=None):
     logger.info("다음 키워드 뉴스 크롤링 작업 시작...")
-    crawl_daum_keyword_news()
+    succeeded = run_source('daum_keyword', crawl_daum_keyword_news, shard=shard)
     logger.info("다음 키워드 뉴스 크롤링 작업 완료.")
+    return succeeded
 
 def job_main_news():
     logger.info("다음 IT 뉴스 크롤링 작업 시작...")
-    crawl_daum_main_news()
+    succeeded = run_source('daum_main', crawl_daum_main_news)
     logger.info("다음 IT 뉴스 크롤링 작업 완료.")
+    return succeeded
 
-def run_scheduler():
+def job_aitimes_news():
+    logger.info("AI Times 뉴스 크롤링 작업 시작...")
+    succeeded = run_source('aitimes', crawl_aitimes_news)
+    logger.info("AI Times 뉴스 크롤링 작업 완료.")
+    return succeeded
+
+def job_finance_ai_news():
+    logger.info("Financial AI 뉴스 크롤링 작업 시작...")
+    succeeded = run_source('finance_ai', crawl_finance_ai_news)
+    logger.info("Financial AI 뉴스 크롤링 작업 완료.")
+    return succeeded
+
+def job_boan_news():
+    logger.info("보안뉴스 크롤링 작업 시작...")
+    succeeded = run_source('boan', crawl_boan_news)
+    logger.info("보안뉴스 크롤링 작업 완료.")
+    return succeeded
+
+# (소스 이름, 작업 함수)
+JOBS = [
+    ('daum_keyword', job_keyword_news),
+    ('daum_main', job_main_news),
+    ('aitimes', job_aitimes_news),
+    ('finance_ai', job_finance_ai_news),
+    ('boan', job_boan_news),
+]
+
+def shard_jobs(shard):
+    """실행할 작업 목록. 샤드 실행이면 키워드 뉴스는 샤드 몫만, 나머지 소스는 0번 샤드에서만 실행"""
+    if shard is None:
+        return JOBS
+    keyword_job = ('daum_keyword', functools.partial(job_keyword_news, shard))
+    return [keyword_job] + ([job for job in JOBS if job[0] != 'daum_keyword'] if shard[0] == 0 else [])
+
+def report_metrics():
+    """누적 지표를 설정된 대상으로 내보내고 요약을 로그로 남김"""
+    summary = get_metrics().export()
+    logger.info(f"크롤링 지표: {json.dumps(summary, ensure_ascii=False)}")
+    return summary
+
+def refresh_metrics_textfile():
+    """상주 실행의 누적 지표로 Prometheus textfile만 갱신 (EMF는 작업마다 한 번 출력)"""
+    metrics = get_metrics()
+    metrics.export_textfile()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"크롤링 지표: {json.dumps(metrics.summary(), ensure_ascii=False)}")
+
+def with_run_metrics(name, job):
+    """작업 1회분 지표만 EMF로 내보내도록 감싼 작업 (누적값을 다시 보내면 CloudWatch에서 계속 합산됨)"""
+    @functools.wraps(job)
+    def run():
+        metrics = get_metrics()
+        since = metrics.snapshot()
+        try:
+            return job()
+        finally:
+            metrics.export_run(since, [name])
+    return run
+
+def run_scheduler(jobs=JOBS):
+    # 스케줄러 루프는 작업을 실행기에 넘기기만 하므로 오래 걸리는 작업이 다른 작업의 예약 시각을 밀지 않음
+    executor = JobExecutor()
+    for name, job in jobs:
+        # 키워드 뉴스는 실행이 길어져 회차를 놓치면 끝난 뒤 한 번 이어서 실행
+        executor.register(name, with_run_metrics(name, job), timeout=JOB_TIMEOUTS.get(name), catch_up=(name == 'daum_keyword'))
+    names = [name for name, _ in jobs]
+
+    def every(scheduled, name):
+        # 이 프로세스가 맡은 작업만 예약 (샤드 실행에서는 일부 소스만 등록됨)
+        if name in names:
+            scheduled.do(executor.trigger, name)
+    
     # 키워드 뉴스 크롤링 (매시 정각마다)
-    schedule.every().hour.at(":00").do(job_keyword_news)
+    every(schedule.every().hour.at(":00"), 'daum_keyword')
+    # 지표는 실행 간 누적되며 Prometheus textfile은 매분 갱신 (EMF는 작업이 끝날 때마다 그 회차 값만 출력)
+    schedule.every().minute.do(refresh_metrics_textfile)
     
     # IT 뉴스 크롤링 (0, 3, 6, 9, 12, 15, 18, 21시마다)
     for hour in [0, 3, 6, 9, 12, 15, 18, 21]:
-        schedule.every().day.at(f"{hour:02d}:10").do(job_main_news)
+        every(schedule.every().day.at(f"{hour:02d}:10"), 'daum_main')
+    
+    # AI Times, 보안뉴스는 매시, 금융 AI 뉴스는 3시간마다 크롤링 (사이트별로 시각을 나눔)
+    every(schedule.every().hour.at(":20"), 'aitimes')
+    every(schedule.every().hour.at(":40"), 'boan')
+    for hour in [1, 4, 7, 10, 13, 16, 19, 22]:
+        every(schedule.every().day.at(f"{hour:02d}:30"), 'finance_ai')
     
-    logger.info("뉴스 크롤러가 실행되었습니다.")
+    logger.info(f"뉴스 크롤러가 실행되었습니다. (작업: {', '.join(names)})")
     logger.info("키워드 뉴스: 매시 정각마다 크롤링")
     logger.info("IT 뉴스: 0, 3, 6, 9, 12, 15, 18, 21시마다 크롤링")
+    logger.info("AI Times 뉴스: 매시 20분, 보안뉴스: 매시 40분마다 크롤링")
+    logger.info("Financial AI 뉴스: 1, 4, 7, 10, 13, 16, 19, 22시 30분마다 크롤링")
     
-    while True:
-        schedule.run_pending()
-        sleep(1)
+    try:
+        while True:
+            schedule.run_pending()
+            sleep(1)
+    finally:
+        executor.shutdown(wait=False)
 
 '''
 AWS Lambda 실행을 위한 함수
 '''
 def lambda_handler(event, context):
     print("Crawling starts")
-    job_keyword_news()
-    job_main_news()
+    metrics = get_metrics()
+    metrics.reset()
+    results = run_sources([('daum_keyword', job_keyword_news), ('daum_main', job_main_news)]).values()
+    failed_sources = metrics.failed_sources()
     return {
-        'statusCode': 200,
-        'body': json.dumps("upload success")
+        'statusCode': 200 if any(results) else 500,
+        'body': json.dumps({
+            "message": "upload success" if not failed_sources else "upload partially failed",
+            "failed_sources": failed_sources,
+            "metrics": metrics.export(),
+        }, ensure_ascii=False)
     }
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="다음 뉴스 크롤러")
     parser.add_argument("--immediate", "-i", action="store_true", help="즉시 실행 모드")
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count() or 1,
+                        help="기사 파싱 프로세스 수 (기본: CPU 코어 수, 0이면 요청 스레드에서 파싱)")
+    parser.add_argument("--shard-index", type=int, help="이 프로세스가 맡을 키워드 샤드 번호 (0부터)")
+    parser.add_argument("--shard-count", type=int, help="키워드 샤드 수")
+    parser.add_argument("--fan-out", type=int, metavar="N",
+                        help="키워드를 N개 샤드로 나눠 샤드마다 프로세스를 실행 (0번 샤드가 나머지 소스도 실행)")
     args = parser.parse_args()
+    try:
+        shard = parse_shard(args.shard_index, args.shard_count)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.fan_out and args.fan_out > 1:
+        # 파싱 프로세스는 샤드 프로세스들이 나눠 씀
+        command = [sys.executable, os.path.abspath(__file__), "--parse-workers", str(args.parse_workers // args.fan_out)]
+        if args.immediate:
+            command.append("--immediate")
+        exit_codes = run_local_shards(command, args.fan_out)
+        failed_shards = [shard_index for shard_index, code in exit_codes.items() if code != 0]
+        if failed_shards:
+            logger.error(f"실패한 샤드: {failed_shards}")
+        sys.exit(1 if failed_shards else 0)
 
+    configure_parse_pool(args.parse_workers)
     if args.immediate:
-        logger.info("즉시 실행 모드로 크롤링을 시작합니다.")
-        job_keyword_news()
-        job_main_news()
+        if shard is None:
+            logger.info("즉시 실행 모드로 모든 소스 크롤링을 시작합니다.")
+        else:
+            logger.info(f"즉시 실행 모드로 샤드 {shard[0]}/{shard[1]} 크롤링을 시작합니다.")
+        results = run_sources(shard_jobs(shard))
+        report_metrics()
+        sys.exit(0 if all(results.values()) else 1)
     else:
-        run_scheduler()
+        run_scheduler(shard_jobs(shard))
 
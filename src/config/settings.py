@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -7,9 +8,101 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 }
 ARTICLES_PER_KEYWORD = 10  # 키워드당 수집할 기사 수
+KEYWORD_WORKERS = 4  # 키워드 뉴스 동시 처리 작업자 수
+FINANCE_QUERY_MAX_LENGTH = 60  # 금융 AI 키워드를 OR로 묶은 검색어의 최대 길이
+FINANCE_QUERY_MAX_KEYWORDS = 6  # OR 검색어 하나에 묶을 최대 키워드 수
+FINANCE_QUERY_MAX_PAGES = 5  # OR 검색어당 최대 검색 결과 페이지 수 (이때까지 결과가 늘던 키워드는 단독으로 다시 검색)
+FINANCE_PREFILTER_ENABLED = True  # 검색 결과 카드로 AI 관련성을 먼저 판단해 본문 요청 줄이기
+FINANCE_PREFILTER_MIN_SNIPPET_LENGTH = 40  # 요약이 이보다 짧으면 판단을 미루고 본문을 받아 확인
+SEARCH_CACHE_TTL_SECONDS = 300  # 다음 검색 결과 페이지 캐시 유지 시간 (초, 0이면 캐시하지 않음)
+SEARCH_CACHE_MAX_ENTRIES = 512  # 캐시할 최대 검색 결과 페이지 수
+KEYWORD_TAGGER_REFRESH_SECONDS = 600  # 백엔드 키워드로 만든 태깅용 매칭기를 다시 만들기까지의 시간 (초)
 #ARTICLES_KEYWORDS= ["신용카드", "은행", "비씨카드", "BC카드"]
-SLEEP_MIN = 1
-SLEEP_MAX = 3
+
+# 호스트별 요청 속도 제한 (토큰 버킷, 초당 요청 수). 429/503 응답과 응답 시간을 보고 min_rate~max_rate 사이에서 자동 조정
+# 호스트 이름이 키와 같거나 그 하위 도메인이면 적용되며, 없는 항목은 "default" 값을 사용
+RATE_LIMITS = {
+    "default": {"rate": 0.5, "burst": 1, "min_rate": 0.2, "max_rate": 2.0},
+    "search.daum.net": {"rate": 0.5, "burst": 2, "min_rate": 0.2, "max_rate": 2.0},  # 다음 키워드, 금융 AI 검색
+    "daum.net": {"rate": 1.0, "burst": 2, "min_rate": 0.3, "max_rate": 4.0},  # 다음 메인 카테고리, 기사 본문
+    "aitimes.com": {"rate": 0.5, "burst": 2, "min_rate": 0.2, "max_rate": 2.0},  # AI타임스
+    "boannews.com": {"rate": 0.5, "burst": 1, "min_rate": 0.1, "max_rate": 1.0},  # 보안뉴스
+}
+RATE_LIMIT_INCREASE = 0.1  # 응답이 빠른 성공 요청마다 늘릴 초당 요청 수
+RATE_LIMIT_DECREASE = 0.5  # 429/503 응답이나 연결 오류 시 곱할 비율
+RATE_LIMIT_LATENCY_TARGET = 2.0  # 응답 시간이 이보다 길면(초) 속도를 올리지 않음
+
+# fetch 엔진 동시성 설정 (요청 속도 제한은 호스트별로 적용)
+FETCH_MAX_CONCURRENCY = 16  # 전체 동시 요청 수
+FETCH_MAX_CONCURRENCY_PER_HOST = 4  # 호스트별 동시 요청 수
+SOURCE_MAX_CONCURRENCY = 5  # 동시에 실행할 뉴스 소스 수
+
+# HTTP 전송 설정 (모든 크롤러가 공유하는 세션)
+HTTP_POOL_CONNECTIONS = 10  # 커넥션 풀을 유지할 호스트 수
+HTTP_POOL_MAXSIZE = FETCH_MAX_CONCURRENCY  # 호스트당 최대 연결 수
+HTTP_CONNECT_TIMEOUT = 5  # 연결 타임아웃(초)
+HTTP_READ_TIMEOUT = 20  # 응답 타임아웃(초)
+TLS_CA_BUNDLE = os.getenv("TLS_CA_BUNDLE") or True  # 사용자 CA 번들 경로 (기본: certifi)
+TLS_INSECURE_HOSTS = ["boannews.com"]  # 인증서 체인 문제로 검증을 생략할 호스트 (하위 도메인 포함)
+
+# HTML 파서 ("auto": lxml이 설치되어 있으면 lxml, 없으면 html.parser)
+HTML_PARSER = os.getenv("HTML_PARSER", "auto")
+# 기사 본문 파싱용 프로세스 수 (0이면 요청한 스레드에서 바로 파싱). 상주 실행(main.py)은 --parse-workers로 지정
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "0"))
+PARSE_QUEUE_SIZE = 32  # 받아 두고 아직 파싱하지 않은 HTML의 최대 개수 (넘으면 새 요청을 기다림)
+
+# 썸네일 이미지 캐시 설정
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "newsletter-crawler", "images"))
+IMAGE_CACHE_MAX_BYTES = 100 * 1024 * 1024  # 디스크 캐시 최대 용량
+IMAGE_TIMEOUT = 10  # 이미지 다운로드 타임아웃(초)
+THUMBNAIL_MAX_SIZE = (320, 320)  # 썸네일 최대 가로, 세로 크기
+THUMBNAIL_QUALITY = 70  # JPEG 재인코딩 품질
+
+# 실행 간 상태 저장소 (전송 완료 URL 등)
+STATE_DB_PATH = os.getenv("STATE_DB_PATH", os.path.join(tempfile.gettempdir(), "newsletter-crawler", "state.db"))
+SEEN_URL_TTL_HOURS = 72  # 전송 완료 URL 보관 기간
+LIST_MAX_PAGES = 20  # 기준 발행 시각에 닿을 때까지 넘길 목록 페이지 수 상한
+NEAR_DUP_MAX_DISTANCE = 7  # 제목 SimHash(64비트) 해밍 거리가 이 값 이하면 같은 기사로 판단 (최대 7)
+NEAR_DUP_MIN_TEXT_LENGTH = 15  # 이보다 짧은 제목은 유사 중복 비교에서 제외
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"  # 목록 페이지 조건부 요청 사용 여부
+
+# 백엔드 업로드 설정
+UPLOAD_MODE = os.getenv("UPLOAD_MODE", "json")  # "json": gzip JSON 배열, "ndjson": jsonl 파일(multipart)
+UPLOAD_CHUNK_BYTES = 2 * 1024 * 1024  # 청크당 최대 JSON 크기(압축 전)
+UPLOAD_GZIP = True  # JSON 모드 요청 본문 gzip 압축 여부
+UPLOAD_MAX_RETRIES = 4  # 429/5xx 재시도 횟수
+UPLOAD_BACKOFF_SECONDS = 1  # 재시도 지수 백오프 기본 대기 시간
+UPLOAD_TIMEOUT = (5, 60)  # (연결, 응답) 타임아웃(초)
+
+# 실행 지표 내보내기 설정
+METRICS_TEXTFILE_PATH = os.getenv("METRICS_TEXTFILE_PATH")  # Prometheus textfile 경로 (없으면 저장 안 함)
+METRICS_EMF_ENABLED = os.getenv("METRICS_EMF_ENABLED", "false").lower() == "true"  # CloudWatch EMF 로그 출력 여부
+METRICS_EMF_NAMESPACE = os.getenv("METRICS_EMF_NAMESPACE", "NewsLetterCrawler")
+
+# Lambda 실행 시간 예산 (초). 소스별 예산과 남은 실행 시간 중 짧은 쪽을 적용
+LAMBDA_SOURCE_BUDGETS = {
+    "daum_keyword": 300,
+    "daum_main": 120,
+    "aitimes": 60,
+    "finance_ai": 180,
+    "boan": 90,
+}
+LAMBDA_FLUSH_RESERVE_SECONDS = 30  # 마감 전 수집분 전송을 위해 남겨 둘 시간
+
+# 상주 실행(main.py) 작업 설정. 제한 시간이 지나면 새 요청을 멈추고 수집분만 전송한다
+JOB_TIMEOUTS = {
+    "daum_keyword": 1800,
+    "daum_main": 600,
+    "aitimes": 600,
+    "finance_ai": 900,
+    "boan": 600,
+}
+JOB_MAX_WORKERS = 5  # 동시에 실행할 작업 수
+JOB_JITTER_SECONDS = 30  # 예약 시각에서 작업 시작을 무작위로 늦추는 최대 시간 (사이트에 요청이 몰리지 않도록)
+
+# 키워드 크롤링 샤드 설정. 1보다 크면 Lambda 기본 실행이 키워드를 샤드 수만큼 나눠 같은 함수를 비동기로 다시 호출한다
+KEYWORD_SHARD_COUNT = int(os.getenv("KEYWORD_SHARD_COUNT", "1"))
+SHARD_FUNCTION_NAME = os.getenv("SHARD_FUNCTION_NAME")  # 샤드를 실행할 Lambda 함수 (기본: 현재 함수)
 
 # Next URL 추가
 BACKEND_URL = os.getenv("BACKEND_URL2", "http://localhost:8000")  # 기본값 설정
\ No newline at end of file
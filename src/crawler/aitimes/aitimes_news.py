@@ -1,134 +1,204 @@
-import requests
-import random
-import time
-import json
-import traceback
 import logging
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-from src.config.settings import BACKEND_URL
-from src.config.settings import HEADERS, SLEEP_MIN, SLEEP_MAX
-from src.crawler.utils.common_utils import get_image_as_base64
+from src.config.settings import LIST_MAX_PAGES
+from src.crawler.utils.common_utils import (
+    get_image_as_base64, attach_thumbnails, create_session, fetch, send_news_to_backend, record_found
+)
+from src.crawler.utils.http_cache import get_http_cache
+from src.crawler.utils.seen_store import get_seen_store
+from src.crawler.utils.near_duplicates import get_near_duplicate_index
+from src.crawler.utils.parse_pool import parse_pages
+from src.crawler.utils.html_parser import make_soup, SoupStrainer
+from src.crawler.utils.metrics import get_metrics
+from src.crawler.utils.deadline import deadline_reached
+from src.crawler.utils.watermark_store import get_watermark_store, next_watermark
 from pytz import timezone
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def send_news_to_backend(news_list):
-    """뉴스 데이터 백엔드 전송"""
-    url = f"{BACKEND_URL}/api/public/news"
-    try:
-        response = requests.post(url, json=news_list)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        logger.error(f"데이터 전송 중 오류 발생: {str(e)}")
-        logger.error(traceback.format_exc())
-        return {"error": str(e)}
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON 디코딩 오류: {str(e)}")
-        logger.error(f"응답 내용: {response.text}")
-        return {"error": str(e)}
-    except Exception as e:
-        logger.error(f"예상치 못한 오류 발생: {str(e)}")
-        logger.error(traceback.format_exc())
-        return {"error": str(e)}
+LIST_URL = "https://www.aitimes.com/news/articleList.html?view_type=sm"
+
+# 목록 페이지는 기사 목록 섹션, 기사 페이지는 본문 영역만 파싱
+LIST_STRAINER = SoupStrainer('section', id='section-list')
+ARTICLE_STRAINER = SoupStrainer(id='article-view-content-div')
+
+def parse_article_list(html, cutoff):
+    """기사 목록 페이지에서 cutoff 이후 기사의 제목, 발행일시, 링크 추출
+
+    반환: (기사 목록, 다음 페이지 탐색 중단 여부). cutoff 이전 기사가 있거나 빈 페이지면 중단한다.
+    """
+    soup = make_soup(html, LIST_STRAINER)
+    
+    # 기사 목록 찾기
+    section = soup.find('section', id='section-list')
+    article_list = section.find_all('li') if section else []
+    
+    entries = []
+    stop = not article_list
+    for article in article_list:
+        try:
+            # 기사 제목
+            title_tag = article.find('h4', class_='titles')
+            if title_tag:
+                title = title_tag.text.strip()
+            else:
+                continue
+
+            # 발행일시
+            published_at_str = article.find('span', class_='byline').find_all('em')[1].text.strip()
+
+            try:
+                # 날짜 파싱 형식 수정
+                published_at = datetime.strptime(published_at_str, "%Y.%m.%d %H:%M")
+                published_at = timezone('Asia/Seoul').localize(published_at)
+            except ValueError:
+                logger.error(f"날짜 파싱 오류: {published_at_str}")
+                published_at = None
+            
+            if published_at and published_at < cutoff:
+                stop = True
+            # 기준 시각 이후의 기사만 수집
+            if published_at and published_at >= cutoff:
+                # 기사 링크
+                link = title_tag.find('a')['href']
+                entries.append({
+                    "title": title,
+                    "published_at": published_at,
+                    "url": f"https://www.aitimes.com{link}"
+                })
+            
+        except Exception as e:
+            logger.error(f"Error processing article: {e}", exc_info=True)
+    
+    return entries, stop
+
+def extract_article_page(entry, html):
+    """개별 기사 페이지에서 본문을 추출해 기사 데이터 생성 (반환: 기사 데이터, 첫 번째 이미지 URL)
+
+    네트워크 요청 없이 HTML만 다루므로 파싱 프로세스에서 실행할 수 있다.
+    """
+    article_soup = make_soup(html, ARTICLE_STRAINER)
+    
+    # 기사 내용
+    content_div = article_soup.find(id='article-view-content-div')
+    content = content_div.text.strip()
+
+    # 이미지 URL 추출
+    image_url = None
+    image_tag = content_div.find('img')  # 이미지 태그 찾기
+    if image_tag and 'src' in image_tag.attrs:
+        image_url = image_tag['src']  # 첫 번째 이미지만 저장
+    
+    article = {
+        "title": entry["title"],
+        "content": content,
+        "published_at": entry["published_at"].isoformat(),
+        "url": entry["url"],
+        "tags": ["AI"],
+        "thumbnail_image": None
+    }
+    return article, image_url
+
+def parse_article_page(entry, html):
+    """개별 기사 페이지에서 본문과 이미지를 추출해 기사 데이터 생성"""
+    article, image_url = extract_article_page(entry, html)
+    if image_url:
+        article["thumbnail_image"] = get_image_as_base64(image_url)
+    return article
+
+def collect_entries(session, first_page_html, cutoff):
+    """기준 시각에 닿을 때까지 목록 페이지를 넘기며 기사 수집 (반환: 기사 목록, 기준 시각까지 모두 확인했는지 여부)"""
+    entries, stop = parse_article_list(first_page_html, cutoff)
+    page_no = 1
+    while not stop:
+        if page_no >= LIST_MAX_PAGES or deadline_reached():
+            logger.warning(f"목록 {page_no} 페이지에서 탐색을 멈춥니다. 남은 기사는 다음 실행에서 수집합니다.")
+            break
+        page_no += 1
+        try:
+            page_entries, stop = parse_article_list(fetch(session, f"{LIST_URL}&page={page_no}"), cutoff)
+        except Exception as e:
+            logger.error(f"목록 {page_no} 페이지 요청 중 오류 발생: {e}")
+            break
+        entries.extend(page_entries)
+    
+    # 수집 중 새 기사가 올라오면 다음 페이지에 같은 기사가 다시 나올 수 있음
+    unique_entries = {}
+    for entry in entries:
+        unique_entries.setdefault(entry["url"], entry)
+    logger.info(f"목록 {page_no}개 페이지에서 기사 {len(unique_entries)}개 발견")
+    return list(unique_entries.values()), stop
 
 def crawl_aitimes_news():
-    url = "https://www.aitimes.com/news/articleList.html?view_type=sm"
     # 결과를 저장할 리스트
     articles = []
     
     try:
-        # 현재 시각과 24시간 전 시각 계산
+        # 24시간 이내이면서 지난 실행에서 전송한 최신 기사 이후의 기사만 수집
         now = timezone('Asia/Seoul').localize(datetime.now())
-        twenty_four_hours_ago = now - timedelta(hours=24)
+        watermark = get_watermark_store().get('aitimes')
+        cutoff = max(now - timedelta(hours=24), watermark) if watermark else now - timedelta(hours=24)
 
-        # 페이지 요청
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
+        # 첫 페이지는 조건부 요청 (요청 간격은 fetch 엔진이 호스트별로 관리)
+        session = create_session()
+        page = get_http_cache().fetch(session, LIST_URL)
+        if not page.changed:
+            logger.info("기사 목록에 변경이 없어 크롤링을 건너뜁니다.")
+            return None
         
-        # BeautifulSoup으로 파싱
-        soup = BeautifulSoup(response.text, 'html.parser')
+        entries, complete = collect_entries(session, page.text, cutoff)
         
-        # 기사 목록 찾기
-        article_list = soup.find('section', id='section-list').find_all('li')
+        # 이전 실행에서 이미 전송한 기사는 건너뜀
+        unseen_urls = set(get_seen_store().filter_unseen([entry["url"] for entry in entries]))
+        record_found(len(entries), len(unseen_urls))
+        sent_times = [entry["published_at"] for entry in entries if entry["url"] not in unseen_urls]
+        entries = [entry for entry in entries if entry["url"] in unseen_urls]
         
-        for article in article_list:
-            try:
-                # 기사 제목
-                title_tag = article.find('h4', class_='titles')
-                if title_tag:
-                    title = title_tag.text.strip()
-                else:
-                    continue
-
-                # 발행일시
-                published_at_str = article.find('span', class_='byline').find_all('em')[1].text.strip()
-
-                try:
-                    # 날짜 파싱 형식 수정
-                    published_at = datetime.strptime(published_at_str, "%Y.%m.%d %H:%M")
-                    published_at = timezone('Asia/Seoul').localize(published_at)
-                except ValueError:
-                    logger.error(f"날짜 파싱 오류: {published_at_str}")
-                    published_at = None
-                
-                # 24시간 이내의 기사만 수집
-                if published_at and published_at >= twenty_four_hours_ago:
-                    # 기사 링크
-                    link = title_tag.find('a')['href']
-                    full_link = f"https://www.aitimes.com{link}"
-                    
-                    # 개별 기사 페이지 접근
-                    article_response = requests.get(full_link, headers=headers)
-                    article_soup = BeautifulSoup(article_response.text, 'html.parser')
-                    
-                    # 기사 내용
-                    content_div = article_soup.find(id='article-view-content-div')
-                    content = content_div.text.strip()
-
-                    # 이미지 데이터 추출
-                    image_data = None
-                    image_tag = content_div.find('img')  # 이미지 태그 찾기
-                    if image_tag and 'src' in image_tag.attrs:
-                        image_url = image_tag['src']  # 첫 번째 이미지만 저장
-                        image_data = get_image_as_base64(image_url)
-                    #print(content)
-                    # 결과 저장
-                    articles.append({
-                        "title": title,
-                        "content": content,
-                        "published_at": published_at.isoformat() if published_at else None,
-                        "url": full_link,
-                        "tags": ["AI"],
-                        "thumbnail_image": image_data
-                    })
-                
-            except Exception as e:
-                logger.error(f"Error processing article: {e}", exc_info=True)
-
-            finally:
-                # 서버 부하 방지를 위한 딜레이
-                time.sleep(random.uniform(SLEEP_MIN, SLEEP_MAX))
+        # 다른 소스에서 이미 찾은 유사 기사는 본문을 받지 않음 (태그는 대표 기사에 합쳐짐)
+        index = get_near_duplicate_index()
+        claimed = [entry for entry in entries
+                   if index.claim(entry["url"], entry["title"], tags=["AI"], owner='aitimes')]
+        claimed_urls = {entry["url"] for entry in claimed}
+        duplicates = {entry["url"]: entry["published_at"] for entry in entries if entry["url"] not in claimed_urls}
+        entries = claimed
         
-        # DataFrame으로 변환
-        #print(articles)
+        # 개별 기사 페이지는 동시에 요청하고 파싱 단계로 넘김 (이미지는 파싱 후 받음)
+        parsed_pages = parse_pages(session, [entry["url"] for entry in entries], extract_article_page, entries)
+        pending_times = []
+        for entry, article in zip(entries, attach_thumbnails(parsed_pages)):
+            if article is None:
+                pending_times.append(entry["published_at"])
+                index.release(entry["url"])
+                continue
+            articles.append(article)
         
         # 백엔드로 뉴스 데이터 전송
         if articles:
             result = send_news_to_backend(articles)
-            logger.info(f"전송 결과: {result}")
+            get_seen_store().mark_sent(result["sent_urls"], source='aitimes')
+            logger.info(f"전송 결과: {len(result['sent_urls'])}건 성공, {len(result['failed_urls'])}건 실패")
+            published = {entry["url"]: entry["published_at"] for entry in entries}
+            sent_times.extend(published[url] for url in result["sent_urls"])
+            pending_times.extend(published[url] for url in result["failed_urls"])
+        # 대표 기사가 전송되지 않은 유사 중복 기사는 다음 실행에서 다시 확인
+        pending_times.extend(duplicates[url] for url in index.unresolved(duplicates))
+        
+        # 기준 시각까지 목록을 모두 확인한 경우에만 기준 시각을 앞으로 옮김 (처리하지 못한 기사 이전까지)
+        if complete:
+            get_watermark_store().advance('aitimes', next_watermark(sent_times, pending_times))
+        
+        # 목록의 기사를 모두 반영한 경우에만 다음 실행에서 변경 여부를 비교하도록 저장
+        if complete and not pending_times:
+            get_http_cache().commit(page)
         
         logger.info(f"Successfully crawled {len(articles)} articles")
         return None
         
     except Exception as e:
         logger.error(f"Error crawling website: {e}")
+        get_metrics().inc('run', 'failed')
         return None
 
 # 크롤링 실행
@@ -1,40 +1,31 @@
-import requests
-import random
-import time
-import json
 import traceback
 import logging
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-from src.config.settings import BACKEND_URL
-from src.config.settings import HEADERS, SLEEP_MIN, SLEEP_MAX
-from src.crawler.utils.common_utils import get_image_as_base64
+from src.config.settings import LIST_MAX_PAGES
+from src.crawler.utils.common_utils import (
+    get_image_as_base64, attach_thumbnails, create_session, send_news_to_backend, record_found
+)
+from src.crawler.utils.http_cache import get_http_cache
+from src.crawler.utils.seen_store import get_seen_store
+from src.crawler.utils.near_duplicates import get_near_duplicate_index
+from src.crawler.utils.parse_pool import parse_pages
+from src.crawler.utils.html_parser import make_soup, has_class, SoupStrainer
+from src.crawler.utils.metrics import get_metrics
+from src.crawler.utils.deadline import deadline_reached
+from src.crawler.utils.watermark_store import get_watermark_store, next_watermark
 from pytz import timezone
-import certifi
 
 # 상수 정의
 SEOUL_TIMEZONE = 'Asia/Seoul'
 
+# 목록 페이지는 기사 항목, 기사 페이지는 본문 영역만 파싱
+LIST_STRAINER = SoupStrainer(class_=has_class('news_list'))
+ARTICLE_STRAINER = SoupStrainer(id='news_content')
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def send_news_to_backend(news_list):
-    """뉴스 데이터 백엔드 전송"""
-    url = f"{BACKEND_URL}/api/public/news"
-    try:
-        response = requests.post(url, json=news_list)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        logger.error(f"데이터 전송 중 오류 발생: {str(e)}")
-        logger.error(traceback.format_exc())
-        return {"error": str(e)}
-    except Exception as e:
-        logger.error(f"예상치 못한 오류 발생: {str(e)}")
-        logger.error(traceback.format_exc())
-        return {"error": str(e)}
-
 def parse_published_date(date_str):
     """날짜 문자열을 파싱하여 timezone 적용된 datetime 객체 반환"""
     try:
@@ -45,24 +36,23 @@ def parse_published_date(date_str):
         return None
 
 def extract_article_content(article_soup):
-    """기사 내용과 이미지 추출"""
+    """기사 내용과 이미지 URL 추출"""
     content_div = article_soup.select_one('#news_content')
     if not content_div:
         return None, None
     
     content = content_div.text.strip()
-    image_data = None
+    image_url = None
     image_tag = content_div.find('img')
     if image_tag and 'src' in image_tag.attrs:
         image_url = image_tag['src']
         if not image_url.startswith('http'):
             image_url = f"https://boannews.com{image_url}"
-        image_data = get_image_as_base64(image_url)
     
-    return content, image_data
+    return content, image_url
 
-def process_article(article, headers, twenty_four_hours_ago):
-    """개별 기사 처리"""
+def parse_list_item(article, cutoff):
+    """목록 항목에서 날짜, 링크, 제목 추출 (반환: 기사 메타 정보, 크롤링 중단 여부)"""
     try:
         # 날짜 정보 먼저 확인
         date_element = article.select_one('.news_writer')
@@ -74,8 +64,8 @@ def process_article(article, headers, twenty_four_hours_ago):
         published_at = datetime.strptime(date_str, '%Y년 %m월 %d일 %H:%M')
         published_at = timezone(SEOUL_TIMEZONE).localize(published_at)
         
-        # 24시간 이전 기사는 크롤링하지 않음
-        if published_at < twenty_four_hours_ago:
+        # 기준 시각 이전 기사는 크롤링하지 않음
+        if published_at < cutoff:
             return None, True
             
         # 링크 추출
@@ -92,92 +82,185 @@ def process_article(article, headers, twenty_four_hours_ago):
             return None, False
         title = title_element.text.strip()
         
-        # 기사 내용 가져오기
-        article_response = requests.get(link, headers=headers, verify=False)
-        article_soup = BeautifulSoup(article_response.text, 'html.parser')
+        return {"title": title, "published_at": published_at, "url": link}, False
         
-        content, image_data = extract_article_content(article_soup)
+    except Exception as e:
+        logger.error(f"기사 처리 중 오류 발생: {str(e)}")
+        logger.error(traceback.format_exc())
+        return None, False
+
+def parse_article(meta, html):
+    """기사 본문 HTML로 기사 데이터 생성 (반환: 기사 데이터, 이미지 URL). 본문이 없으면 None
+
+    네트워크 요청 없이 HTML만 다루므로 파싱 프로세스에서 실행할 수 있다.
+    """
+    try:
+        article_soup = make_soup(html, ARTICLE_STRAINER)
+        
+        content, image_url = extract_article_content(article_soup)
         if not content:
-            return None, False
+            return None
         
         article = {
-            "title": title,
+            "title": meta["title"],
             "content": content,
-            "published_at": published_at.isoformat(),
-            "url": link,
+            "published_at": meta["published_at"].isoformat(),
+            "url": meta["url"],
             "tags": ["보안"],
-            "thumbnail_image": image_data
+            "thumbnail_image": None
         }
-        
-        return article, False
+        return article, image_url
         
     except Exception as e:
         logger.error(f"기사 처리 중 오류 발생: {str(e)}")
         logger.error(traceback.format_exc())
-        return None, False
+        return None
+
+def finish_article(parsed):
+    """파싱 결과에 썸네일 이미지를 붙여 기사 데이터 반환 (파싱에 실패했으면 None)"""
+    if parsed is None:
+        return None
+    article, image_url = parsed
+    if image_url:
+        article["thumbnail_image"] = get_image_as_base64(image_url)
+    return article
+
+def process_article(meta, html):
+    """기사 본문 HTML로 기사 데이터 생성"""
+    return finish_article(parse_article(meta, html))
+
+def get_article_list(session, page):
+    """특정 페이지의 기사 목록을 가져옴 (반환: 기사 목록, 조건부 요청 결과)
 
-def get_article_list(page):
-    """특정 페이지의 기사 목록을 가져옴"""
-    base_url = "https://boannews.com/media/t_list.asp"
-    params = {
-        'page': str(page)
-    }
+    지난 실행 이후 바뀌지 않은 페이지는 기사 목록 대신 None을 반환한다.
+    """
+    url = f"https://boannews.com/media/t_list.asp?page={page}"
     try:
-        response = requests.get(
-            base_url, 
-            params=params, 
-            headers=HEADERS,
-            verify=False
-        )
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        cached_page = get_http_cache().fetch(session, url)
+        if not cached_page.changed:
+            return None, cached_page
+        soup = make_soup(cached_page.text, LIST_STRAINER)
         article_list = soup.select('.news_list')
-        return article_list
+        return article_list, cached_page
     except Exception as e:
         logger.error(f"페이지 {page} 크롤링 중 오류 발생: {e}")
-        return []
+        return [], None
 
-def process_page(page, headers, twenty_four_hours_ago):
-    """단일 페이지의 기사들을 처리"""
-    articles = []
-    article_list = get_article_list(page)
+def process_page(session, page, cutoff, known_urls=None, duplicates=None):
+    """단일 페이지의 기사들을 처리 (known_urls: 앞 페이지에서 이미 찾은 기사 URL, 이 함수가 갱신)
+
+    duplicates를 주면 유사 중복으로 건너뛴 기사의 {URL: 발행 시각}을 기록한다.
+
+    반환: (기사 리스트, 크롤링 중단 여부, 모두 처리한 경우 조건부 요청 결과, 처리하지 못한 기사의 발행 시각 리스트)
+    """
+    metas = []
+    stop_crawling = False
+    
+    article_list, cached_page = get_article_list(session, page)
+    if article_list is None:
+        # 변경 없는 목록 페이지는 파싱과 이후 단계를 모두 생략
+        logger.info(f"페이지 {page} 변경 없음. 크롤링을 중단합니다.")
+        return [], True, None, []
+    if not article_list:
+        # 목록 끝이거나 요청 실패. 읽지 못한 페이지의 기사는 기준 시각 이후 어디든 있을 수 있음
+        return [], True, None, [] if cached_page else [cutoff]
     
     for article in article_list:
-        try:
-            article_data, stop_crawling = process_article(article, headers, twenty_four_hours_ago)
-            if stop_crawling:
-                return articles, True
-            if article_data:
-                articles.append(article_data)
-        except Exception as e:
-            logger.error(f"기사 처리 중 오류 발생: {e}", exc_info=True)
-        finally:
-            time.sleep(random.uniform(SLEEP_MIN, SLEEP_MAX))
+        meta, stop_crawling = parse_list_item(article, cutoff)
+        if stop_crawling:
+            break
+        if meta:
+            metas.append(meta)
     
-    return articles, False
+    # 수집 중 새 기사가 올라오면 앞 페이지의 기사가 다음 페이지에 다시 나올 수 있음
+    if known_urls is not None:
+        metas = [meta for meta in metas if meta["url"] not in known_urls]
+        known_urls.update(meta["url"] for meta in metas)
+    
+    # 이전 실행에서 이미 전송한 기사는 건너뜀
+    unseen_urls = set(get_seen_store().filter_unseen([meta["url"] for meta in metas]))
+    record_found(len(metas), len(unseen_urls))
+    metas = [meta for meta in metas if meta["url"] in unseen_urls]
+    
+    # 다른 소스에서 이미 찾은 유사 기사는 본문을 받지 않음 (태그는 대표 기사에 합쳐짐)
+    index = get_near_duplicate_index()
+    claimed = [meta for meta in metas
+               if index.claim(meta["url"], meta["title"], tags=["보안"], owner='boan')]
+    if duplicates is not None:
+        claimed_urls = {meta["url"] for meta in claimed}
+        duplicates.update((meta["url"], meta["published_at"]) for meta in metas if meta["url"] not in claimed_urls)
+    metas = claimed
+    
+    # 기사 본문은 fetch 엔진으로 동시에 요청하고 파싱 단계로 넘김 (요청 간격은 호스트별로 적용)
+    articles = []
+    missed = []
+    parsed_pages = parse_pages(session, [meta["url"] for meta in metas], parse_article, metas)
+    for meta, article_data in zip(metas, attach_thumbnails(parsed_pages)):
+        if article_data:
+            articles.append(article_data)
+        else:
+            missed.append(meta["published_at"])
+            index.release(meta["url"])
+    
+    return articles, stop_crawling, cached_page if not missed else None, missed
 
 def crawl_boan_news():
     """보안뉴스 크롤링 메인 함수"""
     articles = []
     now = timezone(SEOUL_TIMEZONE).localize(datetime.now())
-    twenty_four_hours_ago = now - timedelta(hours=24)
+    # 24시간 이내이면서 지난 실행에서 전송한 최신 기사 이후의 기사만 수집
+    watermark = get_watermark_store().get('boan')
+    cutoff = max(now - timedelta(hours=24), watermark) if watermark else now - timedelta(hours=24)
     
     try:
-        for page in range(1, 5):
-            page_articles, should_stop = process_page(page, HEADERS, twenty_four_hours_ago)
+        session = create_session()
+        completed_pages = []
+        pending_times = []
+        known_urls = set()
+        duplicates = {}
+        reached_cutoff = False
+        page = 1
+        # 기준 시각 이전 기사가 나올 때까지 필요한 만큼 페이지를 넘김
+        while page <= LIST_MAX_PAGES:
+            if deadline_reached():
+                logger.warning(f"실행 시간 예산 초과로 {page} 페이지부터 다음 실행으로 미룹니다.")
+                break
+            page_articles, should_stop, cached_page, missed = process_page(session, page, cutoff, known_urls, duplicates)
             articles.extend(page_articles)
+            pending_times.extend(missed)
+            if cached_page:
+                completed_pages.append(cached_page)
             if should_stop:
+                reached_cutoff = True
                 break
+            page += 1
         
+        sent_times = []
         if articles:
             result = send_news_to_backend(articles)
-            logger.info(f"전송 결과: {result}")
+            get_seen_store().mark_sent(result["sent_urls"], source='boan')
+            logger.info(f"전송 결과: {len(result['sent_urls'])}건 성공, {len(result['failed_urls'])}건 실패")
+            published = {article["url"]: datetime.fromisoformat(article["published_at"]) for article in articles}
+            sent_times = [published[url] for url in result["sent_urls"]]
+            pending_times.extend(published[url] for url in result["failed_urls"])
+        # 대표 기사가 전송되지 않은 유사 중복 기사는 다음 실행에서 다시 확인
+        pending_times.extend(duplicates[url] for url in get_near_duplicate_index().unresolved(duplicates))
+        
+        # 기준 시각까지 목록을 모두 확인한 경우에만 기준 시각을 앞으로 옮김 (처리하지 못한 기사 이전까지)
+        if reached_cutoff:
+            get_watermark_store().advance('boan', next_watermark(sent_times, pending_times))
+        
+        # 기준 시각까지 목록을 모두 확인하고 기사도 모두 전송한 경우에만 목록 페이지를 다음 실행의 변경 비교 기준으로 저장
+        # (마감이나 LIST_MAX_PAGES로 중간에 멈춘 실행에서 저장하면 다음 실행이 1 페이지 변경 없음으로 멈춰 뒤 페이지를 놓침)
+        if reached_cutoff and not pending_times and completed_pages:
+            get_http_cache().commit(*completed_pages)
         
         logger.info(f"총 {len(articles)}개의 기사를 크롤링했습니다.")
         return None
         
     except Exception as e:
         logger.error(f"크롤링 중 오류 발생: {e}")
+        get_metrics().inc('run', 'failed')
         return None
 
 if __name__ == "__main__":
@@ -1,56 +1,26 @@
-from src.crawler.utils.common_utils import fetch, get_daum_news_content, create_session, logger, seoul_tz, send_news_to_backend
-from bs4 import BeautifulSoup
+from src.crawler.utils.common_utils import get_daum_news_contents, create_session, logger, seoul_tz, send_news_to_backend, record_found
+from src.crawler.daum.daum_search import get_daum_search_client
 from datetime import datetime, timedelta
+import contextvars
 import json
 import os
-from src.config.settings import ARTICLES_PER_KEYWORD, BACKEND_URL
-import requests
-from src.crawler.utils.crawler_config import CrawlerConfig
+from src.config.settings import ARTICLES_PER_KEYWORD, KEYWORD_WORKERS
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.crawler.utils.crawler_config import CrawlerConfig, get_keywords_from_api
+from src.crawler.utils.sharding import select_shard
+from src.crawler.utils.seen_store import get_seen_store
+from src.crawler.utils.near_duplicates import get_near_duplicate_index
+from src.crawler.utils.metrics import get_metrics
+from src.crawler.utils.deadline import DeadlineExceeded, check_deadline, deadline_reached
 import traceback
 
-def get_url_list(session, search_str, last_crawl_time):
-    url_list = []
-    page = 1
-    current_time = datetime.now(seoul_tz)
-    
-    # 24시간 전 시각 계산
-    twenty_four_hours_ago = current_time - timedelta(hours=24)
+def get_search_results(session, search_str, last_crawl_time):
+    """키워드 정확도순 검색 결과의 기사 URL, 제목, 요약 리스트"""
+    return get_daum_search_client().search(session, search_str, "accuracy", last_crawl_time, ARTICLES_PER_KEYWORD)
 
-    if last_crawl_time and last_crawl_time > twenty_four_hours_ago:
-        start_date = last_crawl_time.strftime("%Y%m%d%H%M%S")
-    else:
-        start_date = twenty_four_hours_ago.strftime("%Y%m%d%H%M%S")
-    
-    end_date = current_time.strftime("%Y%m%d%H%M%S")
-    #sort = "recency"
-    sort = "accuracy"
-
-    while len(url_list) < ARTICLES_PER_KEYWORD:
-        base_url = f"https://search.daum.net/search?nil_suggest=btn&w=news&DA=PGD&cluster=y&q={search_str}&sort={sort}&sd={start_date}&ed={end_date}&period=u&p={page}"
-        logger.info(f"크롤링 중인 페이지: {base_url}")
-        
-        html = fetch(session, base_url)
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        titles = soup.find_all('div', class_='item-title')
-        if not titles:
-            break
-        
-        for title in titles:
-            a_tag = title.find('a')
-            if a_tag and 'href' in a_tag.attrs:
-                link = a_tag['href']
-                logger.info(f"URL : '{link}'")
-                if link not in url_list:
-                    url_list.append(link)
-                    if len(url_list) >= ARTICLES_PER_KEYWORD:
-                        return url_list
-                else:
-                    logger.info(f"중복 기사 발견. '{search_str}' 키워드 크롤링을 중단합니다.")
-                    return url_list
-        
-        page += 1
-    return url_list
+def get_url_list(session, search_str, last_crawl_time):
+    return [result["url"] for result in get_search_results(session, search_str, last_crawl_time)]
 
 def save_to_file(articles):
     if not articles:
@@ -68,31 +38,104 @@ def save_to_file(articles):
     logger.info(f"{len(articles)}개의 기사를 파일에 저장했습니다: {filename}")
     return filename
 
-def get_keywords_from_api():
-    url = f"{BACKEND_URL}/api/public/keywords"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        keywords_json = response.json()
-        logger.info(f"API에서 가져온 키워드: {keywords_json}")
-        return keywords_json
-    except requests.RequestException as e:
-        logger.error(f"키워드 가져오기 실패: {e}")
-        logger.error(traceback.format_exc())
-        return []
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON 디코딩 오류: {e}")
-        logger.error(f"응답 내용: {response.text}")
-        logger.error(traceback.format_exc())
-        return []
+class ArticleRegistry:
+    """키워드 검색으로 찾은 기사 본문 저장소. 여러 키워드에서 같은 URL을 발견해도 본문은 한 번만 가져온다"""
+    def __init__(self, session):
+        self.session = session
+        self._lock = threading.Lock()
+        self._articles = {}
+
+    def fetch(self, urls):
+        # 아직 가져오지 않은 URL만 요청
+        with self._lock:
+            owned = [url for url in urls if url not in self._articles]
+            for url in owned:
+                self._articles[url] = None
+        if not owned:
+            return
+        
+        articles = get_daum_news_contents(self.session, owned)
+        with self._lock:
+            for url, article in zip(owned, articles):
+                self._articles[url] = article
+        # 본문을 받지 못한 기사는 유사 중복 등록을 취소해 다른 소스의 유사 기사를 막지 않음
+        get_near_duplicate_index().release(*[url for url, article in zip(owned, articles) if article is None])
+
+    def get(self, url):
+        with self._lock:
+            return self._articles.get(url)
 
-def crawl_daum_keyword_news():
+    def failed_urls(self):
+        """본문을 가져오지 못한 URL 목록"""
+        with self._lock:
+            return [url for url, article in self._articles.items() if article is None]
+
+def get_last_crawl_time(last_crawled_at, twenty_four_hours_ago, committed_at=None):
+    """백엔드의 마지막 크롤링 시각과 로컬 저널에 확정된 시각 중 최신 값 (24시간 전보다 이전이면 24시간 전)"""
+    last_crawl_time = None
+    if last_crawled_at:
+        last_crawl_time = datetime.fromisoformat(last_crawled_at)
+        if last_crawl_time.tzinfo is None:
+            last_crawl_time = seoul_tz.localize(last_crawl_time)
+    if committed_at and (last_crawl_time is None or committed_at > last_crawl_time):
+        # 백엔드 반영 전에 실행이 끝난 경우 저널의 시각부터 이어서 크롤링
+        last_crawl_time = committed_at
+    if last_crawl_time is None or last_crawl_time < twenty_four_hours_ago:
+        last_crawl_time = twenty_four_hours_ago
+    return last_crawl_time
+
+def crawl_keyword(session, keyword_json, twenty_four_hours_ago, committed_at=None):
+    """단일 키워드 검색 (반환: 검색 결과 리스트)"""
+    keyword = keyword_json['keyword']
+    check_deadline()
+    logger.info(f"'{keyword}' 키워드에 대한 뉴스 크롤링 시작")
+    
+    last_crawl_time = get_last_crawl_time(keyword_json['lastCrawledAt'], twenty_four_hours_ago, committed_at)
+    results = get_search_results(session, keyword, last_crawl_time)
+    logger.info(f"'{keyword}' 키워드에 대해 {len(results)}개의 기사를 검색했습니다.")
+    return results
+
+def claim_keyword_articles(keyword_results):
+    """본문을 받을 기사 URL 리스트
+
+    이전 실행에서 이미 전송한 기사와 다른 소스에서 찾은 유사 기사는 제외한다. 유사 중복 색인에는 키워드 목록 순서,
+    검색 순위 순서대로 등록해 작업자가 끝난 순서와 상관없이 같은 검색 결과에서는 같은 기사가 대표가 된다.
+    """
+    index = get_near_duplicate_index()
+    owned = {}
+    for keyword, results in keyword_results:
+        url_list = [result["url"] for result in results]
+        unseen_urls = set(get_seen_store().filter_unseen(url_list))
+        record_found(len(url_list), len(unseen_urls))
+        for result in results:
+            if result["url"] in unseen_urls and index.claim(result["url"], result["title"], keywords=[keyword],
+                                                            tags=[keyword], owner='daum_keyword'):
+                owned.setdefault(result["url"])
+    return list(owned)
+
+def merge_keyword_articles(registry, keyword_results):
+    """키워드 순서대로 기사를 병합. 여러 키워드에서 발견된 URL은 모든 키워드를 갖는다"""
+    unique_articles = {}
+    for keyword, url_list in keyword_results:
+        for url in url_list:
+            if url not in unique_articles:
+                article = registry.get(url)
+                if article:
+                    article['keywords'] = [keyword]
+                    article['tags'] = [keyword] #일단 키워드와 태그를 동일하게 하자 "KT, BCCARD"
+                    unique_articles[url] = article
+            elif keyword not in unique_articles[url]['keywords']:
+                unique_articles[url]['keywords'].append(keyword)
+                logger.info(f"중복된 URL에 키워드 추가: {url}, 키워드: {keyword}")
+    return unique_articles
+
+def crawl_daum_keyword_news(shard=None):
+    """백엔드 키워드별 다음 뉴스 크롤링. shard=(샤드 번호, 샤드 수)를 주면 그 샤드에 배정된 키워드만 크롤링하고 시각을 갱신"""
     start_time = datetime.now(seoul_tz)
     logger.info(f"다음 키워드 뉴스 크롤링 작업 시작... (시작 시간: {start_time.isoformat()})")
     
     try:
-        session = create_session()
-        unique_articles = {}
+        registry = ArticleRegistry(create_session())
         crawler_config = CrawlerConfig()
         twenty_four_hours_ago = start_time - timedelta(hours=24)
 
@@ -100,51 +143,74 @@ def crawl_daum_keyword_news():
         if not keywords_jsonArr:
             logger.error("키워드를 가져오지 못했습니다. 크롤링을 중단합니다.")
             return []
+        # 샤드 실행에서는 배정된 키워드만 전송하고 시각도 그 키워드만 반영
+        scope = None
+        if shard is not None:
+            total = len(keywords_jsonArr)
+            keywords_jsonArr = select_shard(keywords_jsonArr, shard)
+            scope = [keyword_json['keyword'] for keyword_json in keywords_jsonArr]
+            logger.info(f"샤드 {shard[0]}/{shard[1]}: 전체 키워드 {total}개 중 {len(keywords_jsonArr)}개를 크롤링합니다.")
+            if not keywords_jsonArr:
+                return []
+        # 이전 실행에서 확정했지만 백엔드에 반영하지 못한 시각을 먼저 보냄
+        crawler_config.flush(scope)
+        committed_times = crawler_config.get_all_last_crawled_times()
 
+        # 키워드별 검색은 작업자 풀에서 동시에 처리 (지표 소스 구분을 위해 컨텍스트 전달)
         crawled_keywords = []
-        for json in keywords_jsonArr:
-            keyword = json['keyword']
-            last_crawled_at = json['lastCrawledAt']
-            logger.info(f"'{keyword}' 키워드에 대한 뉴스 크롤링 시작")
-            
-            if last_crawled_at:
-                last_crawl_time = datetime.fromisoformat(last_crawled_at)
-                if last_crawl_time.tzinfo is None:
-                    last_crawl_time = seoul_tz.localize(last_crawl_time)
-                if last_crawl_time < twenty_four_hours_ago:
-                    last_crawl_time = twenty_four_hours_ago
-            else:
-                last_crawl_time = twenty_four_hours_ago
-            
-            url_list = get_url_list(session, keyword, last_crawl_time)
-            
-            for url in url_list:
-                if url not in unique_articles:
-                    article = get_daum_news_content(session, url)
-                    if article:
-                        article['keywords'] = [keyword]
-                        article['tags'] = [keyword] #일단 키워드와 태그를 동일하게 하자 "KT, BCCARD"
-                        unique_articles[url] = article
-                elif keyword not in unique_articles[url]['keywords']:
-                    unique_articles[url]['keywords'].append(keyword)
-                    logger.info(f"중복된 URL에 키워드 추가: {url}, 키워드: {keyword}")
-            
-            logger.info(f"'{keyword}' 키워드에 대해 {len(url_list)}개의 기사를 크롤링했습니다.")
-            crawled_keywords.append(keyword)
-            
-            # 크롤링이 완료된 후 마지막 크롤링 시간 업데이트
-            crawler_config.update_last_crawled_times(crawled_keywords, start_time)
+        search_results = {}
+        with ThreadPoolExecutor(max_workers=KEYWORD_WORKERS, thread_name_prefix="keyword") as executor:
+            futures = {
+                executor.submit(contextvars.copy_context().run, crawl_keyword, registry.session, keyword_json,
+                                twenty_four_hours_ago, committed_times.get(keyword_json['keyword'])): keyword_json['keyword']
+                for keyword_json in keywords_jsonArr
+            }
+            for future in as_completed(futures):
+                keyword = futures[future]
+                try:
+                    search_results[keyword] = future.result()
+                except DeadlineExceeded:
+                    logger.warning(f"실행 시간 예산 초과로 '{keyword}' 키워드를 다음 실행으로 미룹니다.")
+                    continue
+                except Exception as e:
+                    logger.error(f"'{keyword}' 키워드 크롤링 중 오류 발생: {str(e)}")
+                    logger.error(traceback.format_exc())
+                    continue
+                
+                if deadline_reached():
+                    # 마감 이후 끝난 키워드는 일부 기사가 누락됐을 수 있으므로 수집분만 전송하고 시간은 갱신하지 않음
+                    continue
+                crawled_keywords.append(keyword)
+
+        # 등록과 병합은 키워드 목록 순서대로 수행해 순차 처리와 같은 결과를 보장 (본문은 fetch 엔진이 동시에 요청)
+        keyword_results = [(keyword_json['keyword'], search_results[keyword_json['keyword']])
+                           for keyword_json in keywords_jsonArr if keyword_json['keyword'] in search_results]
+        registry.fetch(claim_keyword_articles(keyword_results))
+        url_lists = {keyword: [result["url"] for result in results] for keyword, results in keyword_results}
+        unique_articles = merge_keyword_articles(registry, list(url_lists.items()))
 
         news_list = list(unique_articles.values())
+        failed_urls = set(registry.failed_urls())
         if news_list:
             #filename = save_to_file(news_list)
             #result = send_file_to_backend(filename)
             result = send_news_to_backend(news_list)
-            logger.info(f"파일 전송 결과: {result}")
+            get_seen_store().mark_sent(result["sent_urls"], source='daum_keyword')
+            logger.info(f"파일 전송 결과: {len(result['sent_urls'])}건 성공, {len(result['failed_urls'])}건 실패")
+            failed_urls.update(result["failed_urls"])
         else:
             logger.info("크롤링된 IT 뉴스가 없습니다.")
-        logger.info(f"파일 전송 결과: {result}")
+
+        # 유사 중복으로 건너뛴 기사 중 대표 기사가 전송되지 않은 것도 처리하지 못한 기사로 봄
+        failed_urls.update(get_near_duplicate_index().unresolved(
+            {url for keyword in crawled_keywords for url in url_lists[keyword]}))
+        # 찾은 기사가 모두 전송된 키워드만 마지막 크롤링 시간을 한 번에 갱신 (실패한 기사는 다음 실행에서 다시 검색)
+        committed_keywords = [keyword for keyword in crawled_keywords if failed_urls.isdisjoint(url_lists[keyword])]
+        if len(committed_keywords) < len(crawled_keywords):
+            logger.warning(f"전송하지 못한 기사가 있어 {len(crawled_keywords) - len(committed_keywords)}개 키워드의 시간을 갱신하지 않습니다.")
+        crawler_config.commit_last_crawled_times(committed_keywords, start_time, scope)
     except Exception as e:
         logger.error(f"크롤링 중 오류 발생: {str(e)}")
         logger.error(traceback.format_exc())
+        get_metrics().inc('run', 'failed')
         return []
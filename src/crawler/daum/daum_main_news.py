@@ -1,9 +1,13 @@
-from src.crawler.utils.common_utils import fetch, get_daum_news_content, create_session, logger
-from bs4 import BeautifulSoup
-import json
-from src.config.settings import BACKEND_URL
-import requests
+from src.crawler.utils.common_utils import get_daum_news_contents, create_session, logger, send_news_to_backend, record_found
+import contextvars
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from src.crawler.utils.seen_store import get_seen_store
+from src.crawler.utils.near_duplicates import get_near_duplicate_index
+from src.crawler.utils.http_cache import get_http_cache
+from src.crawler.utils.html_parser import make_soup, has_class, SoupStrainer
+from src.crawler.utils.metrics import get_metrics
+from src.crawler.utils.deadline import deadline_reached
 
 category_url = [
     {'category': '사회', 'url': 'https://news.daum.net/society#1'},
@@ -14,88 +18,137 @@ category_url = [
     {'category': 'IT', 'url': 'https://news.daum.net/digital#1'}
 ]
 
-def get_category_news(session, category_info):
-    """카테고리별 뉴스 크롤링"""
-    print("BACKEND_URL: ", BACKEND_URL)
+#HEADLINE_CLASSES = ['list_mainnews', 'list_newsmajor']
+HEADLINE_CLASSES = ['list_newsheadline2']
+
+# 카테고리 페이지에서 헤드라인 목록만 파싱
+HEADLINE_STRAINER = SoupStrainer('ul', class_=has_class(*HEADLINE_CLASSES))
+
+def get_category_headlines(session, category_info):
+    """카테고리 페이지의 헤드라인 기사 목록
+
+    반환: ([(링크, 제목)], 조건부 요청 결과, 목록을 모두 읽었는지 여부). 변경 없는 페이지나 요청 실패 시 조건부 요청 결과는 None
+    """
     url = category_info['url']
     category = category_info['category']
-    news_list = []
+    headlines = []
     
     try:
-        html = fetch(session, url)
-        soup = BeautifulSoup(html, 'html.parser')
+        page = get_http_cache().fetch(session, url)
+        if not page.changed:
+            # 변경 없는 카테고리 페이지는 파싱과 이후 단계를 모두 생략
+            logger.info(f"{category} 카테고리 페이지 변경 없음")
+            return headlines, None, True
+        soup = make_soup(page.text, HEADLINE_STRAINER)
         
-        #for ul_class in ['list_mainnews', 'list_newsmajor']:
-        for ul_class in ['list_newsheadline2']:
+        complete = True
+        for ul_class in HEADLINE_CLASSES:
             news_section = soup.find('ul', class_=ul_class)
-            print(news_section)
-            if news_section:
-                for item in news_section.find_all('li'):
-                    try:
-                        #link = item.find('a', class_='link_txt')['href']
-                        link = item.find('a', class_='item_newsheadline2')['href']
-                        article = get_daum_news_content(session, link)
-                        if article:
-                            article["tags"] = [category]
-                            article["keywords"] = []
-                            news_list.append(article)
-                    except Exception as e:
-                        logger.error(f"개별 기사 크롤링 중 오류 발생: {str(e)}")
-                        continue
-                        
-        logger.info(f"{category} 카테고리 {len(news_list)}개 기사 크롤링 완료")
-        return news_list
+            if not news_section:
+                continue
+            for item in news_section.find_all('li'):
+                try:
+                    #link = item.find('a', class_='link_txt')['href']
+                    link = item.find('a', class_='item_newsheadline2')['href']
+                    title_tag = item.find('strong', class_='tit_txt')
+                    headlines.append((link, title_tag.text.strip() if title_tag else ''))
+                except Exception as e:
+                    logger.error(f"개별 기사 크롤링 중 오류 발생: {str(e)}")
+                    complete = False
+        
+        logger.info(f"{category} 카테고리 헤드라인 {len(headlines)}개 발견")
+        return headlines, page, complete
     
     except Exception as e:
         logger.error(f"{category} 카테고리 크롤링 중 오류 발생: {str(e)}")
         logger.error(traceback.format_exc())
-        return news_list
+        return headlines, None, False
 
-def send_news_to_backend(news_list):
-    """뉴스 데이터 백엔드 전송"""
-    url = f"{BACKEND_URL}/api/public/news"
-    try:
-        response = requests.post(url, json=news_list)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        logger.error(f"데이터 전송 중 오류 발생: {str(e)}")
-        logger.error(traceback.format_exc())
-        return {"error": str(e)}
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON 디코딩 오류: {str(e)}")
-        logger.error(f"응답 내용: {response.text}")
-        return {"error": str(e)}
-    except Exception as e:
-        logger.error(f"예상치 못한 오류 발생: {str(e)}")
-        logger.error(traceback.format_exc())
-        return {"error": str(e)}
+def get_category_news(session, categories):
+    """여러 카테고리 뉴스 크롤링
+
+    카테고리 페이지는 동시에 요청하고, 여러 카테고리에 나온 기사는 본문을 한 번만 받아 카테고리를 모두 태그로 단다.
+    반환: (기사 리스트, [(조건부 요청 결과, 해당 페이지의 기사 링크)]). 목록을 모두 읽은 페이지만 포함하며
+    링크의 기사가 모두 전송된 뒤에 저장한다.
+    """
+    # 카테고리 순서대로 결과를 모아 순차 처리와 같은 태그 순서를 유지
+    with ThreadPoolExecutor(max_workers=len(categories) or 1, thread_name_prefix="category") as executor:
+        futures = [executor.submit(contextvars.copy_context().run, get_category_headlines, session, category_info)
+                   for category_info in categories]
+        category_results = [future.result() for future in futures]
+    
+    titles = {}
+    tags = {}
+    for category_info, (headlines, _, _) in zip(categories, category_results):
+        for link, title in headlines:
+            titles.setdefault(link, title)
+            link_tags = tags.setdefault(link, [])
+            if category_info['category'] not in link_tags:
+                link_tags.append(category_info['category'])
+    duplicated = sum(len(headlines) for headlines, _, _ in category_results) - len(titles)
+    if duplicated:
+        logger.info(f"여러 카테고리에 중복된 기사 {duplicated}건 병합")
+    
+    # 이전 실행에서 이미 전송한 기사와 다른 소스에서 찾은 유사 기사는 건너뜀
+    index = get_near_duplicate_index()
+    unseen_links = get_seen_store().filter_unseen(list(titles))
+    record_found(len(titles), len(unseen_links))
+    links = [link for link in unseen_links
+             if index.claim(link, titles[link], tags=tags[link], owner='daum_main')]
+    
+    news_list = []
+    failed_links = set()
+    for link, article in zip(links, get_daum_news_contents(session, links)):
+        if article:
+            article["tags"] = list(tags[link])
+            article["keywords"] = []
+            news_list.append(article)
+        else:
+            failed_links.add(link)
+    index.release(*failed_links)
+    
+    # 목록을 모두 읽고 기사 본문도 모두 받은 페이지만 저장 후보로 반환
+    pages = [(page, [link for link, _ in headlines])
+             for headlines, page, complete in category_results
+             if page and complete and failed_links.isdisjoint(link for link, _ in headlines)]
+    logger.info(f"카테고리 {len(categories)}개에서 {len(news_list)}개 기사 크롤링 완료")
+    return news_list, pages
 
 def crawl_daum_main_news():
     """메인 크롤링 함수"""
     try:
         session = create_session()
         logger.info("다음 뉴스 크롤링 시작")
+        if deadline_reached():
+            logger.warning("실행 시간 예산 초과로 카테고리 크롤링을 다음 실행으로 미룹니다.")
+            return
+        
+        news_list, pages = get_category_news(session, category_url)
+        failed_urls = set()
+        if news_list:
+            # 전체 카테고리의 기사를 한 번에 전송 (청크 분할은 업로더가 담당)
+            result = send_news_to_backend(news_list)
+            get_seen_store().mark_sent(result["sent_urls"], source='daum_main')
+            failed_urls.update(result["failed_urls"])
+            logger.info(f"{len(result['sent_urls'])}개 기사 전송 완료")
+            if result["failed_urls"]:
+                logger.error(f"{len(result['failed_urls'])}개 기사 전송 실패")
+        else:
+            logger.info("크롤링된 뉴스가 없습니다.")
         
-        total_articles = 0
-        for category_info in category_url:
-            category = category_info['category']
-            logger.info(f"{category} 카테고리 크롤링 시작")
-            
-            news_list = get_category_news(session, category_info)
-            if news_list:
-                result = send_news_to_backend(news_list)
-                total_articles += len(news_list)
-                logger.info(f"{category} 카테고리 {len(news_list)}개 기사 전송 완료")
-                logger.info(f"전송 결과: {result}")
-            else:
-                logger.info(f"{category} 카테고리 크롤링된 뉴스가 없습니다.")
+        # 유사 중복으로 건너뛴 기사 중 대표 기사가 전송되지 않은 것도 전송하지 못한 기사로 봄
+        unresolved = set(get_near_duplicate_index().unresolved({link for _, links in pages for link in links}))
+        # 기사를 모두 전송한 카테고리 페이지만 다음 실행의 변경 비교 기준으로 저장
+        completed = [page for page, links in pages if failed_urls.isdisjoint(links) and unresolved.isdisjoint(links)]
+        if completed:
+            get_http_cache().commit(*completed)
         
-        logger.info(f"전체 크롤링 완료. 총 {total_articles}개 기사 처리")
+        logger.info(f"전체 크롤링 완료. 총 {len(news_list) - len(failed_urls)}개 기사 처리")
         
     except Exception as e:
         logger.error(f"크롤링 프로세스 중 오류 발생: {str(e)}")
         logger.error(traceback.format_exc())
+        get_metrics().inc('run', 'failed')
 
 if __name__ == "__main__":
     crawl_daum_main_news()
@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from urllib.parse import quote
+from src.config.settings import SEARCH_CACHE_TTL_SECONDS, SEARCH_CACHE_MAX_ENTRIES
+from src.crawler.utils.common_utils import fetch, parse_daum_search_results, seoul_tz
+from src.crawler.utils.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+DATE_FORMAT = "%Y%m%d%H%M%S"
+
+def build_search_url(query, sort, start_date, end_date, page):
+    return (f"https://search.daum.net/search?nil_suggest=btn&w=news&DA=PGD&cluster=y&q={quote(query)}"
+            f"&sort={sort}&sd={start_date}&ed={end_date}&period=u&p={page}")
+
+def search_window(last_crawl_time, now=None):
+    """검색 기간 (시작, 끝) 문자열. 마지막 크롤링 시각과 24시간 전 중 늦은 시각부터 현재까지
+
+    같은 분 안의 검색이 같은 캐시 항목을 쓰도록 시작은 분 단위로 내리고 끝은 올린다 (기간이 넓어지기만 함).
+    """
+    now = now or datetime.now(seoul_tz)
+    twenty_four_hours_ago = now - timedelta(hours=24)
+    start = last_crawl_time if last_crawl_time and last_crawl_time > twenty_four_hours_ago else twenty_four_hours_ago
+    start = start.replace(second=0, microsecond=0)
+    end = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    return start.strftime(DATE_FORMAT), end.strftime(DATE_FORMAT)
+
+class DaumSearchClient:
+    """다음 뉴스 검색 결과 페이지를 가져오는 공용 클라이언트
+
+    - (검색어, 정렬, 기간, 페이지)별 파싱 결과를 ttl초 동안 캐시해 같은 페이지를 다시 요청하지 않는다.
+    - 같은 페이지를 여러 작업자가 동시에 요청하면 한 번만 요청하고 결과를 나눠 쓴다.
+    """
+    def __init__(self, ttl=SEARCH_CACHE_TTL_SECONDS, max_entries=SEARCH_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache = {}  # key -> (만료 시각, 검색 결과 목록)
+        self._in_flight = {}  # key -> Future
+
+    def _prune(self, now):
+        expired = [key for key, (expires_at, _) in self._cache.items() if expires_at <= now]
+        for key in expired:
+            del self._cache[key]
+        # 오래된 항목부터 정리 (dict는 넣은 순서를 유지)
+        while len(self._cache) >= self.max_entries:
+            del self._cache[next(iter(self._cache))]
+
+    def get_page(self, session, query, sort, window, page):
+        """검색 결과 한 페이지의 [{url, title, snippet}] (반환 목록은 호출자가 바꿔도 캐시에 영향 없음)"""
+        key = (query, sort, window, page)
+        metrics = get_metrics()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                metrics.inc('search', 'cache_hits')
+                return [dict(result) for result in cached[1]]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+
+        if not owner:
+            metrics.inc('search', 'coalesced')
+            return [dict(result) for result in future.result()]
+
+        try:
+            url = build_search_url(query, sort, window[0], window[1], page)
+            logger.info(f"크롤링 중인 페이지: {url}")
+            results = parse_daum_search_results(fetch(session, url))
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._in_flight[key]
+            if self.ttl > 0:
+                now = time.monotonic()
+                self._prune(now)
+                self._cache[key] = (now + self.ttl, results)
+        future.set_result(results)
+        return [dict(result) for result in results]
+
+    def iter_pages(self, session, query, sort, last_crawl_time, max_pages=None):
+        """검색 결과를 페이지 단위로 반환 (빈 페이지, 이미 본 기사, max_pages에서 중단)"""
+        window = search_window(last_crawl_time)
+        seen_urls = set()
+        page = 1
+        while max_pages is None or page <= max_pages:
+            page_results = self.get_page(session, query, sort, window, page)
+            if not page_results:
+                return
+            new_results = []
+            for result in page_results:
+                if result["url"] in seen_urls:
+                    logger.info(f"중복 기사 발견. '{query}' 검색을 중단합니다.")
+                    yield new_results
+                    return
+                seen_urls.add(result["url"])
+                new_results.append(result)
+            yield new_results
+            page += 1
+
+    def search(self, session, query, sort, last_crawl_time, limit):
+        """검색 결과를 최대 limit개까지 모아 반환"""
+        results = []
+        for page_results in self.iter_pages(session, query, sort, last_crawl_time):
+            results.extend(page_results)
+            if len(results) >= limit:
+                break
+        return results[:limit]
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_daum_search_client():
+    """프로세스 전역 다음 검색 클라이언트 반환"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = DaumSearchClient()
+        return _client
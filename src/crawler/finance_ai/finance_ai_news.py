@@ -1,68 +1,178 @@
-from src.crawler.utils.common_utils import fetch, get_daum_news_content, create_session, logger, seoul_tz, send_news_to_backend
-from bs4 import BeautifulSoup
+from src.crawler.utils.common_utils import get_daum_news_content, create_session, logger, seoul_tz, send_news_to_backend, record_found
+from src.crawler.daum.daum_search import get_daum_search_client
 from datetime import datetime, timedelta
+import re
 import traceback
+from src.config.settings import (
+    FINANCE_QUERY_MAX_LENGTH, FINANCE_QUERY_MAX_KEYWORDS, FINANCE_QUERY_MAX_PAGES,
+    FINANCE_PREFILTER_ENABLED, FINANCE_PREFILTER_MIN_SNIPPET_LENGTH,
+)
+from src.crawler.utils.seen_store import get_seen_store
+from src.crawler.utils.near_duplicates import get_near_duplicate_index
+from src.crawler.utils.metrics import get_metrics
+from src.crawler.utils.deadline import DeadlineExceeded, deadline_reached
 
 # 키워드당 수집할 기사 수 : settings.py와 별개로 설정
 ARTICLES_PER_KEYWORD = 5
 
-def _build_search_url(search_str, sort, start_date, end_date, page):
-    search_str = search_str.replace(" ", "%20")
-    return f"https://search.daum.net/search?nil_suggest=btn&w=news&DA=PGD&cluster=y&q={search_str}&sort={sort}&sd={start_date}&ed={end_date}&period=u&p={page}"
+SEARCH_KEYWORDS = [
+    "신한카드AI",
+    "롯데카드AI",
+    "비씨카드AI",
+    "현대카드AI",
+    "우리카드AI",
+    "국민카드AI",
+    "농협카드AI",
+    "하나카드AI",
+    "토스AI",
+    "기업은행AI",
+    "국민은행AI",
+    "하나은행AI",
+    "우리은행AI",
+    "신한은행AI",
+    "iM뱅크AI",
+    "제일은행AI",
+    "씨티은행AI",
+    "케이뱅크AI",
+    "카카오뱅크AI",
+    "농협AI",
+    "수협AI",
+]
 
-def _extract_urls(soup):
-    urls = []
-    for title in soup.find_all('div', class_='item-title'):
-        a_tag = title.find('a')
-        if a_tag and 'href' in a_tag.attrs:
-            urls.append(a_tag['href'])
-    return urls
+# 다음 검색의 OR 연산자
+OR_SEPARATOR = " | "
+
+# 검색 결과 카드(제목, 요약)로 AI 관련성을 판단할 때 쓰는 단어와, 관련성과 무관한 언론사 고지 문구
+AI_TERM_PATTERN = re.compile(r'(?<![a-z])ai(?![a-z])|인공지능|생성형|llm|gpt|챗봇|머신러닝|딥러닝')
+AI_BOILERPLATE = ["AI학습 이용 금지", "AI 데이터 활용 금지"]
+# 본문의 AI 언급을 확인하기 전에 한 번에 지우는 언론사 고지 문구
+AI_BOILERPLATE_PATTERN = re.compile('|'.join(map(re.escape, AI_BOILERPLATE)))
+
+def iter_search_pages(session, search_str, last_crawl_time):
+    """최신순 검색 결과를 페이지 단위로 반환 (빈 페이지나 이미 본 기사가 나오면 중단, 관련 없는 결과는 제외)"""
+    for page_results in get_daum_search_client().iter_pages(session, search_str, "recency", last_crawl_time):
+        logger.info(f"new_urls: {[result['url'] for result in page_results]}")
+        yield prefilter_results(page_results)
+
+def get_search_results(session, search_str, last_crawl_time):
+    """키워드 최신순 검색 결과의 기사 URL, 제목, 요약 리스트"""
+    results = []
+    for page_results in iter_search_pages(session, search_str, last_crawl_time):
+        results.extend(page_results)
+        if len(results) >= ARTICLES_PER_KEYWORD:
+            break
+    return results[:ARTICLES_PER_KEYWORD]
 
 def get_url_list(session, search_str, last_crawl_time):
-    url_list = []
-    page = 1
-    current_time = datetime.now(seoul_tz)
-    twenty_four_hours_ago = current_time - timedelta(hours=24)
-    
-    start_date = (last_crawl_time if last_crawl_time and last_crawl_time > twenty_four_hours_ago 
-                    else twenty_four_hours_ago).strftime("%Y%m%d%H%M%S")
-    end_date = current_time.strftime("%Y%m%d%H%M%S")
-
-    while len(url_list) < ARTICLES_PER_KEYWORD:
-        url = _build_search_url(search_str, "recency", start_date, end_date, page)
-        logger.info(f"크롤링 중인 페이지: {url}")
-        
-        soup = BeautifulSoup(fetch(session, url), 'html.parser')
-        new_urls = _extract_urls(soup)
-        
-        logger.info(f"new_urls: {new_urls}")
-        
-        if not new_urls:
+    return [result["url"] for result in get_search_results(session, search_str, last_crawl_time)]
+
+def _normalize(text):
+    return re.sub(r'\s+', '', text).lower()
+
+def score_search_result(result):
+    """검색 결과 카드의 AI 관련성 점수 (제목의 AI 단어는 2점, 요약은 1점)"""
+    title, snippet = result["title"], result["snippet"]
+    for phrase in AI_BOILERPLATE:
+        title = title.replace(phrase, "")
+        snippet = snippet.replace(phrase, "")
+    return 2 * len(AI_TERM_PATTERN.findall(title.lower())) + len(AI_TERM_PATTERN.findall(snippet.lower()))
+
+def prefilter_results(results):
+    """본문을 받을 만한 검색 결과만 남김
+
+    카드에 AI 관련 단어가 있으면 통과시키고, 요약이 너무 짧아 판단할 수 없는 경우는 본문을 받아 확인한다.
+    요약이 충분한데 AI 관련 단어가 없는 결과는 본문과 이미지를 받지 않는다.
+    """
+    if not FINANCE_PREFILTER_ENABLED:
+        return results
+    metrics = get_metrics()
+    kept = []
+    for result in results:
+        if score_search_result(result) > 0:
+            metrics.inc('prefilter', 'accepted')
+            kept.append(result)
+        elif len(result["snippet"]) < FINANCE_PREFILTER_MIN_SNIPPET_LENGTH:
+            metrics.inc('prefilter', 'borderline')
+            kept.append(result)
+        else:
+            metrics.inc('prefilter', 'rejected')
+            logger.info(f"검색 결과에 AI 관련 내용이 없어 제외: {result['url']}")
+    return kept
+
+def keyword_entity(keyword):
+    """제목/요약 매칭에 쓰는 키워드의 기관명 부분 ('신한카드AI' -> '신한카드')
+
+    AI 관련성은 prefilter_results와 본문 확인에서 따로 판단한다.
+    """
+    normalized = _normalize(keyword)
+    if normalized.endswith('ai') and len(normalized) > 2:
+        return normalized[:-2]
+    return normalized
+
+def match_keywords(result, keywords):
+    """검색 결과의 제목이나 요약에 기관명이 나오는 키워드 목록"""
+    text = _normalize(f"{result['title']} {result['snippet']}")
+    return [keyword for keyword in keywords if keyword_entity(keyword) in text]
+
+def plan_queries(keywords, max_length=FINANCE_QUERY_MAX_LENGTH, max_keywords=FINANCE_QUERY_MAX_KEYWORDS):
+    """키워드를 검색어 길이 제한 안에서 OR 검색어로 묶음 (반환: [(검색어, 키워드 목록)])"""
+    batches = []
+    batch = []
+    for keyword in keywords:
+        candidate = batch + [keyword]
+        if batch and (len(OR_SEPARATOR.join(candidate)) > max_length or len(candidate) > max_keywords):
+            batches.append((OR_SEPARATOR.join(batch), batch))
+            candidate = [keyword]
+        batch = candidate
+    if batch:
+        batches.append((OR_SEPARATOR.join(batch), batch))
+    return batches
+
+def search_batch(session, query, keywords, last_crawl_time):
+    """OR 검색 결과를 제목/요약 매칭으로 키워드별로 나눔 (반환: {키워드: 검색 결과 목록}, 키워드당 최대 ARTICLES_PER_KEYWORD개)
+
+    모든 키워드가 기사 수를 채우거나, 검색 결과가 끝나거나, 기사 수를 못 채운 키워드가 한 페이지 동안 결과를 더 얻지 못하면
+    멈춘다 (기사가 적은 기관 때문에 매번 끝 페이지까지 넘기지 않도록). 결과가 계속 늘던 중에 FINANCE_QUERY_MAX_PAGES에
+    닿은 키워드는 잘린 결과 대신 키워드 단독 검색 결과를 쓴다.
+    """
+    attributed = {keyword: [] for keyword in keywords}
+    for page_no, page_results in enumerate(iter_search_pages(session, query, last_crawl_time), start=1):
+        before = {keyword: len(found) for keyword, found in attributed.items()}
+        for result in page_results:
+            matched = match_keywords(result, keywords)
+            if not matched:
+                logger.info(f"검색어와 일치하는 키워드가 없는 기사 제외: {result['url']}")
+            for keyword in matched:
+                if len(attributed[keyword]) < ARTICLES_PER_KEYWORD:
+                    attributed[keyword].append(result)
+        unfilled = [keyword for keyword in keywords if len(attributed[keyword]) < ARTICLES_PER_KEYWORD]
+        growing = [keyword for keyword in unfilled if len(attributed[keyword]) > before[keyword]]
+        if not growing:
+            if unfilled:
+                logger.info(f"'{query}' 검색에서 기사 수를 못 채운 키워드의 결과가 더 나오지 않아 {page_no} 페이지에서 중단")
             break
-            
-        for new_url in new_urls:
-            if new_url not in url_list:
-                url_list.append(new_url)
-                if len(url_list) >= ARTICLES_PER_KEYWORD:
-                    return url_list[:ARTICLES_PER_KEYWORD]
-            else:
-                logger.info(f"중복 기사 발견. '{search_str}' 키워드 크롤링을 중단합니다.")
-                return url_list
-            
-        page += 1
-    
-    return url_list
+        if page_no >= FINANCE_QUERY_MAX_PAGES:
+            break
+    else:
+        # 검색 결과를 끝까지 읽었으므로 단독 검색해도 더 나오지 않음
+        growing = []
+
+    for keyword in growing:
+        logger.info(f"'{query}' 검색이 {FINANCE_QUERY_MAX_PAGES} 페이지에서 끝나 '{keyword}' 키워드는 단독으로 다시 검색")
+        try:
+            attributed[keyword] = get_search_results(session, keyword, last_crawl_time)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            # 단독 검색에 실패하면 OR 검색에서 찾은 결과를 그대로 씀
+            logger.error(f"'{keyword}' 단독 검색 중 오류 발생: {str(e)}")
+    return attributed
 
 def is_ai_related_content(content: str) -> bool:
-    # "AI학습 이용 금지" 문구 제거
-    cleaned_content = content.replace("AI학습 이용 금지", "")
-    cleaned_content = cleaned_content.replace("AI 데이터 활용 금지", "")
-    
-    # AI 관련 키워드 리스트
-    ai_keywords = ["AI"]
-    
-    # 하나라도 AI 관련 키워드가 포함되어 있으면 True 반환
-    return any(keyword in cleaned_content for keyword in ai_keywords)
+    # 언론사 고지 문구를 뺀 본문에 'AI'가 하나라도 있으면 True 반환 ('AICC', 'OpenAI'처럼 붙여 쓴 경우도 포함)
+    if "AI" not in content:
+        return False
+    return "AI" in AI_BOILERPLATE_PATTERN.sub("", content)
 
 def process_article(session, url, keyword, unique_articles):
     if url not in unique_articles:
@@ -82,48 +192,68 @@ def crawl_finance_ai_news():
     start_time = datetime.now(seoul_tz)
     logger.info(f"금융 AI 뉴스 크롤링 작업 시작... (시작 시간: {start_time.isoformat()})")
     
-    search_keywords = [
-        "신한카드AI",
-        "롯데카드AI",
-        "비씨카드AI",
-        "현대카드AI",
-        "우리카드AI",
-        "국민카드AI",
-        "농협카드AI",
-        "하나카드AI",
-        "토스AI",
-        "기업은행AI",
-        "국민은행AI",
-        "하나은행AI",
-        "우리은행AI",
-        "신한은행AI",
-        "iM뱅크AI",
-        "제일은행AI",
-        "씨티은행AI",
-        "케이뱅크AI",
-        "카카오뱅크AI",
-        "농협AI",
-        "수협AI",
-    ]
-    
     try:
         session = create_session()
         unique_articles = {}
         twenty_four_hours_ago = start_time - timedelta(hours=24)
 
-        for keyword in search_keywords:
-            logger.info(f"'{keyword}' 키워드에 대한 뉴스 크롤링 시작")
-            url_list = get_url_list(session, keyword, twenty_four_hours_ago)
-            
-            for url in url_list:
-                process_article(session, url, keyword, unique_articles)
-            
-            logger.info(f"'{keyword}' 키워드에 대해 {len(url_list)}개의 기사를 크롤링했습니다.")
+        # 키워드를 OR 검색어로 묶어 검색 요청 수를 줄이고, 결과는 제목/요약 매칭으로 키워드별로 나눔
+        attributed = {}
+        for query, keywords in plan_queries(SEARCH_KEYWORDS):
+            if deadline_reached():
+                logger.warning(f"실행 시간 예산 초과로 '{query}' 검색부터 다음 실행으로 미룹니다.")
+                break
+            logger.info(f"'{query}' 검색어로 {len(keywords)}개 키워드 뉴스 크롤링 시작")
+            try:
+                attributed.update(search_batch(session, query, keywords, twenty_four_hours_ago))
+            except DeadlineExceeded:
+                logger.warning(f"실행 시간 예산 초과로 '{query}' 검색을 중단합니다.")
+                break
+            except Exception as e:
+                # 한 검색어가 실패해도 나머지 검색어는 계속 처리
+                logger.error(f"'{query}' 검색 중 오류 발생: {str(e)}")
+
+        # 여러 키워드에 나온 기사도 한 번만 세고, 이미 전송한 기사는 한 번에 확인
+        found_urls = list(dict.fromkeys(result["url"] for results in attributed.values() for result in results))
+        unseen_urls = set(get_seen_store().filter_unseen(found_urls))
+        record_found(len(found_urls), len(unseen_urls))
+
+        # 키워드 순서대로 처리해 키워드별 검색과 같은 keywords 순서를 유지
+        index = get_near_duplicate_index()
+        rejected = set()
+        try:
+            for keyword in SEARCH_KEYWORDS:
+                results = attributed.get(keyword, [])
+                for result in results:
+                    url = result["url"]
+                    # 이전 실행에서 이미 전송한 기사와 이번 실행에서 제외한 기사는 본문을 다시 가져오지 않음
+                    if url not in unseen_urls or url in rejected:
+                        continue
+                    # 다른 소스에서 이미 찾은 유사 기사는 본문을 받지 않고 키워드만 합침
+                    if not index.claim(url, result["title"], keywords=[keyword], tags=['금융AI'],
+                                       owner='finance_ai'):
+                        continue
+                    try:
+                        process_article(session, url, keyword, unique_articles)
+                    except DeadlineExceeded:
+                        raise
+                    except Exception as e:
+                        logger.error(f"기사 처리 중 오류 발생: {url} - {str(e)}")
+                    finally:
+                        if url not in unique_articles:
+                            # 본문을 받지 못했거나 AI 관련 기사가 아니면 등록을 취소해 다른 소스의 유사 기사를 막지 않음
+                            index.release(url)
+                            rejected.add(url)
+                logger.info(f"'{keyword}' 키워드에 대해 {len(results)}개의 기사를 크롤링했습니다.")
+        except DeadlineExceeded:
+            # 이미 수집한 기사는 아래에서 전송
+            logger.warning("실행 시간 예산 초과로 기사 본문 수집을 중단합니다.")
 
         news_list = list(unique_articles.values())
         if news_list:
             result = send_news_to_backend(news_list)
-            logger.info(f"뉴스 전송 결과: {result}")
+            get_seen_store().mark_sent(result["sent_urls"], source='finance_ai')
+            logger.info(f"뉴스 전송 결과: {len(result['sent_urls'])}건 성공, {len(result['failed_urls'])}건 실패")
         else:
             logger.info("크롤링된 금융 AI 뉴스가 없습니다.")
             
@@ -132,6 +262,7 @@ def crawl_finance_ai_news():
     except Exception as e:
         logger.error(f"크롤링 중 오류 발생: {str(e)}")
         logger.error(traceback.format_exc())
+        get_metrics().inc('run', 'failed')
         return []
 
 if __name__ == "__main__":
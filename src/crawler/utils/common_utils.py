@@ -1,14 +1,20 @@
-import random
-from time import sleep
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from pytz import timezone
 import logging
 import base64
 import traceback
-import json
-from src.config.settings import HEADERS, SLEEP_MIN, SLEEP_MAX, BACKEND_URL
+from src.config.settings import IMAGE_TIMEOUT
+from src.crawler.utils.fetch_engine import get_fetch_engine
+from src.crawler.utils.image_cache import get_image_cache
+from src.crawler.utils.uploader import get_uploader
+from src.crawler.utils.transport import get_session
+from src.crawler.utils.metrics import get_metrics
+from src.crawler.utils.deadline import DeadlineExceeded
+from src.crawler.utils.near_duplicates import get_near_duplicate_index
+from src.crawler.utils.keyword_tagger import get_keyword_tagger
+from src.crawler.utils.parse_pool import parse_pages
+from src.crawler.utils.html_parser import make_soup, has_class, SoupStrainer
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -17,57 +23,146 @@ logger = logging.getLogger(__name__)
 # 시간 설정
 seoul_tz = timezone('Asia/Seoul')
 
-def fetch(session, url):
-    sleep(random.uniform(SLEEP_MIN, SLEEP_MAX))
-    response = session.get(url)
+# 다음 뉴스 기사 페이지에서 제목, 날짜, 본문 영역만 파싱
+DAUM_ARTICLE_STRAINER = SoupStrainer(class_=has_class('tit_view', 'num_date', 'article_view'))
+
+# 다음 뉴스 검색 결과에서 기사 제목과 요약 영역만 파싱
+DAUM_SEARCH_STRAINER = SoupStrainer(class_=has_class('item-title', 'conts-desc'))
+
+def fetch(session, url, **kwargs):
+    response = get_fetch_engine().get(session, url, **kwargs)
+    # 오류 응답 본문을 빈 검색 결과나 기사로 파싱하지 않도록 예외로 처리
+    response.raise_for_status()
     return response.text
 
+def fetch_many(session, urls, **kwargs):
+    """여러 URL을 fetch 엔진으로 동시에 가져와 HTML 리스트로 반환 (실패한 URL은 None)"""
+    htmls = []
+    for url, result in zip(urls, get_fetch_engine().get_many(session, urls, **kwargs)):
+        if isinstance(result, DeadlineExceeded):
+            htmls.append(None)
+        elif isinstance(result, Exception):
+            logger.error(f"페이지 다운로드 중 오류 발생: {url} - {result}")
+            htmls.append(None)
+        else:
+            try:
+                result.raise_for_status()
+                htmls.append(result.text)
+            except Exception as e:
+                logger.error(f"페이지 다운로드 중 오류 발생: {url} - {e}")
+                htmls.append(None)
+    return htmls
+
+def get_images_as_base64(image_urls):
+    """썸네일 캐시를 거쳐 축소된 이미지들을 base64 문자열 리스트로 반환 (순서 유지, URL이 없거나 실패하면 None)
+
+    캐시에 없는 이미지는 fetch 엔진으로 동시에 받으므로 호스트별 요청 제한과 실행 마감 시각이 적용된다.
+    마감이 지난 뒤에는 새로 받지 않고 None으로 남긴다.
+    """
+    metrics = get_metrics()
+    cache = get_image_cache()
+    thumbnails = {}
+    missing = []
+    for image_url in dict.fromkeys(url for url in image_urls if url):
+        thumbnail = cache.get(image_url)
+        if thumbnail is not None:
+            metrics.inc('image', 'cache_hits')
+            thumbnails[image_url] = thumbnail
+        else:
+            missing.append(image_url)
+
+    responses = get_fetch_engine().get_many(get_session(), missing, stage='image', timeout=IMAGE_TIMEOUT)
+    for image_url, response in zip(missing, responses):
+        if isinstance(response, DeadlineExceeded):
+            continue
+        try:
+            if isinstance(response, Exception):
+                raise response
+            response.raise_for_status()
+            metrics.inc('image', 'image_bytes', len(response.content))
+            thumbnails[image_url] = cache.put(image_url, response.content)
+        except requests.RequestException as e:
+            logger.error(f"이미지 다운로드 중 오류 발생: {e}")
+        except OSError as e:
+            logger.error(f"이미지 캐시 저장 중 오류 발생: {e}")
+
+    return [base64.b64encode(thumbnails[url]).decode('utf-8') if url in thumbnails else None for url in image_urls]
+
 def get_image_as_base64(image_url):
-    try:
-        response = requests.get(image_url)
-        response.raise_for_status()
-        return base64.b64encode(response.content).decode('utf-8')
-    except requests.RequestException as e:
-        logger.error(f"이미지 다운로드 중 오류 발생: {e}")
-        return None
+    """썸네일 캐시를 거쳐 축소된 이미지를 base64 문자열로 반환"""
+    return get_images_as_base64([image_url])[0]
+
+def attach_thumbnails(parsed_list):
+    """(기사, 이미지 URL) 파싱 결과 목록의 썸네일을 한 번에 받아 붙인 기사 목록 반환 (파싱 실패는 None 유지)"""
+    thumbnails = get_images_as_base64([parsed[1] if parsed else None for parsed in parsed_list])
+    articles = []
+    for parsed, thumbnail in zip(parsed_list, thumbnails):
+        if parsed is None:
+            articles.append(None)
+            continue
+        article, _ = parsed
+        article["thumbnail_image"] = thumbnail
+        articles.append(article)
+    return articles
     
+def record_found(found, unseen):
+    """목록에서 찾은 기사 수와 이미 전송해 건너뛴 기사 수를 현재 소스 지표에 기록"""
+    metrics = get_metrics()
+    metrics.inc('articles', 'found', found)
+    if found > unseen:
+        metrics.inc('articles', 'skipped', found - unseen)
+
 def send_file_to_backend(filename):
-    url = f"{BACKEND_URL}/api/public/news"
     with open(filename, 'rb') as file:
-        files = {'news.jsonl': file}
         try:
-            response = requests.post(url, files=files)
-            response.raise_for_status()
-            logger.info(f"파일 전송 성공: {response.json()}")
-            return response.json()
+            result = get_uploader().send_file(file)
+            logger.info(f"파일 전송 성공: {result}")
+            return result
         except requests.RequestException as e:
             logger.error(f"파일 전송 중 오류 발생: {e}")
             return {"error": str(e)}
     
 def send_news_to_backend(news_list):
-    url = f"{BACKEND_URL}/api/public/news"
+    """뉴스 데이터 백엔드 전송 (청크 분할, gzip 압축, 재시도는 NewsUploader가 담당)
+
+    전송 전에 다른 소스에서 찾은 유사 중복 기사의 키워드와 태그를 합치고, 제목과 본문에 나오는 백엔드 키워드를 추가한다.
+    전송한 기사는 유사 중복 색인에 기록하고, 전송하지 못한 기사는 등록을 취소해 유사 기사가 대표가 될 수 있게 한다.
+    전송하지 못한 기사가 있으면 현재 소스의 실행을 실패(run.failed)로 기록한다.
+    """
+    index = get_near_duplicate_index()
     try:
-        response = requests.post(url, json=news_list)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        logger.error(f"파일 전송 중 오류 발생: {str(e)}")
-        logger.error(traceback.format_exc())
-        return {"error": str(e)}
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON 디코딩 오류: {e}")
-        logger.error(f"응답 내용: {response.text}")
-        logger.error(traceback.format_exc())
-        return {"error": str(e)}
+        index.merge_into(news_list)
+        get_keyword_tagger().tag_articles(news_list)
+        result = get_uploader().send(news_list)
+        index.mark_sent(result["sent_urls"])
     except Exception as e:
         logger.error(f"예상치 못한 오류 발생: {str(e)}")
         logger.error(traceback.format_exc())
-        return {"error": str(e)}    
+        result = {"error": str(e), "sent_urls": [], "failed_urls": [article.get('url') for article in news_list]}
+    if result.get("error") or result["failed_urls"]:
+        index.release(*result["failed_urls"])
+        get_metrics().inc('run', 'failed')
+    return result
 
-def get_daum_news_content(session, url):
-    logger.info(f"Fetching content from: {url}")
-    html = fetch(session, url)
-    soup = BeautifulSoup(html, 'html.parser')
+def parse_daum_search_results(html):
+    """다음 뉴스 검색 결과 페이지에서 기사 URL, 제목, 요약 추출 (검색 결과 순서 유지)"""
+    soup = make_soup(html, DAUM_SEARCH_STRAINER)
+    results = []
+    current = None
+    for element in soup.find_all(class_=has_class('item-title', 'conts-desc')):
+        if 'item-title' in element.get('class', []):
+            a_tag = element.find('a')
+            current = None
+            if a_tag and 'href' in a_tag.attrs:
+                current = {"url": a_tag['href'], "title": a_tag.text.strip(), "snippet": ""}
+                results.append(current)
+        elif current is not None and not current["snippet"]:
+            current["snippet"] = element.text.strip()
+    return results
+
+def parse_daum_news_content(html, url):
+    """다음 뉴스 기사 HTML 파싱 (반환: 기사 정보, 썸네일 이미지 URL)"""
+    soup = make_soup(html, DAUM_ARTICLE_STRAINER)
     
     title = soup.find('h3', class_='tit_view').get_text().strip()
     published_at_str = soup.find('span', class_='num_date').get_text().strip()
@@ -98,23 +193,39 @@ def get_daum_news_content(session, url):
         logger.error(f"날짜 파싱 오류: {published_at_str}")
         published_at = None
     
-    image_data = None
+    image_url = None
     if content_div:
         thumb_image = content_div.find('img', class_='thumb_g_article')
         if thumb_image and 'src' in thumb_image.attrs:
             image_url = thumb_image['src']
-            image_data = get_image_as_base64(image_url)
     
-    return {
+    article = {
         "title": title,
         "content": content,
         "published_at": published_at.isoformat() if published_at else None,
         "url": url,
         #"keywords": [keyword],
-        "thumbnail_image": image_data
+        "thumbnail_image": None
     }
+    return article, image_url
+
+def get_daum_news_content(session, url):
+    logger.info(f"Fetching content from: {url}")
+    html = fetch(session, url)
+    article, image_url = parse_daum_news_content(html, url)
+    if image_url:
+        article["thumbnail_image"] = get_image_as_base64(image_url)
+    return article
+
+def parse_daum_article(url, html):
+    """파싱 단계용 (item, html) 순서 래퍼"""
+    return parse_daum_news_content(html, url)
+
+def get_daum_news_contents(session, urls):
+    """여러 다음 뉴스 기사를 동시에 가져옴. 결과 순서는 urls와 같으며 실패한 기사는 None"""
+    logger.info(f"Fetching {len(urls)} articles")
+    return attach_thumbnails(parse_pages(session, urls, parse_daum_article))
 
 def create_session():
-    session = requests.Session()
-    session.headers.update(HEADERS)
-    return session
+    """공유 HTTP 세션 반환 (커넥션 풀, 타임아웃, TLS 설정은 transport 모듈에서 관리)"""
+    return get_session()
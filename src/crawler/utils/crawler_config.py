@@ -1,29 +1,117 @@
+import json
 import logging
+import os
+import sqlite3
+import threading
+import time
+import traceback
 from datetime import datetime
 from pytz import timezone
 import requests
-from src.config.settings import BACKEND_URL
+from src.config.settings import BACKEND_URL, STATE_DB_PATH
+from src.crawler.utils.transport import get_session
 
 logger = logging.getLogger(__name__)
 seoul_tz = timezone('Asia/Seoul')
 
+def get_keywords_from_api():
+    url = f"{BACKEND_URL}/api/public/keywords"
+    try:
+        response = get_session().get(url)
+        response.raise_for_status()
+        keywords_json = response.json()
+        logger.info(f"API에서 가져온 키워드: {keywords_json}")
+        return keywords_json
+    except requests.RequestException as e:
+        logger.error(f"키워드 가져오기 실패: {e}")
+        logger.error(traceback.format_exc())
+        return []
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON 디코딩 오류: {e}")
+        logger.error(f"응답 내용: {response.text}")
+        logger.error(traceback.format_exc())
+        return []
+
 class CrawlerConfig:
-    def update_last_crawled_times(self, keywords, start_time):
-        data = [{"keyword": keyword, "last_crawled_dt": start_time.isoformat()} for keyword in keywords]
-        
+    """키워드별 마지막 크롤링 시각 관리
+
+    시각은 기사가 백엔드에 전송된 뒤에만 commit_last_crawled_times()로 확정하며, 여러 키워드를 한 번의 요청으로 보낸다.
+    확정한 시각은 먼저 로컬 저널(SQLite)에 기록하고 백엔드 반영에 성공하면 표시한다.
+    실행이 중간에 죽거나 요청이 실패해도 다음 실행에서 저널의 시각부터 이어서 크롤링하고, 반영하지 못한 시각을 다시 보낸다.
+    """
+    def __init__(self, path=STATE_DB_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS keyword_crawl_journal ("
+                "keyword TEXT PRIMARY KEY, last_crawled_dt TEXT NOT NULL, synced INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _put(self, data):
         url = f"{BACKEND_URL}/api/public/keywords/last-crawled-dt"
         try:
-            response = requests.put(url, json=data)
+            response = get_session().put(url, json=data)
             response.raise_for_status()
             logger.info(f"최종 크롤링 시간 업데이트 성공: {response.json()}")
+            return True
             
         except requests.RequestException as e:
             logger.error(f"최종 크롤링 시간 업데이트 실패: {str(e)}")
         except Exception as e:
             logger.error(f"예상치 못한 오류 발생: {str(e)}")
+        return False
+
+    def commit_last_crawled_times(self, keywords, start_time, scope=None):
+        """기사 전송이 확인된 키워드의 시각을 저널에 기록하고 백엔드에 반영
+
+        같은 키워드는 한 번만 기록하며, 저널에 더 최신 시각이 있으면 그대로 둔다.
+        scope를 주면 그 키워드들의 미반영 시각만 보낸다 (flush 참고).
+        """
+        keywords = list(dict.fromkeys(keywords))
+        if keywords:
+            now = time.time()
+            with self._lock, self._conn:
+                for keyword in keywords:
+                    current = self._conn.execute(
+                        "SELECT last_crawled_dt FROM keyword_crawl_journal WHERE keyword = ?", (keyword,)
+                    ).fetchone()
+                    if current and datetime.fromisoformat(current[0]) >= start_time:
+                        continue
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO keyword_crawl_journal (keyword, last_crawled_dt, synced, updated_at) "
+                        "VALUES (?, ?, 0, ?)", (keyword, start_time.isoformat(), now)
+                    )
+        return self.flush(scope)
+
+    def flush(self, keywords=None):
+        """저널에서 아직 백엔드에 반영하지 못한 시각을 한 번의 요청으로 전송 (반환: 성공 여부)
 
-    def get_last_crawled_time(self, keyword):
-        return self.config.get(keyword)
+        keywords를 주면 그 키워드만 보낸다. 저널을 함께 쓰는 다른 샤드의 시각을 대신 보내지 않기 위함.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT keyword, last_crawled_dt, updated_at FROM keyword_crawl_journal WHERE synced = 0"
+            ).fetchall()
+        if keywords is not None:
+            keywords = set(keywords)
+            rows = [row for row in rows if row[0] in keywords]
+        if not rows:
+            return True
+        logger.info(f"최종 크롤링 시간 {len(rows)}건 반영 요청")
+        if not self._put([{"keyword": keyword, "last_crawled_dt": crawled_dt} for keyword, crawled_dt, _ in rows]):
+            return False
+        with self._lock, self._conn:
+            # 요청 중에 다시 기록된 키워드는 다음 flush에서 보냄
+            self._conn.executemany(
+                "UPDATE keyword_crawl_journal SET synced = 1 WHERE keyword = ? AND updated_at = ?",
+                [(keyword, updated_at) for keyword, _, updated_at in rows]
+            )
+        return True
 
     def get_all_last_crawled_times(self):
-        return self.config
+        """저널에 확정된 {키워드: 마지막 크롤링 시각}"""
+        with self._lock:
+            rows = self._conn.execute("SELECT keyword, last_crawled_dt FROM keyword_crawl_journal").fetchall()
+        return {keyword: datetime.fromisoformat(crawled_dt) for keyword, crawled_dt in rows}
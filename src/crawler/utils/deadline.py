@@ -0,0 +1,44 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+class DeadlineExceeded(Exception):
+    """실행 시간 예산을 넘겨 새 요청을 시작하지 않음"""
+
+class Deadline:
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return self.expires_at - time.monotonic()
+
+    def expired(self):
+        return self.remaining() <= 0
+
+# 현재 실행 중인 소스의 마감 시각. 스레드 풀에 작업을 넘길 때는 contextvars.copy_context()로 전달한다
+_current_deadline = contextvars.ContextVar('crawl_deadline', default=None)
+
+def current_deadline():
+    return _current_deadline.get()
+
+@contextmanager
+def deadline_scope(seconds):
+    """이 블록 안에서 시작하는 요청에 마감 시각 적용 (바깥 마감이 더 이르면 그대로 유지)"""
+    deadline = Deadline(seconds)
+    outer = current_deadline()
+    if outer is not None and outer.expires_at < deadline.expires_at:
+        deadline = outer
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+def deadline_reached():
+    """마감 시각이 지나 새 요청을 시작하면 안 되는지 여부"""
+    deadline = current_deadline()
+    return deadline is not None and deadline.expired()
+
+def check_deadline():
+    if deadline_reached():
+        raise DeadlineExceeded("실행 시간 예산 초과")
@@ -0,0 +1,126 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from src.config.settings import RATE_LIMITS, FETCH_MAX_CONCURRENCY, FETCH_MAX_CONCURRENCY_PER_HOST
+from src.crawler.utils.metrics import get_metrics, current_source
+from src.crawler.utils.deadline import DeadlineExceeded, current_deadline
+from src.crawler.utils.rate_limiter import AdaptiveRateLimiter, limits_for_host, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+class _HostState:
+    """호스트별 동시 요청 제한과 요청 속도 제한"""
+    def __init__(self, limit, limiter):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.limiter = limiter
+
+class FetchEngine:
+    """호스트별 동시성 제한과 적응형 요청 속도 제한을 적용하는 asyncio 기반 fetch 엔진
+
+    이벤트 루프는 전용 스레드에서 실행되며, 실제 요청은 requests 세션으로 스레드 풀에서 수행된다.
+    요청 속도는 호스트 단위로만 제한되므로 서로 다른 사이트는 서로를 기다리지 않는다.
+    rate_limits가 None이면 속도 제한 없이 동시성 제한만 적용한다.
+    """
+    def __init__(self, max_concurrency=FETCH_MAX_CONCURRENCY, max_per_host=FETCH_MAX_CONCURRENCY_PER_HOST,
+                 rate_limits=RATE_LIMITS):
+        self.max_per_host = max_per_host
+        self.rate_limits = rate_limits
+        self._hosts = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="fetch")
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="fetch-engine", daemon=True)
+        self._thread.start()
+
+    def _host_state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            limiter = None
+            if self.rate_limits is not None:
+                limiter = AdaptiveRateLimiter(**limits_for_host(host, self.rate_limits))
+            state = _HostState(self.max_per_host, limiter)
+            self._hosts[host] = state
+        return state
+
+    async def _wait_turn(self, state, source):
+        # 버킷은 이벤트 루프 스레드에서만 다루므로 별도 잠금이 필요 없음
+        if state.limiter is None:
+            return
+        wait = state.limiter.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+            get_metrics().inc('politeness', 'sleep_seconds', wait, source=source)
+
+    async def fetch(self, session, url, source=None, deadline=None, stage='fetch', **kwargs):
+        """호스트 제한을 지켜 단일 URL 요청 (requests.Response 반환)
+
+        deadline이 지나면 요청을 시작하지 않고 DeadlineExceeded를 발생시킨다.
+        요청 수와 지연 시간은 stage 단계 지표로 기록한다 (HTML은 'fetch', 이미지는 'image').
+        """
+        metrics = get_metrics()
+        state = self._host_state(urlparse(url).hostname)
+        async with state.semaphore:
+            if deadline is None or not deadline.expired():
+                await self._wait_turn(state, source)
+            if deadline is not None and deadline.expired():
+                # 보내지 않은 요청은 속도 제한 예산에서 제외
+                if state.limiter is not None:
+                    state.limiter.refund()
+                metrics.inc('deadline', 'skipped_fetches', source=source)
+                raise DeadlineExceeded(f"실행 시간 예산 초과로 요청 생략: {url}")
+            request = functools.partial(session.get, url, **kwargs)
+            started = time.perf_counter()
+            try:
+                response = await self._loop.run_in_executor(self._executor, request)
+            except Exception:
+                metrics.inc(stage, 'errors', source=source)
+                if state.limiter is not None:
+                    state.limiter.on_error()
+                raise
+            finally:
+                latency = time.perf_counter() - started
+                metrics.inc(stage, 'requests', source=source)
+                metrics.observe(stage, latency, source=source)
+            if state.limiter is not None:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                state.limiter.on_response(response.status_code, latency, retry_after)
+            if response.status_code >= 400:
+                metrics.inc(stage, 'http_errors', source=source)
+            if stage == 'fetch':
+                metrics.inc('fetch', 'html_bytes', len(response.content), source=source)
+            return response
+
+    async def fetch_all(self, session, urls, source=None, deadline=None, **kwargs):
+        tasks = [self.fetch(session, url, source=source, deadline=deadline, **kwargs) for url in urls]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get(self, session, url, **kwargs):
+        """동기 코드에서 사용하는 단일 요청"""
+        coroutine = self.fetch(session, url, source=current_source(), deadline=current_deadline(), **kwargs)
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def submit(self, session, url, **kwargs):
+        """단일 요청을 시작하고 바로 concurrent.futures.Future 반환 (완료되는 대로 다음 단계로 넘길 때 사용)"""
+        coroutine = self.fetch(session, url, source=current_source(), deadline=current_deadline(), **kwargs)
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def get_many(self, session, urls, **kwargs):
+        """여러 URL을 동시에 요청. 결과 순서는 urls와 같으며 실패한 요청은 예외 객체로 반환"""
+        if not urls:
+            return []
+        coroutine = self.fetch_all(session, urls, source=current_source(), deadline=current_deadline(), **kwargs)
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_fetch_engine():
+    """프로세스 전역 fetch 엔진 반환"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = FetchEngine()
+        return _engine
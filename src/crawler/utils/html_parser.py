@@ -0,0 +1,31 @@
+import importlib.util
+import logging
+import re
+from bs4 import BeautifulSoup, SoupStrainer
+from src.config.settings import HTML_PARSER
+from src.crawler.utils.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+def _resolve_parser(name):
+    """설정값에 맞는 BeautifulSoup 파서 이름 반환. auto면 lxml이 설치된 경우 lxml 사용"""
+    if name == 'auto':
+        return 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+    if name == 'lxml' and not importlib.util.find_spec('lxml'):
+        logger.warning("lxml이 설치되어 있지 않아 html.parser를 사용합니다.")
+        return 'html.parser'
+    return name
+
+PARSER = _resolve_parser(HTML_PARSER)
+
+def make_soup(html, parse_only=None):
+    """HTML 파싱. parse_only(SoupStrainer)를 주면 해당 요소와 그 하위 트리만 만든다"""
+    with get_metrics().timer('parse'):
+        return BeautifulSoup(html, PARSER, parse_only=parse_only)
+
+def has_class(*class_names):
+    """SoupStrainer용 class 조건. 파싱 중에는 class 속성이 나뉘지 않은 문자열일 수 있어 단어 단위로 비교한다"""
+    names = '|'.join(re.escape(name) for name in class_names)
+    return re.compile(rf'(^|\s)({names})(\s|$)')
+
+__all__ = ['PARSER', 'make_soup', 'has_class', 'SoupStrainer']
@@ -0,0 +1,96 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from src.config.settings import STATE_DB_PATH, HTTP_CACHE_ENABLED
+from src.crawler.utils.fetch_engine import get_fetch_engine
+from src.crawler.utils.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CachedPage:
+    """조건부 요청 결과. changed가 False면 마지막으로 반영한 뒤 바뀌지 않은 페이지"""
+    url: str
+    text: Optional[str]
+    changed: bool
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: Optional[str] = None
+
+class HttpCache:
+    """목록/인덱스 페이지용 HTTP 캐시 (ETag, Last-Modified, 본문 해시를 SQLite에 저장)
+
+    fetch()는 저장된 검증값으로 조건부 요청을 보내고, 304이거나 본문 해시가 같으면 changed=False를 반환한다.
+    검증값은 commit()을 호출해야 저장되므로, 크롤러는 해당 페이지의 기사 전송이 끝난 뒤에 commit()한다.
+    (전송에 실패한 페이지는 다음 실행에서 다시 처리된다)
+    """
+    def __init__(self, path=STATE_DB_PATH, enabled=HTTP_CACHE_ENABLED):
+        self.enabled = enabled
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS http_cache ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body_hash TEXT, updated_at REAL NOT NULL)"
+            )
+
+    def _load(self, url):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, last_modified, body_hash FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+
+    def fetch(self, session, url, **kwargs):
+        """조건부 GET 요청 후 CachedPage 반환"""
+        entry = self._load(url) if self.enabled else None
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry:
+            etag, last_modified, _ = entry
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        response = get_fetch_engine().get(session, url, headers=headers, **kwargs)
+        if entry and response.status_code == 304:
+            logger.info(f"변경 없음(304): {url}")
+            get_metrics().inc('fetch', 'not_modified')
+            return CachedPage(url, None, False, entry[0], entry[1], entry[2])
+        response.raise_for_status()
+
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        changed = not entry or entry[2] != body_hash
+        if not changed:
+            logger.info(f"변경 없음(동일 본문): {url}")
+            get_metrics().inc('fetch', 'not_modified')
+        return CachedPage(url, response.text, changed,
+                          response.headers.get('ETag'), response.headers.get('Last-Modified'), body_hash)
+
+    def commit(self, *pages):
+        """처리가 끝난 페이지의 검증값 저장"""
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body_hash, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(page.url, page.etag, page.last_modified, page.body_hash, now) for page in pages]
+            )
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_http_cache():
+    """프로세스 전역 HTTP 캐시 반환"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
@@ -0,0 +1,130 @@
+import hashlib
+import io
+import logging
+import os
+import threading
+from src.config.settings import IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES, THUMBNAIL_MAX_SIZE, THUMBNAIL_QUALITY
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow가 없으면 원본 이미지를 그대로 캐시
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+def make_thumbnail(raw, max_size=THUMBNAIL_MAX_SIZE, quality=THUMBNAIL_QUALITY):
+    """이미지를 max_size 이내로 축소하고 JPEG로 재인코딩. 변환할 수 없으면 원본 반환"""
+    if Image is None:
+        return raw
+    try:
+        with Image.open(io.BytesIO(raw)) as image:
+            image.thumbnail(max_size)
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            output = io.BytesIO()
+            image.save(output, format='JPEG', quality=quality, optimize=True)
+        thumbnail = output.getvalue()
+        return thumbnail if len(thumbnail) < len(raw) else raw
+    except Exception as e:
+        logger.warning(f"썸네일 변환 실패, 원본 이미지 사용: {e}")
+        return raw
+
+class ImageCache:
+    """URL과 원본 내용 해시로 찾는 디스크 썸네일 캐시 (용량 초과 시 LRU 삭제)
+
+    urls/<url 해시>   : 원본 이미지의 내용 해시
+    blobs/<내용 해시> : 축소된 썸네일 바이트 (mtime을 최근 사용 시각으로 사용)
+    같은 사진이 다른 URL로 올라와도 내용 해시가 같으면 썸네일은 한 번만 만든다.
+    """
+    def __init__(self, cache_dir=IMAGE_CACHE_DIR, max_bytes=IMAGE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._url_dir = os.path.join(cache_dir, 'urls')
+        self._blob_dir = os.path.join(cache_dir, 'blobs')
+        os.makedirs(self._url_dir, exist_ok=True)
+        os.makedirs(self._blob_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._total_bytes = sum(entry.stat().st_size for entry in os.scandir(self._blob_dir))
+
+    def _url_path(self, url):
+        return os.path.join(self._url_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def _blob_path(self, content_hash):
+        return os.path.join(self._blob_dir, content_hash)
+
+    def _read_blob(self, content_hash):
+        path = self._blob_path(content_hash)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # 최근 사용 시각 갱신
+            return data
+        except FileNotFoundError:
+            return None
+
+    def get(self, url):
+        """URL로 캐시된 썸네일 조회 (없으면 None)"""
+        path = self._url_path(url)
+        try:
+            with open(path, 'r') as f:
+                content_hash = f.read().strip()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return self._read_blob(content_hash)
+
+    def put(self, url, raw):
+        """원본 이미지를 썸네일로 변환해 저장하고 썸네일 바이트 반환"""
+        content_hash = hashlib.sha256(raw).hexdigest()
+        thumbnail = self._read_blob(content_hash)
+        if thumbnail is None:
+            thumbnail = make_thumbnail(raw)
+            self._write(self._blob_path(content_hash), thumbnail)
+            with self._lock:
+                self._total_bytes += len(thumbnail)
+            self._evict()
+        self._write(self._url_path(url), content_hash.encode('ascii'))
+        return thumbnail
+
+    def _write(self, path, data):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _evict(self):
+        with self._lock:
+            if self._total_bytes <= self.max_bytes:
+                return
+            entries = sorted(os.scandir(self._blob_dir), key=lambda entry: entry.stat().st_mtime)
+            evicted_before = None
+            for entry in entries:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                try:
+                    stat = entry.stat()
+                    os.remove(entry.path)
+                    self._total_bytes -= stat.st_size
+                    evicted_before = stat.st_mtime
+                except FileNotFoundError:
+                    continue
+            if evicted_before is None:
+                return
+            # 삭제된 썸네일보다 오래 사용되지 않은 URL 항목도 함께 정리
+            for entry in os.scandir(self._url_dir):
+                try:
+                    if entry.stat().st_mtime <= evicted_before:
+                        os.remove(entry.path)
+                except FileNotFoundError:
+                    continue
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_image_cache():
+    """프로세스 전역 이미지 캐시 반환"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ImageCache()
+        return _cache
@@ -0,0 +1,91 @@
+import contextvars
+import logging
+import random
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from src.config.settings import JOB_MAX_WORKERS, JOB_JITTER_SECONDS
+from src.crawler.utils.metrics import get_metrics
+from src.crawler.utils.deadline import deadline_scope
+
+logger = logging.getLogger(__name__)
+
+class JobExecutor:
+    """상주 실행용 작업 실행기. 스케줄러 루프는 trigger()만 호출하고 바로 다음 예약을 확인한다
+
+    - 작업은 작업자 스레드에서 실행되므로 오래 걸리는 작업이 다른 작업의 예약 시각을 밀지 않는다.
+    - 같은 작업은 겹쳐 실행하지 않는다. 실행 중에 다시 예약 시각이 오면 catch_up인 작업은 끝난 뒤 한 번만 이어서 실행하고,
+      아닌 작업은 그 회차를 건너뛴다 (밀린 회차가 여러 번이어도 한 번으로 합침).
+    - timeout이 지나면 마감 시각을 적용해 새 요청을 멈추고 수집분만 전송하게 한다.
+    - 시작 시각에 0~jitter초의 무작위 지연을 둔다.
+    """
+    def __init__(self, max_workers=JOB_MAX_WORKERS, jitter=JOB_JITTER_SECONDS):
+        self.jitter = jitter
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def register(self, name, func, timeout=None, catch_up=True):
+        """작업 등록. func는 인자 없이 호출되며 성공 여부를 반환한다"""
+        self._jobs[name] = {"func": func, "timeout": timeout, "catch_up": catch_up,
+                            "running": False, "pending": False, "last_started": None, "last_result": None}
+
+    def trigger(self, name):
+        """작업 실행을 요청하고 바로 반환 (반환: 새로 시작했는지 여부)"""
+        job = self._jobs[name]
+        with self._lock:
+            if job["running"]:
+                get_metrics().inc('scheduler', 'overlaps', source=name)
+                if job["catch_up"] and not job["pending"]:
+                    job["pending"] = True
+                    logger.warning(f"{name} 작업이 아직 실행 중이라 끝난 뒤 이어서 실행합니다.")
+                else:
+                    logger.warning(f"{name} 작업이 아직 실행 중이라 이번 회차를 건너뜁니다.")
+                return False
+            job["running"] = True
+        # 작업마다 컨텍스트를 따로 복사해 지표 소스 이름과 마감 시각이 섞이지 않게 함
+        self._executor.submit(contextvars.copy_context().run, self._run, name)
+        return True
+
+    def _run(self, name):
+        job = self._jobs[name]
+        while True:
+            if self.jitter:
+                time.sleep(random.uniform(0, self.jitter))
+            job["last_started"] = time.time()
+            job["last_result"] = self._run_once(name, job)
+            with self._lock:
+                if not job["pending"]:
+                    job["running"] = False
+                    return
+                job["pending"] = False
+            logger.info(f"{name} 작업의 밀린 회차를 실행합니다.")
+            get_metrics().inc('scheduler', 'catch_up_runs', source=name)
+
+    def _run_once(self, name, job):
+        started = time.monotonic()
+        try:
+            if job["timeout"] is None:
+                return bool(job["func"]())
+            with deadline_scope(job["timeout"]):
+                return bool(job["func"]())
+        except Exception as e:
+            logger.error(f"{name} 작업 실행 중 오류 발생: {str(e)}")
+            logger.error(traceback.format_exc())
+            return False
+        finally:
+            elapsed = time.monotonic() - started
+            if job["timeout"] is not None and elapsed > job["timeout"]:
+                get_metrics().inc('scheduler', 'timeouts', source=name)
+                logger.warning(f"{name} 작업이 제한 시간 {job['timeout']}초를 넘겨 {elapsed:.0f}초 만에 끝났습니다.")
+
+    def status(self):
+        """{작업 이름: 실행 상태} (지표 보고용)"""
+        with self._lock:
+            return {name: {"running": job["running"], "pending": job["pending"],
+                           "last_started": job["last_started"], "last_result": job["last_result"]}
+                    for name, job in self._jobs.items()}
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from collections import deque
+from src.config.settings import KEYWORD_TAGGER_REFRESH_SECONDS
+from src.crawler.utils.metrics import get_metrics
+from src.crawler.utils.crawler_config import get_keywords_from_api
+
+logger = logging.getLogger(__name__)
+
+def _is_ascii_word_char(char):
+    return char.isascii() and char.isalnum()
+
+def _normalize(text):
+    """소문자로 바꾸고 공백을 지운 문자열과, 각 문자의 원문 위치 목록 ('신한카드 AI'와 '신한카드AI'를 같게 봄)"""
+    chars = []
+    positions = []
+    for position, char in enumerate(text or ''):
+        if not char.isspace():
+            chars.append(char.lower())
+            positions.append(position)
+    return ''.join(chars), positions
+
+class KeywordTagger:
+    """여러 키워드를 한 번의 선형 탐색으로 찾는 Aho-Corasick 매칭기
+
+    - 대소문자와 공백 차이는 무시한다.
+    - 영문/숫자로 시작하거나 끝나는 키워드는 앞뒤가 영문/숫자가 아닐 때만 인정한다 ('AI'가 'OpenAI'나 'mail'에 걸리지 않도록).
+    """
+    def __init__(self, keywords):
+        self.keywords = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]  # 상태 -> [(패턴 번호, 패턴 길이)]
+        self._patterns = []  # 패턴 번호 -> (키워드 번호, 앞 경계 확인, 뒤 경계 확인)
+        for keyword in keywords:
+            if keyword and keyword not in self.keywords:
+                self.keywords.append(keyword)
+                self._add(keyword, len(self.keywords) - 1)
+        self._build()
+
+    def _add(self, pattern, keyword_id):
+        normalized, _ = _normalize(pattern)
+        if not normalized:
+            return
+        state = 0
+        for char in normalized:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._patterns.append((keyword_id, _is_ascii_word_char(normalized[0]), _is_ascii_word_char(normalized[-1])))
+        self._output[state].append((len(self._patterns) - 1, len(normalized)))
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                if state:
+                    fallback = self._fail[state]
+                    while fallback and char not in self._goto[fallback]:
+                        fallback = self._fail[fallback]
+                    self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def _matches(self, text):
+        """(키워드 번호, 원문 시작 위치, 원문 끝 위치) 목록"""
+        normalized, positions = _normalize(text)
+        matches = []
+        state = 0
+        for end, char in enumerate(normalized):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern_id, length in self._output[state]:
+                keyword_id, check_start, check_end = self._patterns[pattern_id]
+                start = positions[end - length + 1]
+                stop = positions[end] + 1
+                if check_start and start > 0 and _is_ascii_word_char(text[start - 1]):
+                    continue
+                if check_end and stop < len(text) and _is_ascii_word_char(text[stop]):
+                    continue
+                matches.append((keyword_id, start, stop))
+        return matches
+
+    def find(self, text):
+        """텍스트에 나오는 키워드 목록 (키워드 등록 순서)"""
+        found = {keyword_id for keyword_id, _, _ in self._matches(text)}
+        return [self.keywords[keyword_id] for keyword_id in sorted(found)]
+
+    def tag_articles(self, articles):
+        """기사 제목과 본문에 나오는 키워드를 keywords에 추가 (기존 키워드 순서는 유지)"""
+        metrics = get_metrics()
+        for article in articles:
+            keywords = article.setdefault("keywords", [])
+            found = self.find(f"{article.get('title') or ''}\n{article.get('content') or ''}")
+            added = [keyword for keyword in found if keyword not in keywords]
+            if added:
+                keywords.extend(added)
+                metrics.inc('tagging', 'keywords_added', len(added))
+        return articles
+
+_tagger = None
+_tagger_built_at = 0.0
+_tagger_lock = threading.Lock()
+
+def get_keyword_tagger():
+    """백엔드 키워드 목록으로 만든 프로세스 전역 매칭기 반환
+
+    실행마다 한 번 만들도록 KEYWORD_TAGGER_REFRESH_SECONDS 동안 재사용한다.
+    키워드를 가져오지 못하면 빈 매칭기를 반환하고 다음 호출에서 다시 시도한다.
+    """
+    global _tagger, _tagger_built_at
+    with _tagger_lock:
+        if _tagger is None or time.monotonic() - _tagger_built_at > KEYWORD_TAGGER_REFRESH_SECONDS:
+            keywords = [keyword_json['keyword'] for keyword_json in get_keywords_from_api()]
+            if not keywords:
+                logger.warning("백엔드 키워드가 없어 키워드 태깅을 건너뜁니다.")
+                return _tagger or KeywordTagger([])
+            _tagger = KeywordTagger(keywords)
+            _tagger_built_at = time.monotonic()
+            logger.info(f"키워드 매칭기 생성: {len(keywords)}개 키워드")
+        return _tagger
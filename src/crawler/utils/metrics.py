@@ -0,0 +1,248 @@
+import bisect
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from src.config.settings import METRICS_TEXTFILE_PATH, METRICS_EMF_ENABLED, METRICS_EMF_NAMESPACE
+
+logger = logging.getLogger(__name__)
+
+# 지연 시간 히스토그램 구간(ms)
+LATENCY_BUCKETS_MS = [10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+# 현재 실행 중인 소스 이름. 스레드 풀에 작업을 넘길 때는 contextvars.copy_context()로 전달한다
+_current_source = contextvars.ContextVar('crawl_source', default='unknown')
+
+def current_source():
+    return _current_source.get()
+
+@contextmanager
+def source_scope(source):
+    """이 블록 안에서 기록되는 지표를 source로 분류"""
+    token = _current_source.set(source)
+    try:
+        yield
+    finally:
+        _current_source.reset(token)
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def to_dict(self):
+        buckets = {f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 1),
+            "avg_ms": round(self.sum_ms / self.count, 1) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 1),
+            "buckets": buckets,
+        }
+
+class CrawlMetrics:
+    """소스별, 단계별 크롤링 지표 (카운터와 지연 시간 히스토그램)
+
+    주요 단계와 지표:
+    - fetch: requests, errors, html_bytes, 요청 지연 시간
+    - politeness: sleep_seconds (호스트별 요청 속도 제한 대기)
+    - parse: 파싱 시간
+    - image: requests, cache_hits, image_bytes, 다운로드 지연 시간
+    - upload: chunks, payload_bytes, 전송 시간
+    - articles: found, skipped, sent, failed
+    - run: 소스 전체 실행 시간, failed
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+            self._status = {}
+            self.started_at = time.time()
+
+    def inc(self, stage, name, value=1, source=None):
+        key = (source or current_source(), stage, name)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def get(self, stage, name, source=None):
+        """카운터 현재 값 (없으면 0)"""
+        with self._lock:
+            return self._counters.get((source or current_source(), stage, name), 0)
+
+    def observe(self, stage, seconds, source=None):
+        key = (source or current_source(), stage)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds * 1000)
+
+    @contextmanager
+    def timer(self, stage, source=None):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, source)
+
+    def snapshot(self):
+        """카운터와 히스토그램(건수, 합계)의 현재 값 (emf_records의 since 기준점)"""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {key: (histogram.count, histogram.sum_ms) for key, histogram in self._histograms.items()},
+            }
+
+    def set_status(self, source, status):
+        with self._lock:
+            self._status[source] = status
+
+    def failed_sources(self):
+        with self._lock:
+            return [source for source, status in self._status.items() if status != 'ok']
+
+    def summary(self):
+        """소스 > 단계 > 지표 형태의 JSON 직렬화 가능한 요약"""
+        result = {}
+        with self._lock:
+            for (source, stage, name), value in self._counters.items():
+                stage_data = result.setdefault(source, {}).setdefault(stage, {})
+                stage_data[name] = round(value, 3) if isinstance(value, float) else value
+            for (source, stage), histogram in self._histograms.items():
+                result.setdefault(source, {}).setdefault(stage, {})["latency"] = histogram.to_dict()
+            for source, status in self._status.items():
+                result.setdefault(source, {})["status"] = status
+            return {
+                "started_at": self.started_at,
+                "elapsed_seconds": round(time.time() - self.started_at, 3),
+                "sources": result,
+            }
+
+    def to_prometheus(self):
+        """Prometheus textfile 형식 문자열"""
+        lines = []
+        with self._lock:
+            for (source, stage, name), value in sorted(self._counters.items()):
+                lines.append(f'crawler_{stage}_{name}{{source="{source}"}} {value}')
+            for (source, stage), histogram in sorted(self._histograms.items()):
+                metric = f"crawler_{stage}_duration_ms"
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS_MS, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{source="{source}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{source="{source}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{metric}_sum{{source="{source}"}} {histogram.sum_ms}')
+                lines.append(f'{metric}_count{{source="{source}"}} {histogram.count}')
+            for source, status in sorted(self._status.items()):
+                lines.append(f'crawler_run_success{{source="{source}"}} {1 if status == "ok" else 0}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus_textfile(self, path):
+        """node_exporter textfile collector용 파일 저장 (원자적 교체)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def emf_records(self, namespace, since=None, sources=None):
+        """CloudWatch Embedded Metric Format 레코드 (소스별 1건)
+
+        CloudWatch는 EMF 값을 합산하므로 since(snapshot())를 주면 그 이후에 늘어난 값만 담는다.
+        sources를 주면 그 소스만 담는다.
+        """
+        since = since or {"counters": {}, "histograms": {}}
+        per_source = {}
+        with self._lock:
+            for (source, stage, name), value in self._counters.items():
+                value -= since["counters"].get((source, stage, name), 0)
+                per_source.setdefault(source, {})[f"{stage}_{name}"] = round(value, 3) if isinstance(value, float) else value
+            for (source, stage), histogram in self._histograms.items():
+                count, sum_ms = since["histograms"].get((source, stage), (0, 0.0))
+                count, sum_ms = histogram.count - count, histogram.sum_ms - sum_ms
+                per_source.setdefault(source, {})[f"{stage}_latency_avg_ms"] = round(sum_ms / count, 1) if count else 0.0
+        records = []
+        for source, values in per_source.items():
+            if sources is not None and source not in sources:
+                continue
+            records.append({
+                "_aws": {
+                    "Timestamp": int(time.time() * 1000),
+                    "CloudWatchMetrics": [{
+                        "Namespace": namespace,
+                        "Dimensions": [["source"]],
+                        "Metrics": [{"Name": name} for name in values],
+                    }],
+                },
+                "source": source,
+                **values,
+            })
+        return records
+
+    def emit_emf(self, namespace=METRICS_EMF_NAMESPACE, since=None, sources=None):
+        # EMF는 로그 한 줄이 JSON 하나여야 하므로 logger 포맷을 거치지 않고 출력
+        for record in self.emf_records(namespace, since, sources):
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+
+    def export_textfile(self):
+        """설정된 경우 Prometheus textfile 갱신 (Prometheus 카운터는 누적값이므로 상주 실행에서 주기적으로 불러도 됨)"""
+        if METRICS_TEXTFILE_PATH:
+            try:
+                self.write_prometheus_textfile(METRICS_TEXTFILE_PATH)
+            except OSError as e:
+                logger.error(f"지표 파일 저장 실패: {e}")
+
+    def export_run(self, since, sources):
+        """설정된 경우 since(snapshot()) 이후 sources에서 늘어난 값만 EMF로 출력 (상주 실행의 작업 1회분 보고용)"""
+        if METRICS_EMF_ENABLED:
+            self.emit_emf(since=since, sources=sources)
+
+    def export(self):
+        """설정에 따라 Prometheus textfile, EMF 로그로 내보내고 요약 반환 (실행마다 reset하는 경우용)"""
+        self.export_textfile()
+        if METRICS_EMF_ENABLED:
+            self.emit_emf()
+        return self.summary()
+
+_metrics = CrawlMetrics()
+
+def get_metrics():
+    """프로세스 전역 지표 저장소 반환"""
+    return _metrics
+
+def run_source(source, func, *args, **kwargs):
+    """source 범위에서 크롤러를 실행하고 성공 여부 반환 (예외는 기록 후 삼킴)
+
+    지표는 실행 간 누적되므로(상주 실행) 이번 실행 중에 늘어난 run.failed만 실패로 본다.
+    """
+    metrics = get_metrics()
+    with source_scope(source):
+        failed_before = metrics.get('run', 'failed')
+        try:
+            with metrics.timer('run'):
+                func(*args, **kwargs)
+            status = 'failed' if metrics.get('run', 'failed') > failed_before else 'ok'
+        except Exception as e:
+            logger.error(f"{source} 실행 중 오류 발생: {str(e)}")
+            logger.error(traceback.format_exc())
+            metrics.inc('run', 'failed')
+            status = 'failed'
+    metrics.set_status(source, status)
+    return status == 'ok'
@@ -0,0 +1,234 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from src.config.settings import STATE_DB_PATH, SEEN_URL_TTL_HOURS, NEAR_DUP_MAX_DISTANCE, NEAR_DUP_MIN_TEXT_LENGTH
+from src.crawler.utils.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+# 64비트를 8개 구간으로 나눠 색인. 거리 7 이하인 두 값은 적어도 한 구간이 정확히 같다
+BANDS = 8
+BAND_BITS = SIMHASH_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+# 전송되지 않은 채 남은 등록 정보는 이 시간이 지나면 무시 (상주 실행에서 실패한 기사가 유사 기사를 계속 막지 않도록)
+CLAIM_TTL_SECONDS = 3600
+
+def _normalize(text):
+    return re.sub(r'\W+', '', (text or '').lower())
+
+def simhash(text):
+    """문자 3-gram 기반 64비트 SimHash (한글 제목은 띄어쓰기가 달라도 같은 값에 가깝게 나옴)"""
+    normalized = _normalize(text)
+    shingles = {normalized[i:i + 3] for i in range(max(len(normalized) - 2, 1))}
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+def _bands(fingerprint):
+    return [(fingerprint >> (band * BAND_BITS)) & BAND_MASK for band in range(BANDS)]
+
+def _to_signed(value):
+    # SQLite INTEGER는 부호 있는 64비트
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def _hamming(a, b):
+    return bin(a ^ b).count('1')
+
+class NearDuplicateIndex:
+    """제목 SimHash로 소스 간 유사 중복 기사를 찾는 색인
+
+    소스마다 얻을 수 있는 요약 문장(검색 요약, 목록 리드, 없음)이 달라 모든 소스가 같은 텍스트인 제목만 비교한다.
+
+    - 실행 중: 모든 크롤러가 본문 요청 전에 claim()으로 기사를 등록한다. 먼저 등록한 소스(owner)의 기사가 대표가 되고,
+      다른 소스가 찾은 같은 URL이나 유사 기사는 본문과 이미지를 받지 않으며 키워드와 태그만 대표 기사에 합쳐진다 (merge_into).
+    - 실행 간: 전송을 마친 기사의 SimHash는 SQLite에 저장되어 TTL 동안 다시 받지 않는다.
+    - 본문을 받지 못했거나 전송하지 않기로 한 기사는 release()로 등록을 취소해 유사 기사가 다음에 대표가 될 수 있게 한다.
+      대표 기사가 전송되지 않은 채 건너뛴 유사 기사는 unresolved()로 확인해 처리한 것으로 보지 않는다.
+    """
+    def __init__(self, path=STATE_DB_PATH, ttl_hours=SEEN_URL_TTL_HOURS,
+                 max_distance=NEAR_DUP_MAX_DISTANCE, min_text_length=NEAR_DUP_MIN_TEXT_LENGTH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_distance = max_distance
+        self.min_text_length = min_text_length
+        self._lock = threading.Lock()
+        self._claims = {}  # url -> {"fingerprint", "owner", "keywords", "tags", "sent", "claimed_at"}
+        self._buckets = {}  # (구간 번호, 구간 값) -> [url]
+        self._aliases = {}  # 유사 중복으로 건너뛴 url -> (대표 기사 url, 건너뛴 시각)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS near_duplicates ("
+                "url TEXT PRIMARY KEY, simhash INTEGER NOT NULL, "
+                + ''.join(f"band{band} INTEGER, " for band in range(BANDS))
+                + "sent_at REAL NOT NULL)"
+            )
+            for band in range(BANDS):
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_near_duplicates_band{band} ON near_duplicates (band{band})")
+            self._conn.execute("DELETE FROM near_duplicates WHERE sent_at < ?", (time.time() - self.ttl_seconds,))
+
+    def _drop(self, url):
+        fingerprint = self._claims.pop(url)["fingerprint"]
+        if fingerprint is not None:
+            for band, value in enumerate(_bands(fingerprint)):
+                self._buckets[(band, value)].remove(url)
+
+    def _prune(self, now):
+        stale = [url for url, claimed in self._claims.items() if now - claimed["claimed_at"] > CLAIM_TTL_SECONDS]
+        for url in stale:
+            self._drop(url)
+        stale = [url for url, (_, skipped_at) in self._aliases.items() if now - skipped_at > CLAIM_TTL_SECONDS]
+        for url in stale:
+            del self._aliases[url]
+
+    def _find_claimed(self, fingerprint):
+        for band, value in enumerate(_bands(fingerprint)):
+            for url in self._buckets.get((band, value), ()):
+                if _hamming(fingerprint, self._claims[url]["fingerprint"]) <= self.max_distance:
+                    return url
+        return None
+
+    def _find_sent(self, fingerprint):
+        cutoff = time.time() - self.ttl_seconds
+        for band, value in enumerate(_bands(fingerprint)):
+            rows = self._conn.execute(
+                f"SELECT url, simhash FROM near_duplicates WHERE band{band} = ? AND sent_at >= ?", (value, cutoff)
+            )
+            for url, stored in rows:
+                if _hamming(fingerprint, stored & ((1 << 64) - 1)) <= self.max_distance:
+                    return url
+        return None
+
+    def _merge(self, claimed, canonical, keywords, tags):
+        if claimed["sent"]:
+            if keywords or tags:
+                logger.info(f"이미 전송한 대표 기사라 키워드/태그를 합치지 못함: {canonical} {list(keywords)} {list(tags)}")
+        else:
+            claimed["keywords"].extend(k for k in keywords if k not in claimed["keywords"])
+            claimed["tags"].extend(t for t in tags if t not in claimed["tags"])
+
+    def claim(self, url, title, keywords=(), tags=(), owner=None):
+        """기사를 등록하고 owner가 이 기사의 본문을 받아야 하는지 반환
+
+        처음 보는 기사면 owner를 대표로 등록하고 True를 반환한다. 같은 owner가 다시 등록한 URL도 True
+        (같은 소스 안의 본문 중복 요청은 호출자가 막는다). 다른 owner가 이미 등록했거나 이미 전송한 같은 URL,
+        또는 유사 중복이면 False를 반환하고 키워드와 태그는 대표 기사에 합친다.
+        """
+        # 너무 짧은 제목은 오탐이 많아 유사 비교는 하지 않고 같은 URL만 확인
+        fingerprint = simhash(title) if len(_normalize(title)) >= self.min_text_length else None
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            claimed = self._claims.get(url)
+            if claimed is not None:
+                if claimed["owner"] == owner and not claimed["sent"]:
+                    self._merge(claimed, url, keywords, tags)
+                    return True
+                logger.info(f"다른 소스에서 이미 등록했거나 전송한 기사 건너뜀: {url} ({claimed['owner']})")
+                get_metrics().inc('articles', 'near_duplicates')
+                self._aliases[url] = (url, now)
+                self._merge(claimed, url, keywords, tags)
+                return False
+
+            canonical = self._find_claimed(fingerprint) if fingerprint is not None else None
+            if canonical is None:
+                sent = self._find_sent(fingerprint) if fingerprint is not None else None
+                if sent is not None:
+                    logger.info(f"이전 실행에서 전송한 기사와 유사한 기사 건너뜀: {url} ~ {sent}")
+                    get_metrics().inc('articles', 'near_duplicates')
+                    self._aliases.pop(url, None)
+                    return False
+                self._aliases.pop(url, None)
+                self._claims[url] = {"fingerprint": fingerprint, "owner": owner, "keywords": list(keywords),
+                                     "tags": list(tags), "sent": False, "claimed_at": now}
+                if fingerprint is not None:
+                    for band, value in enumerate(_bands(fingerprint)):
+                        self._buckets.setdefault((band, value), []).append(url)
+                return True
+
+            logger.info(f"유사 중복 기사 병합: {url} -> {canonical}")
+            get_metrics().inc('articles', 'near_duplicates')
+            self._aliases[url] = (canonical, now)
+            self._merge(self._claims[canonical], canonical, keywords, tags)
+            return False
+
+    def release(self, *urls):
+        """본문을 받지 못했거나(요청, 파싱 실패), 전송하지 않기로 했거나, 전송에 실패한 기사의 등록 취소
+
+        전송을 마친 기사는 그대로 둔다. 취소한 기사에 합쳐졌던 유사 기사는 unresolved()에 나온다.
+        """
+        with self._lock:
+            for url in urls:
+                claimed = self._claims.get(url)
+                if claimed is not None and not claimed["sent"]:
+                    self._drop(url)
+
+    def unresolved(self, urls):
+        """urls 중 유사 중복으로 건너뛰었지만 대표 기사가 전송되지 않은(아직 전송 전이거나 취소된) URL 목록
+
+        이 기사들은 처리한 것으로 보면 안 되므로 호출자는 워터마크나 키워드 시각을 그 앞으로 옮기지 않는다.
+        """
+        with self._lock:
+            result = []
+            for url in urls:
+                alias = self._aliases.get(url)
+                if alias is None:
+                    continue
+                claimed = self._claims.get(alias[0])
+                if claimed is None or not claimed["sent"]:
+                    result.append(url)
+            return result
+
+    def merge_into(self, articles):
+        """전송 직전, 유사 중복 기사에서 모은 키워드와 태그를 대표 기사에 합침"""
+        with self._lock:
+            for article in articles:
+                claimed = self._claims.get(article["url"])
+                if not claimed:
+                    continue
+                for field in ("keywords", "tags"):
+                    values = article.setdefault(field, [])
+                    values.extend(value for value in claimed[field] if value not in values)
+        return articles
+
+    def mark_sent(self, urls):
+        """전송을 마친 기사의 SimHash를 저장해 다음 실행에서도 유사 기사를 건너뜀"""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for url in urls:
+                claimed = self._claims.get(url)
+                if not claimed:
+                    continue
+                claimed["sent"] = True
+                fingerprint = claimed["fingerprint"]
+                if fingerprint is None:
+                    # 짧은 제목은 같은 URL만 비교하므로 다음 실행에서는 전송 기록 저장소가 거른다
+                    continue
+                rows.append((url, _to_signed(fingerprint), *_bands(fingerprint), now))
+            if rows:
+                with self._conn:
+                    columns = ', '.join(f"band{band}" for band in range(BANDS))
+                    self._conn.executemany(
+                        f"INSERT OR REPLACE INTO near_duplicates (url, simhash, {columns}, sent_at) "
+                        f"VALUES ({', '.join('?' * (BANDS + 3))})", rows
+                    )
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_near_duplicate_index():
+    """프로세스 전역 유사 중복 색인 반환"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = NearDuplicateIndex()
+        return _index
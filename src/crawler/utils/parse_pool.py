@@ -0,0 +1,137 @@
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from src.config.settings import PARSE_WORKERS, PARSE_QUEUE_SIZE
+from src.crawler.utils.fetch_engine import get_fetch_engine
+from src.crawler.utils.metrics import get_metrics
+from src.crawler.utils.deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+def _parse_in_worker(parse_func, item, content, encoding):
+    """파싱 프로세스에서 실행. HTML 바이트를 디코딩해 parse_func(item, html) 결과와 소요 시간(초) 반환"""
+    started = time.perf_counter()
+    record = parse_func(item, content.decode(encoding or 'utf-8', errors='replace'))
+    return record, time.perf_counter() - started
+
+def _response_or_none(url, future):
+    try:
+        response = future.result()
+        response.raise_for_status()
+        return response
+    except DeadlineExceeded:
+        return None
+    except Exception as e:
+        logger.error(f"페이지 다운로드 중 오류 발생: {url} - {e}")
+        return None
+
+class ParsePool:
+    """기사 페이지 요청(fetch 엔진)과 HTML 파싱(프로세스 풀)을 나눠 실행하는 단계
+
+    파싱을 별도 프로세스에서 하므로 GIL에 묶이지 않고 여러 코어를 쓴다.
+    받아 두고 아직 파싱하지 않은 HTML은 queue_size개까지만 유지하며, 넘으면 다음 요청을 시작하지 않는다.
+    workers가 0이면 프로세스를 만들지 않고 요청한 스레드에서 바로 파싱한다 (Lambda 기본값).
+    parse_func는 다른 프로세스에서 불러올 수 있는 모듈 수준 함수여야 하며, 네트워크 요청 없이 HTML만 다뤄야 한다.
+    """
+    def __init__(self, workers=PARSE_WORKERS, queue_size=PARSE_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = None
+        if workers > 0:
+            # 실행 중인 fetch 엔진 스레드와 잠금을 자식 프로세스가 물려받지 않도록 spawn 사용
+            self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def parse_pages(self, session, urls, parse_func, items=None):
+        """urls를 요청해 parse_func(item, html)로 파싱한 결과 리스트 반환
+
+        결과 순서는 urls와 같으며 요청이나 파싱에 실패한 항목은 None이다. items를 주지 않으면 URL을 item으로 넘긴다.
+        """
+        items = urls if items is None else items
+        if self._executor is None:
+            return self._parse_inline(session, urls, parse_func, items)
+
+        engine = get_fetch_engine()
+        metrics = get_metrics()
+        results = [None] * len(urls)
+        fetching = {}
+        parsing = {}
+        next_index = 0
+        while next_index < len(urls) or fetching or parsing:
+            # 요청 중이거나 파싱을 기다리는 페이지가 queue_size개를 넘지 않도록 새 요청 시작
+            while next_index < len(urls) and len(fetching) + len(parsing) < self.queue_size:
+                fetching[engine.submit(session, urls[next_index])] = next_index
+                next_index += 1
+            done, _ = wait(list(fetching) + list(parsing), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in fetching:
+                    index = fetching.pop(future)
+                    response = _response_or_none(urls[index], future)
+                    if response is None:
+                        continue
+                    # response.text와 같은 인코딩으로 파싱 프로세스에서 디코딩
+                    encoding = response.encoding or response.apparent_encoding
+                    parsing[self._executor.submit(_parse_in_worker, parse_func, items[index],
+                                                  response.content, encoding)] = index
+                else:
+                    index = parsing.pop(future)
+                    try:
+                        results[index], seconds = future.result()
+                        metrics.observe('parse', seconds)
+                    except Exception as e:
+                        logger.error(f"기사 파싱 중 오류 발생: {urls[index]} - {str(e)}")
+        return results
+
+    def _parse_inline(self, session, urls, parse_func, items):
+        results = []
+        responses = get_fetch_engine().get_many(session, urls) if urls else []
+        for url, item, response in zip(urls, items, responses):
+            if isinstance(response, DeadlineExceeded):
+                results.append(None)
+                continue
+            if isinstance(response, Exception):
+                logger.error(f"페이지 다운로드 중 오류 발생: {url} - {response}")
+                results.append(None)
+                continue
+            try:
+                response.raise_for_status()
+            except Exception as e:
+                logger.error(f"페이지 다운로드 중 오류 발생: {url} - {e}")
+                results.append(None)
+                continue
+            try:
+                results.append(parse_func(item, response.text))
+            except Exception as e:
+                logger.error(f"기사 파싱 중 오류 발생: {url} - {str(e)}")
+                results.append(None)
+        return results
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_parse_pool():
+    """프로세스 전역 파싱 단계 반환"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool()
+        return _pool
+
+def configure_parse_pool(workers, queue_size=PARSE_QUEUE_SIZE):
+    """파싱 프로세스 수를 바꿔 전역 파싱 단계를 다시 만듦 (크롤링 시작 전에 호출)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = ParsePool(workers, queue_size)
+        logger.info(f"파싱 프로세스 {workers}개 사용" if workers > 0 else "요청 스레드에서 바로 파싱")
+        return _pool
+
+def parse_pages(session, urls, parse_func, items=None):
+    """전역 파싱 단계로 기사 페이지를 요청하고 파싱 (ParsePool.parse_pages 참고)"""
+    return get_parse_pool().parse_pages(session, urls, parse_func, items)
@@ -0,0 +1,73 @@
+import time
+from src.config.settings import (
+    RATE_LIMITS, RATE_LIMIT_INCREASE, RATE_LIMIT_DECREASE, RATE_LIMIT_LATENCY_TARGET,
+)
+
+# 사이트가 과부하를 알리는 응답 코드 (받으면 요청 속도를 줄임)
+THROTTLE_STATUS_CODES = {429, 503}
+
+class AdaptiveRateLimiter:
+    """호스트 하나의 토큰 버킷 요청 속도 제한 (AIMD로 속도 자동 조정)
+
+    - 빠르게 성공한 요청마다 rate를 increase만큼 올리고 (max_rate까지)
+    - 429/503 응답이나 연결 오류가 나면 rate에 decrease를 곱해 줄인다 (min_rate까지)
+    - 응답이 latency_target보다 느리면 속도를 올리지 않는다
+    토큰은 실제로 보낸 요청에만 사용하며, 보내지 않은 요청의 토큰은 refund()로 돌려준다.
+    """
+    def __init__(self, rate, burst=1, min_rate=None, max_rate=None,
+                 increase=RATE_LIMIT_INCREASE, decrease=RATE_LIMIT_DECREASE, latency_target=RATE_LIMIT_LATENCY_TARGET):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate or rate
+        self.max_rate = max_rate or rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.tokens = float(burst)
+        self.blocked_until = 0.0
+        self._updated_at = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self):
+        """토큰 하나를 예약하고 요청 전에 기다려야 할 시간(초) 반환"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def refund(self):
+        """예약했지만 보내지 않은 요청의 토큰 반환"""
+        self.tokens = min(self.burst, self.tokens + 1)
+
+    def on_response(self, status_code, latency, retry_after=None):
+        if status_code in THROTTLE_STATUS_CODES:
+            self._slow_down(retry_after)
+        elif latency <= self.latency_target:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_error(self):
+        self._slow_down()
+
+    def _slow_down(self, retry_after=None):
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+def limits_for_host(host, limits=RATE_LIMITS):
+    """호스트에 적용할 설정. 키와 같거나 하위 도메인인 항목 중 가장 구체적인 것, 없으면 "default" """
+    host = host or ''
+    matches = [key for key in limits if key != 'default' and (host == key or host.endswith('.' + key))]
+    if matches:
+        return {**limits.get('default', {}), **limits[max(matches, key=len)]}
+    return limits.get('default', {})
+
+def parse_retry_after(value):
+    """Retry-After 헤더의 초 값 (날짜 형식이나 잘못된 값은 무시)"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,78 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from src.config.settings import STATE_DB_PATH, SEEN_URL_TTL_HOURS
+
+logger = logging.getLogger(__name__)
+
+class SeenUrlStore:
+    """백엔드 전송이 끝난 기사 URL을 실행 간에 유지하는 SQLite 저장소
+
+    기록된 URL은 SEEN_URL_TTL_HOURS가 지나면 만료되어 다시 수집 대상이 된다.
+    """
+    def __init__(self, path=STATE_DB_PATH, ttl_hours=SEEN_URL_TTL_HOURS):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl_seconds = ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen_urls ("
+                "url TEXT PRIMARY KEY, source TEXT, sent_at REAL NOT NULL)"
+            )
+        self.purge_expired()
+
+    def purge_expired(self):
+        """TTL이 지난 URL 삭제"""
+        with self._lock, self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM seen_urls WHERE sent_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+        if deleted:
+            logger.info(f"만료된 전송 기록 {deleted}건 삭제")
+
+    def filter_unseen(self, urls):
+        """아직 전송하지 않은(또는 만료된) URL만 원래 순서대로 반환"""
+        if not urls:
+            return []
+        cutoff = time.time() - self.ttl_seconds
+        seen = set()
+        url_list = list(urls)
+        with self._lock:
+            for i in range(0, len(url_list), 500):
+                chunk = url_list[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT url FROM seen_urls WHERE sent_at >= ? AND url IN ({placeholders})",
+                    (cutoff, *chunk)
+                )
+                seen.update(row[0] for row in rows)
+        if seen:
+            logger.info(f"이미 전송한 기사 {len(seen)}건 건너뜀")
+        return [url for url in url_list if url not in seen]
+
+    def is_seen(self, url):
+        return not self.filter_unseen([url])
+
+    def mark_sent(self, urls, source=None):
+        """전송 완료한 URL 기록"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen_urls (url, source, sent_at) VALUES (?, ?, ?)",
+                [(url, source, now) for url in urls]
+            )
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_seen_store():
+    """프로세스 전역 전송 기록 저장소 반환"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SeenUrlStore()
+        return _store
@@ -0,0 +1,66 @@
+import hashlib
+import json
+import logging
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+def keyword_shard(keyword, shard_count):
+    """키워드가 속한 샤드 번호. 프로세스나 실행 환경이 달라도 같은 키워드는 항상 같은 샤드에 배정된다"""
+    digest = hashlib.blake2b(keyword.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % shard_count
+
+def parse_shard(shard_index, shard_count):
+    """(샤드 번호, 샤드 수) 검증 후 반환. 샤드 수가 없거나 1 이하이면 None (전체 키워드 실행)"""
+    if shard_count is None or int(shard_count) <= 1:
+        return None
+    shard_count = int(shard_count)
+    if shard_index is None:
+        raise ValueError(f"샤드 수({shard_count})만 있고 샤드 번호가 없습니다.")
+    shard_index = int(shard_index)
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"샤드 번호는 0 이상 {shard_count} 미만이어야 합니다: {shard_index}")
+    return shard_index, shard_count
+
+def select_shard(keywords_json, shard):
+    """키워드 목록에서 shard에 배정된 키워드만 반환 (shard가 None이면 전체)"""
+    if shard is None:
+        return keywords_json
+    shard_index, shard_count = shard
+    return [keyword_json for keyword_json in keywords_json
+            if keyword_shard(keyword_json['keyword'], shard_count) == shard_index]
+
+def invoke_lambda_shards(function_name, shard_count, payload=None):
+    """Lambda 함수를 샤드마다 비동기로 호출 (반환: 호출에 성공한 샤드 번호 목록)
+
+    각 호출의 이벤트에는 payload와 함께 shard_index, shard_count가 들어간다.
+    """
+    # boto3는 콜드 스타트 비용이 커서 조정 호출에서만 불러옴 (Lambda 런타임에 기본 포함)
+    try:
+        import boto3
+    except ImportError:
+        raise RuntimeError("boto3가 없어 Lambda 샤드를 호출할 수 없습니다.")
+    client = boto3.client('lambda')
+    invoked = []
+    for shard_index in range(shard_count):
+        event = dict(payload or {}, shard_index=shard_index, shard_count=shard_count)
+        try:
+            client.invoke(FunctionName=function_name, InvocationType='Event',
+                          Payload=json.dumps(event).encode('utf-8'))
+            invoked.append(shard_index)
+        except Exception as e:
+            logger.error(f"샤드 {shard_index}/{shard_count} 호출 실패: {str(e)}")
+    logger.info(f"{function_name} 함수로 샤드 {len(invoked)}/{shard_count}개 호출")
+    return invoked
+
+def run_local_shards(command, shard_count):
+    """command 뒤에 --shard-index, --shard-count를 붙인 프로세스를 샤드마다 동시에 실행
+
+    모든 프로세스가 끝날 때까지 기다린 뒤 {샤드 번호: 종료 코드}를 반환한다.
+    """
+    processes = {
+        shard_index: subprocess.Popen(command + ['--shard-index', str(shard_index), '--shard-count', str(shard_count)])
+        for shard_index in range(shard_count)
+    }
+    logger.info(f"로컬 샤드 프로세스 {shard_count}개 실행")
+    return {shard_index: process.wait() for shard_index, process in processes.items()}
@@ -0,0 +1,33 @@
+import contextvars
+import logging
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from src.config.settings import SOURCE_MAX_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+def run_sources(jobs, max_workers=SOURCE_MAX_CONCURRENCY):
+    """여러 소스 작업을 동시에 실행하고 {이름: 성공 여부}를 작업 순서대로 반환
+
+    jobs는 (이름, 인자 없는 함수) 목록이며 함수는 성공 여부를 반환한다.
+    호스트별 요청 간격과 전체 동시 요청 수는 fetch 엔진이 지키므로, 여기서는 동시에 실행할 소스 수만 제한한다.
+    한 소스에서 예외가 나도 다른 소스는 계속 실행된다.
+    """
+    if not jobs:
+        return {}
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)), thread_name_prefix="source") as executor:
+        # 소스마다 컨텍스트를 따로 복사해 지표 소스 이름과 마감 시각이 섞이지 않게 함
+        futures = [(name, executor.submit(contextvars.copy_context().run, func)) for name, func in jobs]
+        results = {}
+        for name, future in futures:
+            try:
+                results[name] = bool(future.result())
+            except Exception as e:
+                logger.error(f"{name} 소스 실행 중 오류 발생: {str(e)}")
+                logger.error(traceback.format_exc())
+                results[name] = False
+    logger.info(f"소스 {len(jobs)}개 실행 완료 ({time.perf_counter() - started:.1f}초), "
+                f"실패: {[name for name, ok in results.items() if not ok]}")
+    return results
@@ -0,0 +1,54 @@
+import logging
+import threading
+import warnings
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InsecureRequestWarning
+from src.config.settings import (
+    HEADERS, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT,
+    TLS_CA_BUNDLE, TLS_INSECURE_HOSTS
+)
+
+logger = logging.getLogger(__name__)
+
+def _is_insecure_host(host):
+    return any(host == insecure or host.endswith(f".{insecure}") for insecure in TLS_INSECURE_HOSTS)
+
+class CrawlerSession(requests.Session):
+    """모든 크롤러가 공유하는 HTTP 세션
+
+    - 호스트별 커넥션 풀 유지 (HTTP_POOL_CONNECTIONS개 호스트, 호스트당 HTTP_POOL_MAXSIZE개 연결)
+    - timeout을 지정하지 않은 요청에 기본 (연결, 응답) 타임아웃 적용
+    - TLS 검증 설정을 한 곳에서 관리: TLS_INSECURE_HOSTS에 속한 호스트만 인증서 검증 생략
+    """
+    def __init__(self, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)):
+        super().__init__()
+        self.timeout = timeout
+        self.headers.update(HEADERS)
+        self.verify = TLS_CA_BUNDLE
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        if 'verify' not in kwargs and _is_insecure_host(urlparse(url).hostname or ''):
+            kwargs['verify'] = False
+        return super().request(method, url, **kwargs)
+
+if TLS_INSECURE_HOSTS:
+    # 검증 생략은 설정된 호스트에만 적용되므로 요청마다 나오는 경고는 한 번만 알림
+    warnings.filterwarnings('ignore', category=InsecureRequestWarning)
+    logger.info(f"TLS 인증서 검증 생략 호스트: {', '.join(TLS_INSECURE_HOSTS)}")
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """프로세스 전역 HTTP 세션 반환"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = CrawlerSession()
+        return _session
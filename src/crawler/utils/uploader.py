@@ -0,0 +1,170 @@
+import gzip
+import json
+import logging
+import random
+import tempfile
+import threading
+import time
+import traceback
+import requests
+from urllib3.exceptions import NewConnectionError
+from src.config.settings import (
+    BACKEND_URL, UPLOAD_CHUNK_BYTES, UPLOAD_GZIP, UPLOAD_MAX_RETRIES,
+    UPLOAD_BACKOFF_SECONDS, UPLOAD_TIMEOUT, UPLOAD_MODE
+)
+from src.crawler.utils.transport import get_session
+from src.crawler.utils.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class ChunkTooLarge(Exception):
+    """백엔드가 413으로 거절한 청크"""
+
+def is_connect_error(error):
+    """요청을 보내기 전에 연결을 맺지 못한 오류인지 여부 (백엔드가 요청을 받지 않았음이 확실한 경우)"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    # requests는 urllib3의 MaxRetryError(reason=NewConnectionError)를 감싸서 던짐
+    return isinstance(getattr(reason, 'reason', reason), NewConnectionError)
+
+class NewsUploader:
+    """뉴스 데이터를 바이트 크기 기준 청크로 나누어 백엔드에 전송
+
+    - 청크마다 gzip 압축 후 공유 keep-alive 세션으로 전송
+    - 429/5xx, 연결 실패는 지수 백오프로 재시도하고, 413은 청크를 반으로 나누어 재전송
+    - 요청을 보낸 뒤 응답을 받지 못한 경우(응답 타임아웃, 연결 끊김)는 백엔드가 이미 저장했을 수 있으므로
+      중복 저장을 막기 위해 재시도하지 않고 실패로 처리한다 (다음 실행에서 다시 전송)
+    - 실패한 청크만 결과에서 실패로 처리되므로 나머지 기사는 정상 전송된다
+    mode="ndjson"이면 청크를 jsonl 파일로 만들어 send_file 경로(multipart)로 전송한다.
+    """
+    def __init__(self, url=None, max_chunk_bytes=UPLOAD_CHUNK_BYTES, use_gzip=UPLOAD_GZIP,
+                 max_retries=UPLOAD_MAX_RETRIES, backoff=UPLOAD_BACKOFF_SECONDS,
+                 timeout=UPLOAD_TIMEOUT, mode=UPLOAD_MODE):
+        self.url = url or f"{BACKEND_URL}/api/public/news"
+        self.max_chunk_bytes = max_chunk_bytes
+        self.use_gzip = use_gzip
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.mode = mode
+        self.session = get_session()
+
+    def iter_chunks(self, news_list):
+        """기사별로 JSON 인코딩해 max_chunk_bytes 이하의 (기사 리스트, 인코딩 리스트) 청크 생성"""
+        articles, encoded, size = [], [], 0
+        for article in news_list:
+            data = json.dumps(article, ensure_ascii=False).encode('utf-8')
+            if articles and size + len(data) + 1 > self.max_chunk_bytes:
+                yield articles, encoded
+                articles, encoded, size = [], [], 0
+            articles.append(article)
+            encoded.append(data)
+            size += len(data) + 1
+        if articles:
+            yield articles, encoded
+
+    def _request(self, file=None, **kwargs):
+        """재시도 정책을 적용한 POST 요청"""
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            if file is not None:
+                file.seek(0)
+                kwargs['files'] = {'news.jsonl': file}
+            try:
+                response = self.session.post(self.url, timeout=self.timeout, **kwargs)
+                if response.status_code == 413:
+                    raise ChunkTooLarge()
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response.json() if response.content else {}
+                retry_after = response.headers.get('Retry-After')
+                error = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not is_connect_error(e):
+                    raise requests.RequestException(f"응답을 받지 못해 재시도하지 않음: {e}")
+                error = str(e)
+
+            if attempt == self.max_retries:
+                raise requests.RequestException(f"재시도 횟수 초과: {error}")
+            delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            logger.warning(f"전송 실패({error}), {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+
+    def _post_json(self, encoded):
+        body = b'[' + b','.join(encoded) + b']'
+        headers = {'Content-Type': 'application/json'}
+        if self.use_gzip:
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+        get_metrics().inc('upload', 'payload_bytes', len(body))
+        return self._request(data=body, headers=headers)
+
+    def _post_ndjson(self, encoded):
+        with tempfile.SpooledTemporaryFile(max_size=self.max_chunk_bytes) as file:
+            for data in encoded:
+                file.write(data)
+                file.write(b'\n')
+            get_metrics().inc('upload', 'payload_bytes', file.tell())
+            return self.send_file(file)
+
+    def send_file(self, file):
+        """jsonl 파일 객체를 multipart로 전송"""
+        return self._request(file=file)
+
+    def _send_chunk(self, articles, encoded, result):
+        try:
+            if self.mode == 'ndjson':
+                response = self._post_ndjson(encoded)
+            else:
+                response = self._post_json(encoded)
+            result["sent_urls"].extend(article.get('url') for article in articles)
+            result["responses"].append(response)
+        except ChunkTooLarge:
+            if len(articles) == 1:
+                logger.error(f"기사 하나가 전송 한도를 초과했습니다: {articles[0].get('url')}")
+                result["failed_urls"].append(articles[0].get('url'))
+                result["errors"].append("413 Payload Too Large")
+                return
+            # 청크를 반으로 나누어 다시 전송
+            middle = len(articles) // 2
+            self._send_chunk(articles[:middle], encoded[:middle], result)
+            self._send_chunk(articles[middle:], encoded[middle:], result)
+        except (requests.RequestException, json.JSONDecodeError) as e:
+            logger.error(f"데이터 전송 중 오류 발생: {str(e)}")
+            logger.error(traceback.format_exc())
+            result["failed_urls"].extend(article.get('url') for article in articles)
+            result["errors"].append(str(e))
+
+    def send(self, news_list):
+        """뉴스 리스트 전송. 반환값의 sent_urls/failed_urls로 청크별 성공 여부를 확인할 수 있다"""
+        metrics = get_metrics()
+        result = {"chunks": 0, "sent_urls": [], "failed_urls": [], "responses": [], "errors": []}
+        with metrics.timer('upload'):
+            for articles, encoded in self.iter_chunks(news_list):
+                result["chunks"] += 1
+                self._send_chunk(articles, encoded, result)
+        metrics.inc('upload', 'chunks', result["chunks"])
+        metrics.inc('articles', 'sent', len(result["sent_urls"]))
+        metrics.inc('articles', 'failed', len(result["failed_urls"]))
+
+        logger.info(f"뉴스 전송 완료: {len(result['sent_urls'])}건 성공, "
+                    f"{len(result['failed_urls'])}건 실패 ({result['chunks']}개 청크)")
+        if result["failed_urls"] and not result["sent_urls"]:
+            result["error"] = result["errors"][-1]
+        return result
+
+_uploader = None
+_uploader_lock = threading.Lock()
+
+def get_uploader():
+    """프로세스 전역 업로더 반환"""
+    global _uploader
+    with _uploader_lock:
+        if _uploader is None:
+            _uploader = NewsUploader()
+        return _uploader
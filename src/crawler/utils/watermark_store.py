@@ -0,0 +1,67 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from src.config.settings import STATE_DB_PATH
+
+logger = logging.getLogger(__name__)
+
+class WatermarkStore:
+    """소스별로 전송을 마친 가장 최신 기사의 발행 시각(high-water mark)을 저장하는 SQLite 저장소
+
+    크롤러는 이 시각 이전 기사가 나오면 목록 페이지 탐색을 멈춘다.
+    같은 시각에 발행된 기사를 놓치지 않도록 비교는 >= 로 하고, 이미 보낸 기사는 전송 기록으로 거른다.
+    """
+    def __init__(self, path=STATE_DB_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS source_watermarks ("
+                "source TEXT PRIMARY KEY, published_at TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def get(self, source):
+        """저장된 발행 시각 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT published_at FROM source_watermarks WHERE source = ?", (source,)
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def advance(self, source, published_at):
+        """기존 값보다 최신인 경우에만 갱신"""
+        if published_at is None:
+            return
+        current = self.get(source)
+        if current and current >= published_at:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO source_watermarks (source, published_at, updated_at) VALUES (?, ?, ?)",
+                (source, published_at.isoformat(), time.time())
+            )
+        logger.info(f"{source} 기준 발행 시각 갱신: {published_at.isoformat()}")
+
+def next_watermark(sent_times, pending_times):
+    """전송한 기사 중 아직 처리하지 못한 기사보다 오래된 것의 최신 발행 시각 (없으면 None)
+
+    처리하지 못한 기사를 다음 실행에서 다시 찾을 수 있도록 그 시각을 넘어서 갱신하지 않는다.
+    """
+    limit = min(pending_times) if pending_times else None
+    candidates = [t for t in sent_times if limit is None or t < limit]
+    return max(candidates) if candidates else None
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_watermark_store():
+    """프로세스 전역 발행 시각 저장소 반환"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = WatermarkStore()
+        return _store